@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import time
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db import router
+from django.db.models import DEFERRED
+from django.utils.dateparse import parse_datetime
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import User
+
+TOKEN_VERSION_CLAIM = 'ver'
+TOKEN_VERSION_CACHE_TIMEOUT = 60
+MISSING_VERSION = -1
+
+
+def _version_key(user_id: int) -> str:
+    return f'accounts:token-version:{user_id}'
+
+
+def add_user_claims(token, user: User) -> None:
+    token['role'] = user.role
+    token['status'] = user.status
+    token['premium_until'] = user.premium_until.isoformat() if user.premium_until else None
+    token[TOKEN_VERSION_CLAIM] = user.token_version
+
+
+def _active_token_versions(user_id: int):
+    return User.objects.filter(pk=user_id, is_active=True).values_list('token_version', flat=True)
+
+
+def _cached_version(version: int | None) -> int:
+    return MISSING_VERSION if version is None else version
+
+
+def _known_version(version: int) -> int | None:
+    return None if version == MISSING_VERSION else version
+
+
+def current_token_version(user_id: int) -> int | None:
+    """Return the user's token version, or ``None`` for a deleted or inactive user.
+
+    The value is cached briefly and dropped whenever the user row changes, so a
+    role downgrade or deactivation rejects outstanding tokens within seconds
+    even on workers that missed the invalidation.
+    """
+    key = _version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        version = _cached_version(_active_token_versions(user_id).first())
+        cache.set(key, version, TOKEN_VERSION_CACHE_TIMEOUT)
+    return _known_version(version)
+
+
+async def acurrent_token_version(user_id: int) -> int | None:
+    key = _version_key(user_id)
+    version = await cache.aget(key)
+    if version is None:
+        version = _cached_version(await _active_token_versions(user_id).afirst())
+        await cache.aset(key, version, TOKEN_VERSION_CACHE_TIMEOUT)
+    return _known_version(version)
+
+
+def forget_token_version(*user_ids: int) -> None:
+    cache.delete_many([_version_key(user_id) for user_id in user_ids])
+
+
+def token_is_current(validated_token) -> bool:
+    """Whether a token accepted earlier would still authenticate; long-lived responses re-check it."""
+    if validated_token['exp'] <= time.time():
+        return False
+    if TOKEN_VERSION_CLAIM not in validated_token:
+        return True
+    return current_token_version(validated_token[api_settings.USER_ID_CLAIM]) == validated_token[TOKEN_VERSION_CLAIM]
+
+
+async def atoken_is_current(validated_token) -> bool:
+    if validated_token['exp'] <= time.time():
+        return False
+    if TOKEN_VERSION_CLAIM not in validated_token:
+        return True
+    return await acurrent_token_version(validated_token[api_settings.USER_ID_CLAIM]) == validated_token[TOKEN_VERSION_CLAIM]
+
+
+def claims_user(user_id: int, token) -> User:
+    """Build a ``User`` from token claims; any other field is loaded on first access.
+
+    The instance refuses ``save()``: its claims may be stale, so writes go
+    through a freshly fetched row.
+    """
+    premium_until = token.get('premium_until')
+    loaded = {
+        'id': user_id,
+        'role': token['role'],
+        'status': token['status'],
+        'premium_until': parse_datetime(premium_until) if premium_until else None,
+        'is_active': True,
+        'token_version': token[TOKEN_VERSION_CLAIM],
+    }
+    values = [loaded.get(field.attname, DEFERRED) for field in User._meta.concrete_fields]
+    user = User.from_db(router.db_for_read(User), list(loaded), values)
+    user._from_token_claims = True
+    return user
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """JWT authentication that trusts the role claims instead of fetching the user row.
+
+    Tokens issued before the claims were added fall back to the regular lookup.
+    """
+
+    def get_user(self, validated_token) -> User:
+        if TOKEN_VERSION_CLAIM not in validated_token:
+            return super().get_user(validated_token)
+        user_id = self.get_claims_user_id(validated_token)
+        self.check_token_version(validated_token, current_token_version(user_id))
+        return claims_user(user_id, validated_token)
+
+    async def aauthenticate(self, request) -> tuple[User, object] | None:
+        """``authenticate()`` for async views; claims tokens need no thread hop."""
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        if TOKEN_VERSION_CLAIM not in validated_token:
+            user = await sync_to_async(super().get_user)(validated_token)
+            return user, validated_token
+        user_id = self.get_claims_user_id(validated_token)
+        self.check_token_version(validated_token, await acurrent_token_version(user_id))
+        return claims_user(user_id, validated_token), validated_token
+
+    @staticmethod
+    def get_claims_user_id(validated_token) -> int:
+        try:
+            return validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken('토큰에 사용자 정보가 없습니다.')
+
+    @staticmethod
+    def check_token_version(validated_token, current_version: int | None) -> None:
+        if current_version != validated_token[TOKEN_VERSION_CLAIM]:
+            raise AuthenticationFailed('권한 정보가 변경되었습니다. 다시 로그인해 주세요.', code='token_revoked')
@@ -7,7 +7,7 @@ from django.utils import timezone
 class UserManager(BaseUserManager):
     use_in_migrations = True
 
-    def _create_user(self, email: str, password: str | None, **extra_fields):
+    def _build_user(self, email: str, password: str | None, **extra_fields):
         if not email:
             raise ValueError('Users must provide an email address')
         email = self.normalize_email(email)
@@ -16,9 +16,19 @@ class UserManager(BaseUserManager):
             user.set_password(password)
         else:
             user.set_unusable_password()
+        return user
+
+    def _create_user(self, email: str, password: str | None, **extra_fields):
+        user = self._build_user(email, password, **extra_fields)
         user.save(using=self._db)
         return user
 
+    def build_user(self, email: str, password: str | None = None, **extra_fields):
+        """Unsaved user with the ``create_user`` defaults, for ``bulk_create``."""
+        extra_fields.setdefault('is_staff', False)
+        extra_fields.setdefault('is_superuser', False)
+        return self._build_user(email, password, **extra_fields)
+
     def create_user(self, email: str, password: str | None = None, **extra_fields):
         extra_fields.setdefault('is_staff', False)
         extra_fields.setdefault('is_superuser', False)
@@ -54,12 +64,50 @@ class User(AbstractUser):
     premium_until = models.DateTimeField(null=True, blank=True)
     organization = models.CharField(max_length=255, blank=True)
     purpose = models.TextField(blank=True)
+    token_version = models.PositiveIntegerField(default=0, editable=False)
 
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS: list[str] = []
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(fields=['status', 'role', '-date_joined'], name='user_status_role_joined_idx'),
+        ]
+
+    # Changing any of these invalidates every token issued to the user.
+    TOKEN_VERSION_FIELDS = ('role', 'status', 'premium_until', 'is_active', 'password')
+
     objects = UserManager()
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_token_state = instance.token_state()
+        return instance
+
+    def token_state(self) -> dict:
+        return {name: self.__dict__[name] for name in self.TOKEN_VERSION_FIELDS if name in self.__dict__}
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        if fields is not None and getattr(self, '_from_token_claims', False):
+            # A user built from token claims loads the rest of its row in one query, not one per field.
+            fields = {*fields, *self.get_deferred_fields()}
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        refreshed = {name: value for name, value in self.token_state().items() if fields is None or name in fields}
+        self._loaded_token_state = {**getattr(self, '_loaded_token_state', {}), **refreshed}
+
+    def save(self, *args, **kwargs):
+        if getattr(self, '_from_token_claims', False):
+            raise NotImplementedError('Users built from token claims cannot be saved; fetch the row first.')
+        loaded = getattr(self, '_loaded_token_state', None)
+        if loaded and any(self.__dict__.get(name, value) != value for name, value in loaded.items()):
+            self.token_version += 1
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'token_version'}
+        super().save(*args, **kwargs)
+        self._loaded_token_state = self.token_state()
+
     def approve(self):
         self.status = self.Status.APPROVED
         self.save(update_fields=['status'])
@@ -89,6 +137,9 @@ class Registration(models.Model):
 
     class Meta:
         ordering = ['-submitted_at']
+        indexes = [
+            models.Index(fields=['status', '-submitted_at'], name='registration_status_sub_idx'),
+        ]
         verbose_name = 'Registration'
         verbose_name_plural = 'Registrations'
 
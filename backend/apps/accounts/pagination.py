@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from rest_framework.pagination import CursorPagination
+
+
+class AdminListPagination(CursorPagination):
+    """Newest-first cursor pages for the admin user and registration lists.
+
+    The cursor is a position on the ordering column, so with the status/role
+    filters each page is a range scan on the matching composite index no
+    matter how deep the client pages.
+    """
+
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    invalid_cursor_message = '잘못된 커서입니다.'
+
+
+class UserCursorPagination(AdminListPagination):
+    ordering = ('-date_joined', '-id')
+
+
+class RegistrationCursorPagination(AdminListPagination):
+    ordering = ('-submitted_at', '-id')
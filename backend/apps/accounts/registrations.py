@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from typing import Iterable
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .authentication import forget_token_version
+from .models import Registration, User
+
+USER_BATCH_SIZE = 500
+
+
+def provision_users(registrations: Iterable[Registration]) -> dict[int, tuple[int, bool]]:
+    """Make sure an approved user exists for every registration's email.
+
+    Missing users are inserted with one ``bulk_create`` and an unusable
+    password, so they sign in through a password reset. Returns
+    ``{registration id: (user id, created)}``; an existing account is linked
+    and, if it was not approved yet, approved with one ``UPDATE`` that also
+    bumps its token version. Its other fields are left alone.
+    """
+    registrations = list(registrations)
+    emails = {registration.pk: User.objects.normalize_email(registration.email) for registration in registrations}
+    existing = dict(User.objects.filter(email__in=set(emails.values())).values_list('email', 'id'))
+    if existing:
+        linked_ids = list(existing.values())
+        User.objects.filter(pk__in=linked_ids).exclude(status=User.Status.APPROVED).update(
+            status=User.Status.APPROVED, token_version=F('token_version') + 1
+        )
+        transaction.on_commit(lambda: forget_token_version(*linked_ids))
+
+    new_users: dict[str, User] = {}
+    creators: set[int] = set()
+    for registration in registrations:
+        email = emails[registration.pk]
+        if email in existing or email in new_users:
+            continue
+        creators.add(registration.pk)
+        new_users[email] = User.objects.build_user(
+            email,
+            first_name=registration.name[:150],
+            organization=registration.organization,
+            purpose=registration.purpose,
+            status=User.Status.APPROVED,
+        )
+    if new_users:
+        User.objects.bulk_create(new_users.values(), batch_size=USER_BATCH_SIZE)
+        created_ids = {email: user.pk for email, user in new_users.items()}
+        if None in created_ids.values():
+            # Not every backend returns primary keys from a bulk insert.
+            created_ids = dict(User.objects.filter(email__in=list(new_users)).values_list('email', 'id'))
+    else:
+        created_ids = {}
+
+    user_ids = {**created_ids, **existing}
+    return {
+        registration_id: (user_ids[email], registration_id in creators)
+        for registration_id, email in emails.items()
+    }
+
+
+def decide_registrations(ids: list[int], status: str, reviewer: User, memo: str | None = None) -> list[dict]:
+    """Approve or reject the pending registrations among ``ids`` with a single ``UPDATE``.
+
+    Rows are locked first so two reviewers cannot decide the same
+    registration twice. Call inside ``transaction.atomic()``; the result has
+    one outcome per requested id, in request order.
+    """
+    rows = {
+        registration.pk: registration
+        for registration in Registration.objects.select_for_update()
+        .filter(pk__in=ids)
+        .only('id', 'email', 'name', 'organization', 'purpose', 'status')
+        .order_by()
+    }
+    requested_ids = list(dict.fromkeys(ids))
+    pending = [
+        rows[registration_id]
+        for registration_id in requested_ids
+        if registration_id in rows and rows[registration_id].status == Registration.Status.PENDING
+    ]
+
+    changes = {'status': status, 'decided_at': timezone.now(), 'decided_by': reviewer}
+    if memo is not None:
+        changes['memo'] = memo
+    if pending:
+        Registration.objects.filter(pk__in=[registration.pk for registration in pending]).update(**changes)
+    users = provision_users(pending) if status == Registration.Status.APPROVED else {}
+
+    results = []
+    for registration_id in requested_ids:
+        registration = rows.get(registration_id)
+        if registration is None:
+            results.append({'id': registration_id, 'outcome': 'not_found'})
+        elif registration.status != Registration.Status.PENDING:
+            results.append({'id': registration_id, 'outcome': 'already_decided', 'status': registration.status})
+        elif registration_id in users:
+            user_id, created = users[registration_id]
+            results.append({'id': registration_id, 'outcome': status, 'userId': user_id, 'userCreated': created})
+        else:
+            results.append({'id': registration_id, 'outcome': status})
+    return results
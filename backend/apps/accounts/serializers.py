@@ -1,12 +1,39 @@
-﻿from django.utils import timezone
+﻿from django.db import transaction
+from django.utils import timezone
 from rest_framework import serializers
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
 
+from config.metrics import TimedListSerializer, TimedSerializerMixin
+
+from .authentication import TOKEN_VERSION_CLAIM, add_user_claims, current_token_version
 from .models import Registration, User
+from .registrations import provision_users
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user: User):
+        token = super().get_token(user)
+        add_user_claims(token, user)
+        return token
+
 
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    def validate(self, attrs: dict) -> dict:
+        refresh = self.token_class(attrs['refresh'])
+        if TOKEN_VERSION_CLAIM in refresh:
+            user_id = refresh.get(api_settings.USER_ID_CLAIM)
+            if current_token_version(user_id) != refresh[TOKEN_VERSION_CLAIM]:
+                raise AuthenticationFailed('권한 정보가 변경되었습니다. 다시 로그인해 주세요.', code='token_revoked')
+        return super().validate(attrs)
 
-class UserSerializer(serializers.ModelSerializer):
+
+class UserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = User
+        list_serializer_class = TimedListSerializer
         fields = [
             'id',
             'email',
@@ -21,9 +48,10 @@ class UserSerializer(serializers.ModelSerializer):
         read_only_fields = ['role', 'status']
 
 
-class RegistrationSerializer(serializers.ModelSerializer):
+class RegistrationSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Registration
+        list_serializer_class = TimedListSerializer
         fields = ['id', 'email', 'name', 'organization', 'purpose', 'memo', 'status', 'submitted_at']
         read_only_fields = ['status', 'submitted_at']
 
@@ -45,5 +73,14 @@ class RegistrationDecisionSerializer(serializers.ModelSerializer):
         instance.memo = validated_data.get('memo', instance.memo)
         instance.decided_by = reviewer
         instance.decided_at = timezone.now()
-        instance.save(update_fields=['status', 'memo', 'decided_by', 'decided_at'])
+        with transaction.atomic():
+            instance.save(update_fields=['status', 'memo', 'decided_by', 'decided_at'])
+            if instance.status == Registration.Status.APPROVED:
+                provision_users([instance])
         return instance
+
+
+class RegistrationBulkDecisionSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(), min_length=1, max_length=1000)
+    status = serializers.ChoiceField(choices=[Registration.Status.APPROVED, Registration.Status.REJECTED])
+    memo = serializers.CharField(required=False, allow_blank=True)
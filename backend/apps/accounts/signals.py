@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import forget_token_version
+from .models import User
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance: User, created: bool, update_fields=None, **kwargs):
+    if created:
+        return
+    if update_fields is None or 'token_version' in update_fields:
+        user_id = instance.pk
+        transaction.on_commit(lambda: forget_token_version(user_id))
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance: User, **kwargs):
+    user_id = instance.pk
+    transaction.on_commit(lambda: forget_token_version(user_id))
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from asgiref.sync import async_to_sync
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.accounts.authentication import ClaimsJWTAuthentication, acurrent_token_version, current_token_version
+from apps.accounts.models import User
+from apps.accounts.serializers import ClaimsTokenObtainPairSerializer
+from config.testing import clear_caches
+
+
+class ClaimsAuthenticationTests(APITestCase):
+    """Claims tokens skip the user lookup until a field they carry changes."""
+
+    def setUp(self):
+        clear_caches()
+        self.user = User.objects.create_user('member@example.com', role=User.Role.PREMIUM, status=User.Status.APPROVED)
+        self.refresh = ClaimsTokenObtainPairSerializer.get_token(self.user)
+        self.access = self.refresh.access_token
+
+    def me(self, token):
+        return self.client.get(reverse('current-user'), headers={'Authorization': f'Bearer {token}'})
+
+    def refresh_token(self):
+        return self.client.post(reverse('token_refresh'), {'refresh': str(self.refresh)}, format='json')
+
+    def test_role_downgrade_rejects_outstanding_tokens(self):
+        self.assertEqual(self.me(self.access).status_code, 200)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.role = User.Role.BASIC
+            self.user.save()
+        self.assertEqual(self.me(self.access).status_code, 401)
+        self.assertEqual(self.refresh_token().status_code, 401)
+
+    def test_profile_save_keeps_tokens(self):
+        self.assertEqual(self.me(self.access).status_code, 200)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.first_name = 'Renamed'
+            self.user.save()
+        self.assertEqual(self.me(self.access).status_code, 200)
+        self.assertEqual(self.refresh_token().status_code, 200)
+
+    def test_pre_claims_token_reads_the_user_row(self):
+        token = RefreshToken.for_user(self.user).access_token
+        User.objects.filter(pk=self.user.pk).update(role=User.Role.ADMIN)
+        response = self.me(token)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['role'], User.Role.ADMIN)
+
+    def test_claims_user_refuses_save(self):
+        user = ClaimsJWTAuthentication().get_user(self.access)
+        with self.assertRaises(NotImplementedError):
+            user.save()
+
+    def test_async_version_matches(self):
+        self.assertEqual(async_to_sync(acurrent_token_version)(self.user.pk), self.user.token_version)
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        clear_caches()
+        self.assertIsNone(async_to_sync(acurrent_token_version)(self.user.pk))
+        self.assertIsNone(current_token_version(self.user.pk))
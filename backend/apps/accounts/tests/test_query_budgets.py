@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from itertools import count
+
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.accounts.models import Registration, User
+from config.testing import QueryBudgetTestCase
+
+_sequence = count()
+
+
+def add_users(total: int) -> None:
+    roles = User.Role.values
+    User.objects.bulk_create(
+        User.objects.build_user(
+            f'member{index}@example.com', role=roles[index % len(roles)], status=User.Status.APPROVED
+        )
+        for index in (next(_sequence) for _ in range(total))
+    )
+
+
+def add_registrations(total: int, reviewer: User) -> None:
+    Registration.objects.bulk_create(
+        Registration(
+            email=f'applicant{index}@example.com',
+            name=f'Applicant {index}',
+            status=Registration.Status.APPROVED if index % 2 else Registration.Status.PENDING,
+            decided_by=reviewer if index % 2 else None,
+            decided_at=timezone.now() if index % 2 else None,
+        )
+        for index in (next(_sequence) for _ in range(total))
+    )
+
+
+class AccountQueryBudgetTests(QueryBudgetTestCase):
+    query_budgets = {
+        'current-user': 1,
+        'user-list': 1,
+        'registration-list': 1,
+    }
+
+    def setUp(self):
+        self.admin = User.objects.create_user('admin@example.com', role=User.Role.ADMIN, status=User.Status.APPROVED)
+        self.authenticate(self.admin)
+
+    def test_current_user(self):
+        self.assertQueryBudget('current-user', lambda size: self.client.get(reverse('current-user')), add_users)
+
+    def test_user_list(self):
+        url = reverse('user-list')
+        for params in ({}, {'role': User.Role.PREMIUM}, {'email': 'member'}):
+            with self.subTest(**params):
+                self.assertQueryBudget(
+                    'user-list', lambda size: self.client.get(url, {**params, 'page_size': size}), add_users
+                )
+
+    def test_registration_list(self):
+        url = reverse('registration-list')
+        for params in ({}, {'status': Registration.Status.PENDING}):
+            with self.subTest(**params):
+                self.assertQueryBudget(
+                    'registration-list',
+                    lambda size: self.client.get(url, {**params, 'page_size': size}),
+                    lambda size: add_registrations(size, self.admin),
+                )
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from apps.accounts.models import Registration, User
+
+
+class RegistrationApprovalTests(APITestCase):
+    """Approving a registration approves the account it links to, whether or not it already existed."""
+
+    def setUp(self):
+        self.admin = User.objects.create_user('admin@example.com', role=User.Role.ADMIN, status=User.Status.APPROVED)
+        self.client.force_authenticate(self.admin)
+
+    def test_bulk_approval_approves_linked_users(self):
+        pending = User.objects.create_user('pending@example.com', first_name='Kept')
+        approved = User.objects.create_user('approved@example.com', status=User.Status.APPROVED)
+        registrations = [
+            Registration.objects.create(email=email, name='Applicant')
+            for email in ('pending@example.com', 'approved@example.com', 'new@example.com')
+        ]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse('registration-bulk-decision'),
+                {'ids': [registration.pk for registration in registrations], 'status': Registration.Status.APPROVED},
+                format='json',
+            )
+
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data['usersCreated'], 1)
+        pending_version, approved_version = pending.token_version, approved.token_version
+        pending.refresh_from_db()
+        approved.refresh_from_db()
+        self.assertEqual(pending.status, User.Status.APPROVED)
+        self.assertEqual(pending.token_version, pending_version + 1)
+        self.assertEqual(pending.first_name, 'Kept')
+        self.assertEqual(approved.token_version, approved_version)
+        self.assertEqual(User.objects.get(email='new@example.com').status, User.Status.APPROVED)
+
+    def test_single_approval_approves_linked_user(self):
+        user = User.objects.create_user('pending@example.com')
+        registration = Registration.objects.create(email='pending@example.com', name='Applicant')
+
+        response = self.client.patch(
+            reverse('registration-decision', args=[registration.pk]),
+            {'status': Registration.Status.APPROVED},
+            format='json',
+        )
+
+        self.assertEqual(response.status_code, 200, response.data)
+        user.refresh_from_db()
+        self.assertEqual(user.status, User.Status.APPROVED)
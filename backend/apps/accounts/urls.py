@@ -3,6 +3,7 @@ from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
 from .views import (
     CurrentUserView,
+    RegistrationBulkDecisionView,
     RegistrationCreateView,
     RegistrationDecisionView,
     RegistrationListView,
@@ -16,6 +17,7 @@ urlpatterns = [
     path('me/', CurrentUserView.as_view(), name='current-user'),
     path('registrations/', RegistrationCreateView.as_view(), name='registration-create'),
     path('admin/registrations/', RegistrationListView.as_view(), name='registration-list'),
+    path('admin/registrations/decisions/', RegistrationBulkDecisionView.as_view(), name='registration-bulk-decision'),
     path('admin/registrations/<int:pk>/', RegistrationDecisionView.as_view(), name='registration-decision'),
     path('admin/users/', UserListView.as_view(), name='user-list'),
     path('admin/users/<int:pk>/role/', UserRoleUpdateView.as_view(), name='user-role-update'),
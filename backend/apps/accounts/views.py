@@ -1,10 +1,15 @@
-﻿from django.utils.dateparse import parse_datetime
+﻿from django.db import transaction
+from django.utils.dateparse import parse_datetime
 from rest_framework import generics, permissions, status
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from .models import Registration, User
+from .pagination import RegistrationCursorPagination, UserCursorPagination
+from .registrations import decide_registrations
 from .serializers import (
+    RegistrationBulkDecisionSerializer,
     RegistrationDecisionSerializer,
     RegistrationSerializer,
     UserSerializer,
@@ -16,16 +21,39 @@ class IsAdminRole(permissions.BasePermission):
         return bool(request.user and request.user.is_authenticated and request.user.role == User.Role.ADMIN)
 
 
+class AdminListFilterMixin:
+    """Exact ``status``/``role`` filters and an ``email`` prefix search for admin lists."""
+
+    choice_filters: dict[str, list[str]] = {}
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        params = self.request.query_params
+        for name, choices in self.choice_filters.items():
+            value = params.get(name)
+            if not value:
+                continue
+            if value not in choices:
+                raise ValidationError({name: '지원하지 않는 값입니다.'})
+            queryset = queryset.filter(**{name: value})
+        email = params.get('email', '').strip()
+        if email:
+            queryset = queryset.filter(email__istartswith=email)
+        return queryset
+
+
 class RegistrationCreateView(generics.CreateAPIView):
     queryset = Registration.objects.all()
     serializer_class = RegistrationSerializer
     permission_classes = [permissions.AllowAny]
 
 
-class RegistrationListView(generics.ListAPIView):
+class RegistrationListView(AdminListFilterMixin, generics.ListAPIView):
     queryset = Registration.objects.all()
     serializer_class = RegistrationSerializer
     permission_classes = [IsAdminRole]
+    pagination_class = RegistrationCursorPagination
+    choice_filters = {'status': Registration.Status.values}
 
 
 class RegistrationDecisionView(generics.UpdateAPIView):
@@ -35,10 +63,32 @@ class RegistrationDecisionView(generics.UpdateAPIView):
     http_method_names = ['patch']
 
 
-class UserListView(generics.ListAPIView):
-    queryset = User.objects.all().order_by('-date_joined')
+class RegistrationBulkDecisionView(APIView):
+    """Approve or reject many pending registrations at once, creating users for the approved ones."""
+
+    permission_classes = [IsAdminRole]
+
+    def post(self, request):
+        serializer = RegistrationBulkDecisionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        with transaction.atomic():
+            results = decide_registrations(data['ids'], data['status'], request.user, data.get('memo'))
+        return Response(
+            {
+                'results': results,
+                'decided': sum(result['outcome'] == data['status'] for result in results),
+                'usersCreated': sum(bool(result.get('userCreated')) for result in results),
+            }
+        )
+
+
+class UserListView(AdminListFilterMixin, generics.ListAPIView):
+    queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [IsAdminRole]
+    pagination_class = UserCursorPagination
+    choice_filters = {'status': User.Status.values, 'role': User.Role.values}
 
 
 class UserRoleUpdateView(APIView):
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from typing import Iterable
+
+from django.db import transaction
+from django.db.models import Aggregate, CharField
+
+from .models import Board, BoardAccess
+from .visibility import invalidate_user_visibility
+
+BULK_BATCH_SIZE = 500
+
+
+class IdList(Aggregate):
+    """Comma-separated ids of the grouped rows: ``GROUP_CONCAT``, or ``STRING_AGG`` on PostgreSQL."""
+
+    function = 'GROUP_CONCAT'
+    output_field = CharField()
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        clone = self.copy()
+        clone.function = 'STRING_AGG'
+        clone.template = "%(function)s(%(distinct)sCAST(%(expressions)s AS text), ',')"
+        return clone.as_sql(compiler, connection, **extra_context)
+
+
+def parse_id_list(value: str | None) -> list[int]:
+    return sorted(int(item) for item in value.split(',')) if value else []
+
+
+def apply_board_access(
+    user_boards: dict[int, Iterable[int]],
+    grants: Iterable[tuple[int, int]] = (),
+    revokes: Iterable[tuple[int, int]] = (),
+) -> dict[int, dict]:
+    """Bring ``can_view`` grants to the requested state, writing only the rows that change.
+
+    ``user_boards`` replaces the grants of each listed user; ``grants`` and
+    ``revokes`` are ``(user_id, board_id)`` pairs applied on top, revokes last.
+    Unknown board ids are ignored. Call inside ``transaction.atomic()``; the
+    result maps each user id to the boards added, removed and now granted.
+    """
+    user_boards = {user_id: set(board_ids) for user_id, board_ids in user_boards.items()}
+    grants, revokes = set(grants), set(revokes)
+    user_ids = set(user_boards) | {user_id for user_id, _ in grants | revokes}
+    requested_board_ids = set().union(*user_boards.values()) | {board_id for _, board_id in grants}
+    valid_board_ids = set(Board.objects.filter(pk__in=requested_board_ids).values_list('id', flat=True))
+
+    current: dict[int, set[int]] = {user_id: set() for user_id in user_ids}
+    row_ids: dict[tuple[int, int], int] = {}
+    rows = BoardAccess.objects.filter(user_id__in=user_ids).values_list('id', 'user_id', 'board_id', 'can_view')
+    for pk, user_id, board_id, can_view in rows:
+        row_ids[user_id, board_id] = pk
+        if can_view:
+            current[user_id].add(board_id)
+
+    desired = {user_id: set(board_ids) for user_id, board_ids in current.items()}
+    for user_id, board_ids in user_boards.items():
+        desired[user_id] = board_ids & valid_board_ids
+    for user_id, board_id in grants:
+        if board_id in valid_board_ids:
+            desired[user_id].add(board_id)
+    for user_id, board_id in revokes:
+        desired[user_id].discard(board_id)
+
+    to_create: list[BoardAccess] = []
+    to_enable: list[int] = []
+    to_delete: list[int] = []
+    summary: dict[int, dict] = {}
+    for user_id in sorted(user_ids):
+        added = desired[user_id] - current[user_id]
+        removed = current[user_id] - desired[user_id]
+        for board_id in added:
+            pk = row_ids.get((user_id, board_id))
+            if pk is None:
+                to_create.append(BoardAccess(user_id=user_id, board_id=board_id, can_view=True))
+            else:
+                to_enable.append(pk)
+        to_delete.extend(row_ids[user_id, board_id] for board_id in removed)
+        summary[user_id] = {
+            'userId': user_id,
+            'added': sorted(added),
+            'removed': sorted(removed),
+            'boardIds': sorted(desired[user_id]),
+        }
+
+    if to_delete:
+        BoardAccess.objects.filter(pk__in=to_delete).delete()
+    if to_enable:
+        BoardAccess.objects.filter(pk__in=to_enable).update(can_view=True)
+    if to_create:
+        # A concurrent request may have inserted the same pair; it already grants access.
+        BoardAccess.objects.bulk_create(to_create, batch_size=BULK_BATCH_SIZE, ignore_conflicts=True)
+
+    # bulk_create and update() send no signals, so visibility is dropped here.
+    changed_user_ids = [user_id for user_id, change in summary.items() if change['added'] or change['removed']]
+    if changed_user_ids:
+        transaction.on_commit(lambda: invalidate_user_visibility(*changed_user_ids))
+    return summary
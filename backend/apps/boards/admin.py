@@ -1,11 +1,12 @@
 from django.contrib import admin
 
-from .models import Attachment, Board, BoardAccess, Post, YoutubeEmbed
+from .models import Attachment, AttachmentDerivative, Board, BoardAccess, Post, UploadSession, YoutubeEmbed
+from .search import get_search_backend
 
 
 @admin.register(Board)
 class BoardAdmin(admin.ModelAdmin):
-    list_display = ('name', 'visibility')
+    list_display = ('name', 'visibility', 'post_count', 'attachment_count', 'last_post_at')
     list_filter = ('visibility',)
     search_fields = ('name',)
 
@@ -27,6 +28,12 @@ class PostAdmin(admin.ModelAdmin):
     search_fields = ('title', 'content')
     inlines = [AttachmentInline, YoutubeInline]
 
+    def get_search_results(self, request, queryset, search_term):
+        # Every match stays in the queryset, so the changelist counts and paginates all of them.
+        if not search_term:
+            return queryset, False
+        return get_search_backend().filter_queryset(queryset, search_term), False
+
 
 @admin.register(Attachment)
 class AttachmentAdmin(admin.ModelAdmin):
@@ -34,6 +41,12 @@ class AttachmentAdmin(admin.ModelAdmin):
     search_fields = ('original_name',)
 
 
+@admin.register(AttachmentDerivative)
+class AttachmentDerivativeAdmin(admin.ModelAdmin):
+    list_display = ('attachment', 'kind', 'width', 'height', 'file_size')
+    list_filter = ('kind',)
+
+
 @admin.register(YoutubeEmbed)
 class YoutubeEmbedAdmin(admin.ModelAdmin):
     list_display = ('video_id', 'post')
@@ -46,3 +59,9 @@ class BoardAccessAdmin(admin.ModelAdmin):
     list_filter = ("can_view", "board")
     search_fields = ("board__name", "user__email")
 
+
+@admin.register(UploadSession)
+class UploadSessionAdmin(admin.ModelAdmin):
+    list_display = ('file_name', 'owner', 'post', 'received_bytes', 'total_size', 'status', 'updated_at')
+    list_filter = ('status',)
+    search_fields = ('file_name', 'owner__email')
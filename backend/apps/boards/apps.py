@@ -5,3 +5,6 @@ class BoardsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.boards'
     verbose_name = 'Boards'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,136 @@
+"""Async-native GET handlers for the board list, post list and post detail endpoints.
+
+Under ASGI these run on the event loop instead of the sync thread pool. JWT
+claims, visibility, version stamps and rendered pages are read with the plain
+cache API: Django's ``cache.aget()`` family is a hop to the single
+thread-sensitive executor for every backend, which serialises a worker, while
+locmem never blocks and a Redis round trip is sub-millisecond. Only queries on
+a cache miss go through the async ORM. Only JWT bearer tokens are accepted
+here; other methods on the same URLs are handed to the regular DRF views.
+``BOARD_ASYNC_READS`` mounts them.
+"""
+from __future__ import annotations
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import exceptions
+from rest_framework.request import Request
+
+from apps.accounts.authentication import ClaimsJWTAuthentication
+from config.metrics import TimedJSONRenderer
+
+from .conditional import (
+    aboard_posts_version,
+    board_list_version,
+    make_etag,
+    not_modified_response,
+    post_validators,
+    set_validators,
+)
+from .models import Board, Post
+from .page_cache import get_page, page_cache_key, set_page
+from .pagination import PostCursorPagination
+from .permissions import CanViewBoard, acan_view_board
+from .serializers import BoardSerializer, PostSerializer
+from .views import BoardListCreateView, PostDetailView, PostListCreateView
+from .visibility import avisible_board_ids, current_generation
+
+sync_board_list = BoardListCreateView.as_view()
+sync_post_list = PostListCreateView.as_view()
+sync_post_detail = PostDetailView.as_view()
+
+
+def _render(data, status: int = 200) -> HttpResponse:
+    return HttpResponse(TimedJSONRenderer().render(data), status=status, content_type='application/json')
+
+
+def _error(exc: exceptions.APIException) -> HttpResponse:
+    data = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+    response = _render(data, status=exc.status_code)
+    if exc.status_code == 401:
+        response['WWW-Authenticate'] = ClaimsJWTAuthentication().authenticate_header(None)
+    return response
+
+
+async def _authenticate(request) -> Request:
+    """Wrap ``request`` for the serializers and attach the token user, or raise 401."""
+    result = await ClaimsJWTAuthentication().aauthenticate(request)
+    if result is None:
+        raise exceptions.NotAuthenticated()
+    drf_request = Request(request)
+    drf_request.user, drf_request.auth = result
+    return drf_request
+
+
+async def _check_board(request: Request, board_id: int) -> None:
+    if not await acan_view_board(request.user, board_id):
+        raise exceptions.PermissionDenied(CanViewBoard.message)
+
+
+def async_read(sync_view):
+    """Serve GET with the wrapped coroutine and every other method with ``sync_view``."""
+
+    def decorator(handler):
+        async def view(request, **kwargs):
+            if request.method != 'GET':
+                return await sync_to_async(sync_view)(request, **kwargs)
+            try:
+                return await handler(request, **kwargs)
+            except exceptions.APIException as exc:
+                return _error(exc)
+
+        return csrf_exempt(view)
+
+    return decorator
+
+
+@async_read(sync_board_list)
+async def board_list(request):
+    request = await _authenticate(request)
+    board_ids = await avisible_board_ids(request.user)
+    etag = make_etag('boards', current_generation(), board_list_version(), *sorted(board_ids))
+    response = not_modified_response(request, etag)
+    if response is None:
+        boards = [board async for board in Board.objects.filter(id__in=board_ids).order_by('name')]
+        response = _render(BoardSerializer(boards, many=True).data)
+    return set_validators(response, etag)
+
+
+@async_read(sync_post_list)
+async def post_list(request, board_id: int):
+    request = await _authenticate(request)
+    await _check_board(request, board_id)
+    version = await aboard_posts_version(board_id)
+    etag = make_etag('posts', version, request.get_full_path())
+    response = not_modified_response(request, etag)
+    if response is not None:
+        return set_validators(response, etag)
+
+    key = page_cache_key(request, board_id, version)
+    data = get_page(key)
+    if data is None:
+        view = PostListCreateView(request=request, kwargs={'board_id': board_id}, format_kwarg=None)
+        paginator = PostCursorPagination()
+        page = await paginator.apaginate_queryset(view.get_queryset(), request)
+        serializer = view.get_serializer_class()(page, many=True, context=view.get_serializer_context())
+        data = paginator.get_paginated_response(serializer.data).data
+        set_page(key, data)
+    return set_validators(_render(data), etag)
+
+
+@async_read(sync_post_detail)
+async def post_detail(request, pk: int):
+    request = await _authenticate(request)
+    stamp = await Post.objects.only('id', 'board_id', 'updated_at').filter(pk=pk).afirst()
+    if stamp is None:
+        raise exceptions.NotFound()
+    await _check_board(request, stamp.board_id)
+    etag, last_modified = post_validators(stamp)
+    response = not_modified_response(request, etag, last_modified)
+    if response is None:
+        post = await PostDetailView.queryset.filter(pk=pk).afirst()
+        if post is None:
+            raise exceptions.NotFound()
+        response = _render(PostSerializer(post, context={'request': request}).data)
+    return set_validators(response, etag, last_modified)
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import hashlib
+import time
+from datetime import datetime
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from .events import publish_post_event
+from .models import Post
+
+BOARD_LIST_VERSION_KEY = 'boards:list-version'
+POST_PAYLOAD_STAMP_KEY = 'boards:post-payload-stamp'
+CACHE_CONTROL = 'private, max-age=0, must-revalidate'
+
+
+def make_etag(*parts) -> str:
+    fingerprint = ':'.join(str(part) for part in parts)
+    return '"%s"' % hashlib.sha1(fingerprint.encode()).hexdigest()[:20]
+
+
+def _board_version_key(board_id: int) -> str:
+    return f'boards:posts-version:{board_id}'
+
+
+def post_payload_stamp() -> datetime:
+    """When a board name or an author's name or email last changed.
+
+    Post payloads embed those fields without their change touching
+    ``Post.updated_at``, so every post validator folds this stamp in. A cache
+    miss restarts it at the current time, which costs clients one refetch.
+    """
+    stamp = cache.get(POST_PAYLOAD_STAMP_KEY)
+    if stamp is None:
+        cache.add(POST_PAYLOAD_STAMP_KEY, timezone.now(), timeout=None)
+        stamp = cache.get(POST_PAYLOAD_STAMP_KEY) or timezone.now()
+    return stamp
+
+
+def bump_post_payload_stamp() -> None:
+    cache.set(POST_PAYLOAD_STAMP_KEY, timezone.now(), timeout=None)
+
+
+def _board_version_seed() -> int:
+    # Microseconds, so a counter evicted from the cache restarts above every value it handed out.
+    return time.time_ns() // 1000
+
+
+def board_posts_version(board_id: int) -> str:
+    """Version stamp for a board's post list: a counter bumped after every committed post change.
+
+    Reads cost no query, and a request that sees a bumped value started after
+    the change committed. The payload stamp is prefixed on every read so board
+    renames and author edits change it too.
+    """
+    key = _board_version_key(board_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _board_version_seed(), timeout=None)
+        version = cache.get(key) or _board_version_seed()
+    return f'{post_payload_stamp().timestamp():.6f}-{version}'
+
+
+async def aboard_posts_version(board_id: int) -> str:
+    key = _board_version_key(board_id)
+    version = await cache.aget(key)
+    if version is None:
+        await cache.aadd(key, _board_version_seed(), timeout=None)
+        version = await cache.aget(key) or _board_version_seed()
+    return f'{post_payload_stamp().timestamp():.6f}-{version}'
+
+
+def bump_board_posts_version(*board_ids: int) -> None:
+    for board_id in board_ids:
+        try:
+            cache.incr(_board_version_key(board_id))
+        except ValueError:
+            cache.add(_board_version_key(board_id), _board_version_seed(), timeout=None)
+
+
+def board_list_version() -> int:
+    """Counter bumped whenever a board's post or attachment counters move."""
+    version = cache.get(BOARD_LIST_VERSION_KEY)
+    if version is None:
+        cache.add(BOARD_LIST_VERSION_KEY, 1, timeout=None)
+        version = cache.get(BOARD_LIST_VERSION_KEY, 1)
+    return version
+
+
+def bump_board_list_version() -> None:
+    try:
+        cache.incr(BOARD_LIST_VERSION_KEY)
+    except ValueError:
+        cache.set(BOARD_LIST_VERSION_KEY, 1, timeout=None)
+
+
+def post_validators(post: Post) -> tuple[str, datetime]:
+    """ETag and Last-Modified for one post's detail payload."""
+    last_modified = max(post.updated_at, post_payload_stamp())
+    return make_etag('post', post.pk, last_modified.timestamp()), last_modified
+
+
+def touch_posts(posts) -> None:
+    """Bump ``updated_at`` on ``posts`` after their attachments or embeds changed.
+
+    Queryset updates bypass ``auto_now`` and signals, so the board stamps are
+    bumped and ``updated`` events published here once the transaction commits.
+    """
+    rows = list(posts.values_list('pk', 'board_id'))
+    if not rows:
+        return
+    Post.objects.filter(pk__in=[pk for pk, _ in rows]).update(updated_at=timezone.now())
+    board_ids = {board_id for _, board_id in rows}
+    transaction.on_commit(lambda: bump_board_posts_version(*board_ids))
+    for post_id, board_id in rows:
+        publish_post_event('updated', post_id, board_id)
+
+
+def not_modified_response(request, etag: str | None, last_modified: datetime | None = None):
+    """Return a 304 when the request's validators match, else ``None``."""
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    return get_conditional_response(request, etag=etag, last_modified=timestamp)
+
+
+def set_validators(response, etag: str | None, last_modified: datetime | None = None):
+    if etag:
+        response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(int(last_modified.timestamp()))
+    response['Cache-Control'] = CACHE_CONTROL
+    return response
+
+
+class ConditionalGetMixin:
+    """Answer GET with 304 Not Modified before the payload is queried or serialized.
+
+    Views return cheap ``(etag, last_modified)`` validators from
+    ``get_validators()``; authentication and permissions have already run.
+    """
+
+    def get_validators(self) -> tuple[str | None, datetime | None]:
+        raise NotImplementedError
+
+    def get(self, request, *args, **kwargs):
+        etag, last_modified = self.get_validators()
+        response = not_modified_response(request, etag, last_modified)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        if response.status_code in {200, 304}:
+            set_validators(response, etag, last_modified)
+        return response
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from .conditional import bump_board_list_version
+from .models import Attachment, Board, Post
+
+
+def _changed() -> None:
+    transaction.on_commit(bump_board_list_version)
+
+
+def _latest_post_at():
+    return Post.objects.filter(board=OuterRef('pk')).order_by('-created_at').values('created_at')[:1]
+
+
+def post_added(post: Post) -> None:
+    Board.objects.filter(pk=post.board_id).update(
+        post_count=F('post_count') + 1,
+        last_post_at=Greatest(Coalesce('last_post_at', Value(post.created_at)), Value(post.created_at)),
+    )
+    _changed()
+
+
+def post_removed(post: Post) -> None:
+    Board.objects.filter(pk=post.board_id).update(
+        post_count=Greatest(F('post_count') - 1, Value(0)),
+        last_post_at=Subquery(_latest_post_at()),
+    )
+    _changed()
+
+
+def attachments_changed(post_id: int, delta: int) -> None:
+    if not delta:
+        return
+    Board.objects.filter(posts=post_id).update(attachment_count=Greatest(F('attachment_count') + delta, Value(0)))
+    _changed()
+
+
+def recount_boards(boards=None) -> int:
+    """Recompute every counter of ``boards`` (default: all) in a single UPDATE."""
+    if boards is None:
+        boards = Board.objects.all()
+    post_count = Post.objects.filter(board=OuterRef('pk')).order_by().values('board').annotate(total=Count('id'))
+    attachment_count = (
+        Attachment.objects.filter(post__board=OuterRef('pk')).order_by().values('post__board').annotate(total=Count('id'))
+    )
+    updated = boards.update(
+        post_count=Coalesce(Subquery(post_count.values('total'), output_field=IntegerField()), Value(0)),
+        attachment_count=Coalesce(Subquery(attachment_count.values('total'), output_field=IntegerField()), Value(0)),
+        last_post_at=Subquery(_latest_post_at()),
+    )
+    _changed()
+    return updated
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import io
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+
+from django.core.files.base import ContentFile
+from django.db import transaction
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from .models import Attachment, AttachmentDerivative
+from .tasks import run_task_on_commit
+
+THUMBNAIL_SIZES = {
+    AttachmentDerivative.Kind.THUMB_SMALL: 320,
+    AttachmentDerivative.Kind.THUMB_MEDIUM: 960,
+}
+PREVIEW_SIZE = 1600
+JPEG_QUALITY = 82
+
+
+def _open_image(attachment: Attachment) -> Image.Image | None:
+    with attachment.file.open('rb') as handle:
+        try:
+            image = Image.open(handle)
+            image.draft('RGB', (PREVIEW_SIZE, PREVIEW_SIZE))
+            image.load()
+        except (UnidentifiedImageError, OSError, Image.DecompressionBombError):
+            return None
+    return ImageOps.exif_transpose(image)
+
+
+def _render_with(command: list[str], output: Path) -> Image.Image | None:
+    try:
+        subprocess.run(command, check=True, capture_output=True, timeout=60)
+        image = Image.open(output)
+        image.load()
+        return image
+    except (subprocess.SubprocessError, OSError, UnidentifiedImageError):
+        return None
+
+
+def _render_first_frame(attachment: Attachment) -> Image.Image | None:
+    """Rasterise the first PDF page or video frame with poppler/ffmpeg when installed."""
+    is_pdf = attachment.mime_type == 'application/pdf'
+    tool = shutil.which('pdftoppm' if is_pdf else 'ffmpeg')
+    if tool is None:
+        return None
+    with tempfile.TemporaryDirectory() as workdir:
+        source = Path(workdir) / 'source'
+        with attachment.file.open('rb') as handle, open(source, 'wb') as target:
+            shutil.copyfileobj(handle, target)
+        if is_pdf:
+            output = Path(workdir) / 'page'
+            command = [tool, '-png', '-singlefile', '-f', '1', '-l', '1', '-scale-to', str(PREVIEW_SIZE), str(source), str(output)]
+            return _render_with(command, output.with_suffix('.png'))
+        output = Path(workdir) / 'frame.png'
+        command = [tool, '-v', 'error', '-ss', '1', '-i', str(source), '-frames:v', '1', '-y', str(output)]
+        return _render_with(command, output)
+
+
+def load_source_image(attachment: Attachment) -> Image.Image | None:
+    mime_type = attachment.mime_type or ''
+    if mime_type.startswith('image/'):
+        return _open_image(attachment)
+    if mime_type == 'application/pdf' or mime_type.startswith('video/'):
+        return _render_first_frame(attachment)
+    return None
+
+
+def _encode_jpeg(image: Image.Image) -> bytes:
+    if image.mode not in {'RGB', 'L'}:
+        background = Image.new('RGB', image.size, 'white')
+        rgba = image.convert('RGBA')
+        background.paste(rgba, mask=rgba.getchannel('A'))
+        image = background
+    buffer = io.BytesIO()
+    image.save(buffer, format='JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True)
+    return buffer.getvalue()
+
+
+def _store(attachment: Attachment, kind: str, image: Image.Image) -> None:
+    content = _encode_jpeg(image)
+    # The file and its row commit together while the blob lock is held.
+    with transaction.atomic():
+        derivative = AttachmentDerivative.objects.filter(attachment=attachment, kind=kind).first()
+        if derivative is None:
+            derivative = AttachmentDerivative(attachment=attachment, kind=kind)
+        derivative.width, derivative.height = image.size
+        derivative.file_size = len(content)
+        derivative.file.save(f'{kind}.jpg', ContentFile(content), save=False)
+        derivative.save()
+
+
+def generate_derivatives(attachment_id: int) -> None:
+    """Build the thumbnails (and, for PDFs and videos, a preview) for one attachment."""
+    attachment = Attachment.objects.filter(pk=attachment_id).first()
+    if attachment is None or not attachment.file:
+        return
+    source = load_source_image(attachment)
+    if source is None:
+        return
+
+    if not attachment.mime_type.startswith('image/'):
+        preview = source.copy()
+        preview.thumbnail((PREVIEW_SIZE, PREVIEW_SIZE))
+        _store(attachment, AttachmentDerivative.Kind.PREVIEW, preview)
+    for kind, size in THUMBNAIL_SIZES.items():
+        thumbnail = source.copy()
+        thumbnail.thumbnail((size, size))
+        _store(attachment, kind, thumbnail)
+
+
+def schedule_derivatives(attachment_ids) -> None:
+    for attachment_id in attachment_ids:
+        run_task_on_commit(generate_derivatives, attachment_id)
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import re
+from typing import NamedTuple
+from urllib.parse import quote
+
+from django.conf import settings
+from django.db.models.fields.files import FieldFile
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.http import content_disposition_header
+from rest_framework.negotiation import BaseContentNegotiation
+
+from .conditional import make_etag
+from .models import Attachment, AttachmentDerivative
+
+STREAM_CHUNK_SIZE = 64 * 1024
+RANGE_REGEX = re.compile(r'^bytes=(\d*)-(\d*)$')
+DERIVATIVE_CONTENT_TYPE = 'image/jpeg'
+
+
+class DownloadTarget(NamedTuple):
+    """A stored file as served by the protected download views."""
+
+    file: FieldFile
+    content_type: str
+    filename: str
+    size: int
+    etag: str
+
+
+def attachment_target(attachment: Attachment) -> DownloadTarget:
+    return DownloadTarget(
+        file=attachment.file,
+        content_type=attachment.mime_type or 'application/octet-stream',
+        filename=attachment.original_name,
+        size=attachment.file_size or attachment.file.size,
+        etag=make_etag(attachment.pk, attachment.file.name, attachment.file_size),
+    )
+
+
+def derivative_target(derivative: AttachmentDerivative) -> DownloadTarget:
+    extension = derivative.file.name.rsplit('.', 1)[-1]
+    return DownloadTarget(
+        file=derivative.file,
+        content_type=DERIVATIVE_CONTENT_TYPE,
+        filename=f'{derivative.attachment_id}-{derivative.kind}.{extension}',
+        size=derivative.file_size or derivative.file.size,
+        etag=make_etag('derivative', derivative.pk, derivative.file.name, derivative.file_size),
+    )
+
+
+class FileContentNegotiation(BaseContentNegotiation):
+    """Downloads answer with the file's own type whatever ``Accept`` asks for.
+
+    DRF would otherwise reply 406 to ``Accept: image/png``; errors raised before
+    the file is served still render with the view's first renderer.
+    """
+
+    def select_parser(self, request, parsers):
+        return parsers[0] if parsers else None
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return renderers[0], renderers[0].media_type
+
+
+def parse_range(header: str, size: int) -> tuple[int, int] | None | bool:
+    """Resolve a single ``Range`` header against ``size``.
+
+    Returns ``(start, end)`` inclusive, ``None`` when the header is absent or
+    not a single byte range (serve the whole file), or ``False`` when the range
+    cannot be satisfied.
+    """
+    match = RANGE_REGEX.match(header.strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        suffix = int(last)
+        if suffix == 0:
+            return False
+        return max(size - suffix, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        return False
+    return start, end
+
+
+def _iter_range(handle, start: int, length: int):
+    try:
+        handle.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = handle.read(min(STREAM_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        handle.close()
+
+
+def sendfile_response(target: DownloadTarget, as_attachment: bool) -> HttpResponse | None:
+    """Delegate the byte transfer to the front proxy when configured."""
+    backend = settings.ATTACHMENT_SENDFILE_BACKEND
+    if not backend:
+        return None
+    response = HttpResponse(content_type=target.content_type)
+    if backend == 'nginx':
+        response['X-Accel-Redirect'] = settings.ATTACHMENT_SENDFILE_PREFIX + quote(target.file.name)
+    elif backend == 'apache':
+        response['X-Sendfile'] = target.file.path
+    else:
+        return None
+    response['Content-Disposition'] = content_disposition_header(as_attachment, target.filename)
+    return response
+
+
+def stream_response(request, target: DownloadTarget, as_attachment: bool) -> HttpResponse:
+    """Serve the file from Python, honouring a single-part ``Range`` request."""
+    size = target.size
+    content_type = target.content_type
+    byte_range = parse_range(request.META.get('HTTP_RANGE', ''), size)
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if if_range and if_range != target.etag:
+        byte_range = None
+
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+
+    handle = target.file.open('rb')
+    if byte_range is None:
+        response = FileResponse(handle, as_attachment=as_attachment, filename=target.filename)
+        response['Content-Type'] = content_type
+    else:
+        start, end = byte_range
+        length = end - start + 1
+        response = StreamingHttpResponse(_iter_range(handle, start, length), status=206, content_type=content_type)
+        response['Content-Length'] = str(length)
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Disposition'] = content_disposition_header(as_attachment, target.filename)
+    response['Accept-Ranges'] = 'bytes'
+    return response
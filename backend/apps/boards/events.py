@@ -0,0 +1,350 @@
+"""Live post events for board pages, delivered as Server-Sent Events.
+
+Post signals publish ``created``/``updated``/``deleted`` events once the
+transaction commits and every open ``/api/boards/<id>/events/`` stream of that
+board receives them, so the dashboard refetches only when something changed
+instead of polling. Streams are served to ASGI requests; a WSGI request gets
+``204 No Content``, the SSE signal to stop reconnecting, and the dashboard
+falls back to polling, unless ``BOARD_EVENT_STREAMS_WSGI`` is set.
+``InMemoryBroker`` keeps the subscribers and a bounded replay buffer per board
+inside the current process, so it only suits a single worker; with several
+workers set ``BOARD_EVENT_BROKER`` to ``RedisBroker`` so events reach clients
+on every worker.
+"""
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+from typing import AsyncIterator, Awaitable, Callable, Iterator, NamedTuple
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from django.utils.module_loading import import_string
+from rest_framework.renderers import BaseRenderer
+
+logger = logging.getLogger(__name__)
+
+RESET_EVENT = 'reset'
+RECONNECT_DELAY_MS = 3000
+HEARTBEAT_FRAME = b': keepalive\n\n'
+
+
+class BoardEvent(NamedTuple):
+    id: int
+    board_id: int
+    type: str
+    data: dict
+
+    def encode(self) -> bytes:
+        return f'id: {self.id}\nevent: {self.type}\ndata: {json.dumps(self.data)}\n\n'.encode()
+
+    def dumps(self) -> str:
+        return json.dumps(self._asdict())
+
+    @classmethod
+    def loads(cls, raw: str | bytes) -> 'BoardEvent':
+        return cls(**json.loads(raw))
+
+
+class Subscription:
+    """Pending events of one stream; ``deliver`` may be called from any thread."""
+
+    def __init__(self, board_id: int):
+        self.board_id = board_id
+        self._queue: queue.SimpleQueue[BoardEvent] = queue.SimpleQueue()
+
+    def deliver(self, event: BoardEvent) -> None:
+        self._queue.put(event)
+
+    def get(self, timeout: float) -> BoardEvent | None:
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class AsyncSubscription(Subscription):
+    """Subscription read on the event loop it was created in."""
+
+    def __init__(self, board_id: int):
+        self.board_id = board_id
+        self._loop = asyncio.get_running_loop()
+        self._queue: asyncio.Queue[BoardEvent] = asyncio.Queue()
+
+    def deliver(self, event: BoardEvent) -> None:
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, event)
+
+    async def get(self, timeout: float) -> BoardEvent | None:
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class BaseEventBroker:
+    def publish(self, board_id: int, event_type: str, data: dict) -> BoardEvent | None:
+        raise NotImplementedError
+
+    def subscribe(self, subscription: Subscription, last_event_id: int | None = None) -> list[BoardEvent] | None:
+        """Register ``subscription`` and return the events published after ``last_event_id``.
+
+        ``None`` means those events can no longer be replayed and the client
+        has to refetch.
+        """
+        raise NotImplementedError
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        raise NotImplementedError
+
+
+class InMemoryBroker(BaseEventBroker):
+    """Per-process pub/sub with the last ``BOARD_EVENT_BUFFER_SIZE`` events of each board kept for resume."""
+
+    def __init__(self, buffer_size: int | None = None):
+        self.buffer_size = buffer_size or settings.BOARD_EVENT_BUFFER_SIZE
+        # Ids start from the clock so they keep growing across restarts and a
+        # Last-Event-ID issued by an earlier process is recognised as unreplayable.
+        self._first_id = time.time_ns() // 1000
+        self._ids = itertools.count(self._first_id)
+        self._lock = threading.Lock()
+        self._buffers: dict[int, deque[BoardEvent]] = {}
+        self._evicted_up_to: dict[int, int] = {}
+        self._subscribers: dict[int, set[Subscription]] = {}
+
+    def publish(self, board_id: int, event_type: str, data: dict) -> BoardEvent:
+        with self._lock:
+            event = BoardEvent(next(self._ids), board_id, event_type, data)
+            buffer = self._buffers.setdefault(board_id, deque())
+            if len(buffer) >= self.buffer_size:
+                self._evicted_up_to[board_id] = buffer.popleft().id
+            buffer.append(event)
+        self._fan_out(event)
+        return event
+
+    def _fan_out(self, event: BoardEvent) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(event.board_id, ()))
+        for subscription in subscribers:
+            try:
+                subscription.deliver(event)
+            except RuntimeError:
+                # The subscriber's event loop has shut down.
+                self.unsubscribe(subscription)
+
+    def subscribe(self, subscription: Subscription, last_event_id: int | None = None) -> list[BoardEvent] | None:
+        board_id = subscription.board_id
+        with self._lock:
+            self._subscribers.setdefault(board_id, set()).add(subscription)
+            if last_event_id is None:
+                return []
+            if last_event_id < max(self._first_id - 1, self._evicted_up_to.get(board_id, 0)):
+                return None
+            return [event for event in self._buffers.get(board_id, ()) if event.id > last_event_id]
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.board_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.board_id]
+
+
+class RedisBroker(InMemoryBroker):
+    """Redis pub/sub, so a post saved on one worker reaches streams held by every other.
+
+    Events get ids from one Redis counter and each board keeps its last
+    ``BOARD_EVENT_BUFFER_SIZE`` events in a Redis list for resume. A listener
+    thread per process receives the channel and hands events to that process's
+    subscribers; only that bookkeeping is inherited from ``InMemoryBroker``.
+    Redis being down costs live updates, never the write that published them.
+    """
+
+    channel = 'boards:events'
+    last_id_key = 'boards:events:last-id'
+
+    def __init__(self, url: str | None = None, buffer_size: int | None = None):
+        import redis
+
+        super().__init__(buffer_size)
+        self.client = redis.Redis.from_url(url or settings.BOARD_EVENT_REDIS_URL)
+        self._listener = None
+
+    def _buffer_key(self, board_id: int) -> str:
+        return f'boards:events:{board_id}'
+
+    def publish(self, board_id: int, event_type: str, data: dict) -> BoardEvent | None:
+        from redis import RedisError
+
+        try:
+            pipe = self.client.pipeline()
+            # Ids start from the clock, as in the parent, should Redis lose the counter.
+            pipe.set(self.last_id_key, time.time_ns() // 1000, nx=True)
+            pipe.incr(self.last_id_key)
+            event = BoardEvent(pipe.execute()[1], board_id, event_type, data)
+            payload = event.dumps()
+            pipe = self.client.pipeline()
+            pipe.rpush(self._buffer_key(board_id), payload)
+            pipe.ltrim(self._buffer_key(board_id), -self.buffer_size, -1)
+            pipe.publish(self.channel, payload)
+            pipe.execute()
+        except RedisError:
+            logger.warning('Publishing a %s event for board %s failed', event_type, board_id, exc_info=True)
+            return None
+        return event
+
+    def subscribe(self, subscription: Subscription, last_event_id: int | None = None) -> list[BoardEvent] | None:
+        self._start_listener()
+        with self._lock:
+            self._subscribers.setdefault(subscription.board_id, set()).add(subscription)
+        if last_event_id is None:
+            return []
+        pipe = self.client.pipeline()
+        pipe.get(self.last_id_key)
+        pipe.lrange(self._buffer_key(subscription.board_id), 0, -1)
+        last_id, raw_events = pipe.execute()
+        events = [BoardEvent.loads(raw) for raw in raw_events]
+        if last_id is None or last_event_id > int(last_id):
+            # Issued before Redis lost its data.
+            return None
+        if len(events) >= self.buffer_size and last_event_id < events[0].id:
+            return None
+        return [event for event in events if event.id > last_event_id]
+
+    def _start_listener(self) -> None:
+        with self._lock:
+            if self._listener is not None:
+                return
+            pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{self.channel: self._receive})
+            self._listener = pubsub.run_in_thread(
+                sleep_time=1, daemon=True, exception_handler=self._listener_failed
+            )
+
+    def _receive(self, message: dict) -> None:
+        self._fan_out(BoardEvent.loads(message['data']))
+
+    def _listener_failed(self, exc, pubsub, thread) -> None:
+        # The next read reconnects and resubscribes; events published meanwhile are not replayed.
+        logger.warning('Board event listener lost Redis: %s', exc)
+        time.sleep(1)
+
+
+@lru_cache(maxsize=1)
+def get_broker() -> BaseEventBroker:
+    return import_string(settings.BOARD_EVENT_BROKER)()
+
+
+def publish_post_event(event_type: str, post_id: int, board_id: int) -> None:
+    """Publish after the surrounding transaction commits, so rolled-back writes stay silent."""
+    data = {'id': post_id, 'board': board_id}
+    transaction.on_commit(lambda: get_broker().publish(board_id, event_type, data))
+
+
+def parse_last_event_id(request) -> int | None:
+    raw = request.META.get('HTTP_LAST_EVENT_ID') or request.GET.get('last_event_id')
+    try:
+        return int(raw) if raw else None
+    except ValueError:
+        return None
+
+
+def _opening_frames(backlog: list[BoardEvent] | None) -> Iterator[bytes]:
+    yield f'retry: {RECONNECT_DELAY_MS}\n\n'.encode()
+    if backlog is None:
+        yield f'event: {RESET_EVENT}\ndata: {{}}\n\n'.encode()
+        return
+    for event in backlog:
+        yield event.encode()
+
+
+def _until_check(checked_at: float) -> float:
+    return max(0.0, checked_at + settings.BOARD_EVENT_HEARTBEAT - time.monotonic())
+
+
+def _check_due(checked_at: float) -> bool:
+    return time.monotonic() - checked_at >= settings.BOARD_EVENT_HEARTBEAT
+
+
+def board_event_stream(board_id: int, last_event_id: int | None, still_allowed: Callable[[], bool]) -> Iterator[bytes]:
+    """Blocking stream for WSGI workers; it holds one worker thread per open connection.
+
+    ``still_allowed`` is re-checked every ``BOARD_EVENT_HEARTBEAT`` seconds,
+    busy or idle, so a revoked token or board access ends the stream before
+    the next event is sent.
+    """
+    broker = get_broker()
+    subscription = Subscription(board_id)
+    backlog = broker.subscribe(subscription, last_event_id)
+    try:
+        yield from _opening_frames(backlog)
+        checked_at = time.monotonic()
+        while True:
+            event = subscription.get(_until_check(checked_at))
+            if _check_due(checked_at):
+                if not still_allowed():
+                    return
+                checked_at = time.monotonic()
+                if event is None:
+                    yield HEARTBEAT_FRAME
+            if event is not None:
+                yield event.encode()
+    finally:
+        broker.unsubscribe(subscription)
+
+
+async def aboard_event_stream(
+    board_id: int, last_event_id: int | None, still_allowed: Callable[[], Awaitable[bool]]
+) -> AsyncIterator[bytes]:
+    """``board_event_stream`` for ASGI, where an open connection costs no thread."""
+    broker = get_broker()
+    subscription = AsyncSubscription(board_id)
+    backlog = broker.subscribe(subscription, last_event_id)
+    try:
+        for frame in _opening_frames(backlog):
+            yield frame
+        checked_at = time.monotonic()
+        while True:
+            event = await subscription.get(_until_check(checked_at))
+            if _check_due(checked_at):
+                if not await still_allowed():
+                    return
+                checked_at = time.monotonic()
+                if event is None:
+                    yield HEARTBEAT_FRAME
+            if event is not None:
+                yield event.encode()
+    finally:
+        broker.unsubscribe(subscription)
+
+
+def streams_enabled(request) -> bool:
+    """Whether ``request`` may hold a stream open; WSGI would pin a worker thread per open tab."""
+    return isinstance(request, ASGIRequest) or settings.BOARD_EVENT_STREAMS_WSGI
+
+
+def event_stream_response(stream) -> StreamingHttpResponse:
+    response = StreamingHttpResponse(stream, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Keep nginx from buffering the stream.
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+class EventStreamRenderer(BaseRenderer):
+    """Lets ``Accept: text/event-stream`` pass content negotiation; errors are still JSON."""
+
+    media_type = 'text/event-stream'
+    format = 'event-stream'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return json.dumps(data).encode() if data is not None else b''
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.boards.models import Attachment
+from apps.boards.signals import release_attachment_file
+from apps.boards.storage import blob_name, content_sha256
+
+
+class Command(BaseCommand):
+    help = 'Move legacy attachments into content-addressed storage, sharing identical files.'
+
+    def handle(self, *args, **options):
+        storage = Attachment._meta.get_field('file').storage
+        moved = 0
+        for attachment in Attachment.objects.filter(sha256='').exclude(file='').iterator():
+            legacy_name = attachment.file.name
+            if not storage.exists(legacy_name):
+                self.stderr.write(f'Missing file for attachment {attachment.pk}: {legacy_name}')
+                continue
+            with transaction.atomic(), storage.open(legacy_name, 'rb') as handle:
+                sha256 = content_sha256(handle)
+                storage.save(blob_name(sha256), handle)
+                Attachment.objects.filter(pk=attachment.pk).update(file=blob_name(sha256), sha256=sha256)
+            release_attachment_file(legacy_name, '')
+            moved += 1
+        self.stdout.write(self.style.SUCCESS(f'Moved {moved} attachments into content-addressed storage'))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from apps.boards.models import YoutubeEmbed
+from apps.boards.youtube import enrich_video
+
+
+class Command(BaseCommand):
+    help = 'Fill in titles and thumbnails for YouTube embeds that are still missing them.'
+
+    def handle(self, *args, **options):
+        video_ids = YoutubeEmbed.objects.filter(title='').values_list('video_id', flat=True).distinct()
+        videos = updated = 0
+        for video_id in list(video_ids):
+            updated += enrich_video(video_id)
+            videos += 1
+        self.stdout.write(self.style.SUCCESS(f'Resolved {videos} videos, updated {updated} embeds'))
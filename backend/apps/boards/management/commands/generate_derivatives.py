@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from apps.boards.derivatives import generate_derivatives
+from apps.boards.models import Attachment
+
+
+class Command(BaseCommand):
+    help = 'Generate missing thumbnails and previews for existing attachments.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Regenerate derivatives that already exist.')
+
+    def handle(self, *args, **options):
+        attachments = Attachment.objects.exclude(file='')
+        if not options['all']:
+            attachments = attachments.filter(derivatives__isnull=True)
+        processed = 0
+        for attachment_id in attachments.values_list('pk', flat=True).iterator():
+            generate_derivatives(attachment_id)
+            processed += 1
+        self.stdout.write(self.style.SUCCESS(f'Processed {processed} attachments'))
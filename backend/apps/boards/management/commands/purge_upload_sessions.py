@@ -0,0 +1,24 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.boards.models import UploadSession
+from apps.boards.uploads import discard_staged
+
+
+class Command(BaseCommand):
+    help = 'Delete abandoned upload sessions and their staged files.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=int, default=24, help='Idle time after which a pending session is purged.')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options['hours'])
+        stale = UploadSession.objects.filter(status=UploadSession.Status.PENDING, updated_at__lt=cutoff)
+        count = 0
+        for session in stale.iterator():
+            discard_staged(session)
+            count += 1
+        stale.delete()
+        self.stdout.write(self.style.SUCCESS(f'Purged {count} upload sessions'))
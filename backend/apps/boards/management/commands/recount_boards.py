@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from apps.boards.counters import recount_boards
+from apps.boards.models import Board
+
+
+class Command(BaseCommand):
+    help = 'Recompute the post/attachment counters and last post time of boards.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('board_ids', nargs='*', type=int, help='Limit the recount to these boards.')
+
+    def handle(self, *args, **options):
+        boards = Board.objects.all()
+        if options['board_ids']:
+            boards = boards.filter(pk__in=options['board_ids'])
+        updated = recount_boards(boards)
+        self.stdout.write(self.style.SUCCESS(f'Recounted {updated} boards'))
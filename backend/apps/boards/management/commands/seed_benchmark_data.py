@@ -0,0 +1,173 @@
+import hashlib
+import random
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.accounts.models import User
+from apps.boards.counters import recount_boards
+from apps.boards.models import Attachment, Board, BoardAccess, Post, YoutubeEmbed
+from apps.boards.search import get_search_backend
+from apps.boards.storage import blob_name
+from apps.boards.visibility import invalidate_all_visibility
+
+BENCH_EMAIL_DOMAIN = 'bench.local'
+BENCH_ADMIN_EMAIL = f'bench-admin@{BENCH_EMAIL_DOMAIN}'
+BENCH_BOARD_PREFIX = 'bench-board-'
+BATCH_SIZE = 1000
+
+BOARD_VISIBILITY_WEIGHTS = {Board.Visibility.BASIC: 6, Board.Visibility.PREMIUM: 3, Board.Visibility.ADMIN: 1}
+USER_ROLE_WEIGHTS = {User.Role.BASIC: 6, User.Role.PREMIUM: 3, User.Role.ADMIN: 1}
+ATTACHMENT_TYPES = (('image/jpeg', 'jpg'), ('image/png', 'png'), ('application/pdf', 'pdf'))
+VIDEO_POOL_SIZE = 200
+
+
+def _weighted(rng: random.Random, weights: dict) -> str:
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+class Command(BaseCommand):
+    help = 'Bulk-insert a deterministic synthetic dataset of boards, users, grants and posts for benchmarks.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--boards', type=int, default=20)
+        parser.add_argument('--users', type=int, default=200)
+        parser.add_argument('--posts', type=int, default=5000)
+        parser.add_argument('--max-attachments', type=int, default=3, help='Upper bound of attachments per post.')
+        parser.add_argument('--max-embeds', type=int, default=2, help='Upper bound of YouTube embeds per post.')
+        parser.add_argument('--grants', type=float, default=0.2, help='Share of non-admin users given extra boards.')
+        parser.add_argument('--password', default='bench-pass-1234', help='Password of every seeded user.')
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--reset', action='store_true', help='Delete previously seeded benchmark data first.')
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        with transaction.atomic():
+            if options['reset']:
+                self.reset()
+            boards = self.seed_boards(rng, options['boards'])
+            users = self.seed_users(rng, options['users'], options['password'])
+            grants = self.seed_grants(rng, users, boards, options['grants'])
+            posts = self.seed_posts(rng, options['posts'], boards, users)
+            attachments = self.seed_attachments(rng, posts, options['max_attachments'])
+            embeds = self.seed_embeds(rng, posts, options['max_embeds'])
+            # bulk_create sends no signals, so counters, visibility and the search index are rebuilt here.
+            recount_boards(Board.objects.filter(pk__in=[board.pk for board in boards]))
+            get_search_backend().rebuild(batch_size=BATCH_SIZE)
+            transaction.on_commit(invalidate_all_visibility)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Seeded {len(boards)} boards, {len(users)} users, {grants} grants, {len(posts)} posts, '
+                f'{attachments} attachments, {embeds} embeds (admin: {BENCH_ADMIN_EMAIL})'
+            )
+        )
+
+    def reset(self):
+        Board.objects.filter(name__startswith=BENCH_BOARD_PREFIX).delete()
+        User.objects.filter(email__endswith=f'@{BENCH_EMAIL_DOMAIN}').delete()
+
+    def seed_boards(self, rng, count):
+        boards = [
+            Board(
+                name=f'{BENCH_BOARD_PREFIX}{index:04d}',
+                description=f'Benchmark board {index}',
+                visibility=Board.Visibility.BASIC if index == 0 else _weighted(rng, BOARD_VISIBILITY_WEIGHTS),
+            )
+            for index in range(count)
+        ]
+        Board.objects.bulk_create(boards, batch_size=BATCH_SIZE)
+        return list(Board.objects.filter(name__startswith=BENCH_BOARD_PREFIX).order_by('name'))
+
+    def seed_users(self, rng, count, password):
+        # One hash shared by every row; hashing per user would dominate the seed time.
+        password_hash = make_password(password)
+        users = [
+            User.objects.build_user(
+                BENCH_ADMIN_EMAIL,
+                role=User.Role.ADMIN,
+                status=User.Status.APPROVED,
+                is_staff=True,
+                first_name='Bench admin',
+            )
+        ]
+        users += [
+            User.objects.build_user(
+                f'bench-user-{index:05d}@{BENCH_EMAIL_DOMAIN}',
+                role=_weighted(rng, USER_ROLE_WEIGHTS),
+                status=User.Status.APPROVED,
+                first_name=f'Bench user {index}',
+            )
+            for index in range(count)
+        ]
+        for user in users:
+            user.password = password_hash
+        User.objects.bulk_create(users, batch_size=BATCH_SIZE)
+        return list(User.objects.filter(email__endswith=f'@{BENCH_EMAIL_DOMAIN}').order_by('email'))
+
+    def seed_grants(self, rng, users, boards, share):
+        restricted = [board for board in boards if board.visibility != Board.Visibility.BASIC]
+        if not restricted:
+            return 0
+        rows = []
+        for user in users:
+            if user.role == User.Role.ADMIN or rng.random() >= share:
+                continue
+            for board in rng.sample(restricted, rng.randint(1, min(3, len(restricted)))):
+                rows.append(BoardAccess(user=user, board=board, can_view=rng.random() < 0.9))
+        BoardAccess.objects.bulk_create(rows, batch_size=BATCH_SIZE)
+        return len(rows)
+
+    def seed_posts(self, rng, count, boards, users):
+        if not boards:
+            return []
+        posts = [
+            Post(
+                board=rng.choice(boards),
+                author=rng.choice(users),
+                title=f'Benchmark post {index}',
+                content=' '.join(f'word{rng.randrange(5000)}' for _ in range(rng.randint(20, 400))),
+                view_type=rng.choice(Post.ViewType.values),
+            )
+            for index in range(count)
+        ]
+        created = Post.objects.bulk_create(posts, batch_size=BATCH_SIZE)
+        if any(post.pk is None for post in created):
+            # Not every backend returns primary keys from a bulk insert.
+            created = list(Post.objects.filter(board__in=boards).order_by('id'))
+        return created
+
+    def seed_attachments(self, rng, posts, maximum):
+        rows = []
+        for post in posts:
+            for position in range(rng.randint(0, maximum)):
+                mime_type, extension = rng.choice(ATTACHMENT_TYPES)
+                sha256 = hashlib.sha256(f'bench:{post.pk}:{position}'.encode()).hexdigest()
+                rows.append(
+                    Attachment(
+                        post=post,
+                        file=blob_name(sha256),
+                        original_name=f'file-{position}.{extension}',
+                        mime_type=mime_type,
+                        file_size=rng.randint(10_000, 5_000_000),
+                        sha256=sha256,
+                    )
+                )
+        Attachment.objects.bulk_create(rows, batch_size=BATCH_SIZE)
+        return len(rows)
+
+    def seed_embeds(self, rng, posts, maximum):
+        video_ids = [hashlib.md5(f'video:{index}'.encode()).hexdigest()[:11] for index in range(VIDEO_POOL_SIZE)]
+        rows = [
+            YoutubeEmbed(
+                post=post,
+                video_id=video_id,
+                title=f'YouTube video {video_id}',
+                thumbnail_url=f'https://i.ytimg.com/vi/{video_id}/hqdefault.jpg',
+            )
+            for post in posts
+            for video_id in rng.sample(video_ids, rng.randint(0, maximum))
+        ]
+        YoutubeEmbed.objects.bulk_create(rows, batch_size=BATCH_SIZE)
+        return len(rows)
@@ -0,0 +1,72 @@
+import re
+
+from django.db import migrations
+
+SEARCH_TABLE = 'boards_post_search'
+
+# Frozen copy of ``apps.boards.search.tokenize`` as of this migration, so later
+# changes to the live tokenizer do not change what this backfill writes.
+HANGUL_RUN = re.compile(r'[가-힣]+')
+WORD = re.compile(r'[가-힣]+|[^\W_가-힣]+')
+
+
+def tokenize(text):
+    tokens = []
+    for match in WORD.finditer(text.lower()):
+        word = match.group()
+        if HANGUL_RUN.fullmatch(word) and len(word) > 1:
+            tokens.extend(word[index : index + 2] for index in range(len(word) - 1))
+        else:
+            tokens.append(word)
+    return tokens
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5(title, body, tokenize='unicode61')"
+        )
+    elif vendor == 'postgresql':
+        schema_editor.execute(
+            f'CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} ('
+            'post_id bigint PRIMARY KEY REFERENCES boards_post (id) ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED, '
+            'document tsvector NOT NULL)'
+        )
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {SEARCH_TABLE}_document_gin ON {SEARCH_TABLE} USING GIN (document)'
+        )
+    else:
+        return
+
+    Post = apps.get_model('boards', 'Post')
+    if vendor == 'sqlite':
+        insert_sql = f'INSERT INTO {SEARCH_TABLE} (rowid, title, body) VALUES (%s, %s, %s)'
+    else:
+        insert_sql = (
+            f'INSERT INTO {SEARCH_TABLE} (post_id, document) VALUES '
+            "(%s, setweight(to_tsvector('simple', %s), 'A') || setweight(to_tsvector('simple', %s), 'B'))"
+        )
+    rows = [
+        (post_id, ' '.join(tokenize(title)), ' '.join(tokenize(content)))
+        for post_id, title, content in Post.objects.order_by().values_list('id', 'title', 'content').iterator()
+    ]
+    if rows:
+        with schema_editor.connection.cursor() as cursor:
+            cursor.executemany(insert_sql, rows)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor in {'sqlite', 'postgresql'}:
+        schema_editor.execute(f'DROP TABLE IF EXISTS {SEARCH_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('boards', '0003_post_board_created_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
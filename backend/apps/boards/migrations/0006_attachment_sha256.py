@@ -0,0 +1,25 @@
+# Generated by Django 5.1.1 on 2026-10-18 06:51
+
+import apps.boards.models
+import apps.boards.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('boards', '0005_uploadsession'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attachment',
+            name='sha256',
+            field=models.CharField(blank=True, db_index=True, max_length=64),
+        ),
+        migrations.AlterField(
+            model_name='attachment',
+            name='file',
+            field=models.FileField(max_length=255, storage=apps.boards.storage.attachment_storage, upload_to=apps.boards.models.attachment_upload_path),
+        ),
+    ]
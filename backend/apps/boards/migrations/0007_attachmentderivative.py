@@ -0,0 +1,32 @@
+# Generated by Django 5.1.1 on 2026-10-18 06:52
+
+import apps.boards.models
+import apps.boards.storage
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('boards', '0006_attachment_sha256'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttachmentDerivative',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('thumb_sm', 'Small thumbnail'), ('thumb_md', 'Medium thumbnail'), ('preview', 'Preview')], max_length=20)),
+                ('file', models.FileField(max_length=255, storage=apps.boards.storage.attachment_storage, upload_to=apps.boards.models.derivative_upload_path)),
+                ('width', models.PositiveIntegerField(default=0)),
+                ('height', models.PositiveIntegerField(default=0)),
+                ('file_size', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('attachment', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='derivatives', to='boards.attachment')),
+            ],
+            options={
+                'unique_together': {('attachment', 'kind')},
+            },
+        ),
+    ]
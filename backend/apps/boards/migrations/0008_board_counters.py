@@ -0,0 +1,47 @@
+# Generated by Django 5.1.1 on 2026-10-18 07:01
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def fill_board_counters(apps, schema_editor):
+    Board = apps.get_model('boards', 'Board')
+    Post = apps.get_model('boards', 'Post')
+    Attachment = apps.get_model('boards', 'Attachment')
+    post_count = Post.objects.filter(board=OuterRef('pk')).order_by().values('board').annotate(total=Count('id'))
+    attachment_count = (
+        Attachment.objects.filter(post__board=OuterRef('pk')).order_by().values('post__board').annotate(total=Count('id'))
+    )
+    latest = Post.objects.filter(board=OuterRef('pk')).order_by('-created_at').values('created_at')[:1]
+    Board.objects.update(
+        post_count=Coalesce(Subquery(post_count.values('total'), output_field=IntegerField()), Value(0)),
+        attachment_count=Coalesce(Subquery(attachment_count.values('total'), output_field=IntegerField()), Value(0)),
+        last_post_at=Subquery(latest),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('boards', '0007_attachmentderivative'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='board',
+            name='attachment_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='board',
+            name='last_post_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='board',
+            name='post_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_board_counters, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,15 @@
 ﻿from __future__ import annotations
 
+import uuid
+
 from django.conf import settings
 from django.db import models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Substr
+
+from .storage import attachment_storage, blob_name, content_sha256, derivative_name
+
+POST_EXCERPT_LENGTH = 300
 
 
 class Board(models.Model):
@@ -13,6 +21,10 @@ class Board(models.Model):
     name = models.CharField(max_length=120, unique=True)
     description = models.TextField(blank=True)
     visibility = models.CharField(max_length=20, choices=Visibility.choices, default=Visibility.BASIC)
+    # Maintained by apps.boards.counters; ``recount_boards`` repairs drift.
+    post_count = models.PositiveIntegerField(default=0, editable=False)
+    attachment_count = models.PositiveIntegerField(default=0, editable=False)
+    last_post_at = models.DateTimeField(null=True, blank=True, editable=False)
 
     class Meta:
         ordering = ['name']
@@ -21,6 +33,42 @@ class Board(models.Model):
         return self.name
 
 
+class PostQuerySet(models.QuerySet):
+    def summaries(self) -> 'PostQuerySet':
+        """Project the columns list views need, without ``content`` or media rows."""
+        attachments = Attachment.objects.filter(post=OuterRef('pk'))
+        attachment_count = attachments.order_by().values('post').annotate(total=Count('id')).values('total')
+        original_image = attachments.filter(mime_type__startswith='image/').order_by('id').values('id')[:1]
+        small_thumbnail = (
+            AttachmentDerivative.objects.filter(
+                attachment__post=OuterRef('pk'), kind=AttachmentDerivative.Kind.THUMB_SMALL
+            )
+            .order_by('attachment_id')
+            .values('attachment_id')[:1]
+        )
+        return (
+            self.select_related('author', 'board')
+            .only(
+                'id',
+                'board_id',
+                'board__name',
+                'author_id',
+                'author__first_name',
+                'author__email',
+                'title',
+                'view_type',
+                'created_at',
+                'updated_at',
+            )
+            .annotate(
+                excerpt=Substr('content', 1, POST_EXCERPT_LENGTH),
+                attachment_count=Coalesce(Subquery(attachment_count, output_field=IntegerField()), Value(0)),
+                thumbnail_attachment_id=Subquery(small_thumbnail),
+                image_attachment_id=Subquery(original_image),
+            )
+        )
+
+
 class Post(models.Model):
     class ViewType(models.TextChoices):
         CARD = 'card', 'Card'
@@ -34,32 +82,82 @@ class Post(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = PostQuerySet.as_manager()
+
     class Meta:
-        ordering = ['-created_at']
+        ordering = ['-created_at', '-id']
+        indexes = [
+            models.Index(fields=['board', '-created_at', '-id'], name='post_board_created_idx'),
+        ]
 
     def __str__(self) -> str:
         return f'{self.title}'
 
 
 def attachment_upload_path(instance: 'Attachment', filename: str) -> str:
+    if instance.sha256:
+        return blob_name(instance.sha256)
     return f'uploads/{instance.post.created_at:%Y/%m}/{filename}'
 
 
 class Attachment(models.Model):
     post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='attachments')
-    file = models.FileField(upload_to=attachment_upload_path)
+    file = models.FileField(upload_to=attachment_upload_path, storage=attachment_storage, max_length=255)
     original_name = models.CharField(max_length=255)
     mime_type = models.CharField(max_length=120, blank=True)
     file_size = models.PositiveIntegerField(default=0)
+    sha256 = models.CharField(max_length=64, blank=True, db_index=True)
 
     def save(self, *args, **kwargs):
         if self.file and not self.file_size:
             self.file_size = self.file.size
         if self.file and not self.original_name:
             self.original_name = self.file.name
+        if self.file and not self.sha256 and not self.file._committed:
+            self.sha256 = content_sha256(self.file.file)
         super().save(*args, **kwargs)
 
 
+class StoredBlob(models.Model):
+    """Lock row for one content-addressed file in attachment storage.
+
+    Writes of the file and the sweep that deletes it once unreferenced both take
+    this row with ``select_for_update``, so a blob that an upload has just found
+    on disk is not removed before the upload's row commits.
+    """
+
+    name = models.CharField(max_length=255, unique=True)
+
+    def __str__(self) -> str:
+        return self.name
+
+
+def derivative_upload_path(instance: 'AttachmentDerivative', filename: str) -> str:
+    attachment = instance.attachment
+    extension = filename.rsplit('.', 1)[-1]
+    if attachment.sha256:
+        return derivative_name(attachment.sha256, instance.kind, extension)
+    return f'derivatives/attachments/{attachment.pk}/{instance.kind}.{extension}'
+
+
+class AttachmentDerivative(models.Model):
+    class Kind(models.TextChoices):
+        THUMB_SMALL = 'thumb_sm', 'Small thumbnail'
+        THUMB_MEDIUM = 'thumb_md', 'Medium thumbnail'
+        PREVIEW = 'preview', 'Preview'
+
+    attachment = models.ForeignKey(Attachment, on_delete=models.CASCADE, related_name='derivatives')
+    kind = models.CharField(max_length=20, choices=Kind.choices)
+    file = models.FileField(upload_to=derivative_upload_path, storage=attachment_storage, max_length=255)
+    width = models.PositiveIntegerField(default=0)
+    height = models.PositiveIntegerField(default=0)
+    file_size = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ('attachment', 'kind')
+
+
 class YoutubeEmbed(models.Model):
     post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='youtube_embeds')
     video_id = models.CharField(max_length=32)
@@ -83,3 +181,35 @@ class BoardAccess(models.Model):
     def __str__(self) -> str:
         return f"{self.user} -> {self.board}"
 
+
+class UploadSession(models.Model):
+    """Resumable upload of a single attachment, received as sequential byte ranges."""
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'Pending'
+        COMPLETED = 'completed', 'Completed'
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='upload_sessions')
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='upload_sessions')
+    file_name = models.CharField(max_length=255)
+    content_type = models.CharField(max_length=120, blank=True)
+    total_size = models.PositiveBigIntegerField()
+    sha256 = models.CharField(max_length=64)
+    received_bytes = models.PositiveBigIntegerField(default=0)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
+    attachment = models.OneToOneField(
+        Attachment, null=True, blank=True, on_delete=models.SET_NULL, related_name='upload_session'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self) -> str:
+        return f'{self.file_name} ({self.received_bytes}/{self.total_size})'
+
+    @property
+    def is_complete(self) -> bool:
+        return self.received_bytes >= self.total_size
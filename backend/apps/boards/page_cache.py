@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import hashlib
+
+from django.core.cache import cache, caches
+
+PAGE_CACHE_ALIAS = 'post_pages'
+PAGE_QUERY_PARAMS = ('cursor', 'page_size', 'view', 'fields')
+HITS_KEY = 'boards:post-page-cache:hits'
+MISSES_KEY = 'boards:post-page-cache:misses'
+
+
+def page_cache():
+    return caches[PAGE_CACHE_ALIAS]
+
+
+def page_cache_key(request, board_id: int, version: str) -> str:
+    """Key a rendered page by board, content version, host and the parameters that shape it.
+
+    The version is bumped once a change to a post, attachment or embed on the
+    board commits, and whenever a board name or author name or email copied
+    into the pages changes, so a request that reads the new version also reads
+    the new rows; stale pages are never read again and simply age out.
+    """
+    params = [(name, request.GET.get(name, '')) for name in PAGE_QUERY_PARAMS]
+    fingerprint = repr((request.build_absolute_uri(request.path), params))
+    digest = hashlib.sha1(fingerprint.encode()).hexdigest()
+    return f'boards:post-page:{board_id}:{version}:{digest}'
+
+
+def _count(key: str) -> None:
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=None)
+
+
+def get_page(key: str):
+    data = page_cache().get(key)
+    _count(MISSES_KEY if data is None else HITS_KEY)
+    return data
+
+
+def set_page(key: str, data) -> None:
+    page_cache().set(key, data)
+
+
+def page_cache_stats() -> dict[str, int]:
+    counts = cache.get_many([HITS_KEY, MISSES_KEY])
+    return {'hits': counts.get(HITS_KEY, 0), 'misses': counts.get(MISSES_KEY, 0)}
+
+
+def reset_page_cache_stats() -> None:
+    cache.delete_many([HITS_KEY, MISSES_KEY])
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+from base64 import b64decode, b64encode
+from urllib import parse
+
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, CursorPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class PostCursorPagination(BasePagination):
+    """Keyset pagination over ``(created_at, id)`` descending.
+
+    Each page is a ``WHERE (created_at, id) < cursor ORDER BY created_at DESC,
+    id DESC LIMIT n`` range scan on the ``(board, -created_at, -id)`` index, so
+    deep pages cost the same as the first one and rows inserted while a client
+    pages never shift or duplicate entries.
+    """
+
+    cursor_query_param = 'cursor'
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    invalid_cursor_message = '잘못된 커서입니다.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        window = self.get_window(queryset, request)
+        return self.set_page(list(window))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        window = self.get_window(queryset, request)
+        return self.set_page([post async for post in window])
+
+    def get_window(self, queryset, request):
+        """Order and bound ``queryset`` to the rows of the requested page plus one look-ahead row."""
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size_value = self.get_page_size(request)
+        self.reverse, self.position = self.decode_cursor(request)
+
+        if self.reverse:
+            queryset = queryset.order_by('created_at', 'id')
+            if self.position is not None:
+                created_at, pk = self.position
+                queryset = queryset.filter(created_at__gte=created_at).exclude(created_at=created_at, id__lte=pk)
+        else:
+            queryset = queryset.order_by('-created_at', '-id')
+            if self.position is not None:
+                created_at, pk = self.position
+                queryset = queryset.filter(created_at__lte=created_at).exclude(created_at=created_at, id__gte=pk)
+        return queryset[: self.page_size_value + 1]
+
+    def set_page(self, results: list) -> list:
+        has_more = len(results) > self.page_size_value
+        page = results[: self.page_size_value]
+        if self.reverse:
+            page.reverse()
+
+        self.has_next = has_more if not self.reverse else self.position is not None
+        self.has_previous = self.position is not None if not self.reverse else has_more
+        self.page = page
+        return page
+
+    def get_page_size(self, request) -> int:
+        raw = request.query_params.get(self.page_size_query_param)
+        if raw:
+            try:
+                size = int(raw)
+            except ValueError:
+                size = 0
+            if size > 0:
+                return min(size, self.max_page_size)
+        return self.page_size
+
+    def decode_cursor(self, request) -> tuple[bool, tuple | None]:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return False, None
+        try:
+            querystring = b64decode(encoded.encode('ascii')).decode('ascii')
+            tokens = parse.parse_qs(querystring, keep_blank_values=True)
+            reverse = tokens.get('r', ['0'])[0] == '1'
+            created_at = parse_datetime(tokens['t'][0])
+            pk = int(tokens['i'][0])
+        except (TypeError, ValueError, KeyError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if created_at is None:
+            raise NotFound(self.invalid_cursor_message)
+        return reverse, (created_at, pk)
+
+    def encode_cursor(self, post, reverse: bool) -> str:
+        tokens = {'t': post.created_at.isoformat(), 'i': str(post.pk)}
+        if reverse:
+            tokens['r'] = '1'
+        querystring = parse.urlencode(tokens, doseq=True)
+        encoded = b64encode(querystring.encode('ascii')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self) -> str | None:
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self) -> str | None:
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                'next': self.get_next_link(),
+                'previous': self.get_previous_link(),
+                'results': data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class AccessMatrixPagination(CursorPagination):
+    """Users of the access matrix, keyed on their unique email so no offsets are needed."""
+
+    ordering = 'email'
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    invalid_cursor_message = '잘못된 커서입니다.'
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from rest_framework import permissions
+
+from apps.accounts.models import User
+
+from .models import Board
+from .visibility import avisible_board_ids, visible_board_ids
+
+
+class IsAdminRole(permissions.BasePermission):
+    def has_permission(self, request, view) -> bool:
+        return bool(request.user and request.user.is_authenticated and request.user.role == User.Role.ADMIN)
+
+
+class IsPostAuthorOrAdmin(permissions.BasePermission):
+    def has_object_permission(self, request, view, obj) -> bool:
+        if request.method in permissions.SAFE_METHODS:
+            return True
+        if not request.user or not request.user.is_authenticated:
+            return False
+        if request.user.role == User.Role.ADMIN:
+            return True
+        return obj.author_id == request.user.id
+
+
+def request_visible_board_ids(request) -> frozenset[int]:
+    """Visible board ids for ``request.user``, resolved at most once per request."""
+    board_ids = getattr(request, '_visible_board_ids', None)
+    if board_ids is None:
+        board_ids = visible_board_ids(request.user)
+        request._visible_board_ids = board_ids
+    return board_ids
+
+
+def can_view_board(request, board_id: int) -> bool:
+    user = request.user
+    if not user or not user.is_authenticated:
+        return False
+    if user.role == User.Role.ADMIN:
+        return True
+    return board_id in request_visible_board_ids(request)
+
+
+def user_can_view_board(user, board_id: int) -> bool:
+    """``can_view_board`` without the per-request memo, for checks repeated during a long response."""
+    if not user or not user.is_authenticated:
+        return False
+    if user.role == User.Role.ADMIN:
+        return True
+    return board_id in visible_board_ids(user)
+
+
+async def acan_view_board(user, board_id: int) -> bool:
+    if not user or not user.is_authenticated:
+        return False
+    if user.role == User.Role.ADMIN:
+        return True
+    return board_id in await avisible_board_ids(user)
+
+
+class CanViewBoard(permissions.BasePermission):
+    """Apply the board visibility rules to board-scoped views.
+
+    List views are checked through the ``board_id`` URL kwarg and detail views
+    through the object's board, both against the cached visible-board set, so
+    the check costs no queries on a cache hit.
+    """
+
+    message = '이 게시판에 접근할 권한이 없습니다.'
+
+    def has_permission(self, request, view) -> bool:
+        board_id = view.kwargs.get('board_id')
+        if board_id is None:
+            return True
+        return can_view_board(request, int(board_id))
+
+    def has_object_permission(self, request, view, obj) -> bool:
+        board_id = obj.pk if isinstance(obj, Board) else obj.board_id
+        return can_view_board(request, board_id)
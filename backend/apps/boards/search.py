@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Iterable
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+from .models import Post
+
+SEARCH_TABLE = 'boards_post_search'
+
+HANGUL_RUN = re.compile(r'[가-힣]+')
+WORD = re.compile(r'[가-힣]+|[^\W_가-힣]+')
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into index terms.
+
+    Hangul runs are broken into overlapping character bigrams so that Korean
+    words match regardless of attached particles (``게시판에서`` still matches
+    ``게시판``); other scripts are lower-cased whole words.
+    """
+    tokens: list[str] = []
+    for match in WORD.finditer(text.lower()):
+        word = match.group()
+        if HANGUL_RUN.fullmatch(word) and len(word) > 1:
+            tokens.extend(word[index : index + 2] for index in range(len(word) - 1))
+        else:
+            tokens.append(word)
+    return tokens
+
+
+def _is_prefix_term(token: str) -> bool:
+    """A lone Hangul syllable never appears as an indexed bigram, so match it as a prefix."""
+    return len(token) == 1 and bool(HANGUL_RUN.fullmatch(token))
+
+
+class BaseSearchBackend:
+    def index_post(self, post: Post) -> None:
+        raise NotImplementedError
+
+    def remove_post(self, post_id: int) -> None:
+        raise NotImplementedError
+
+    def search(self, query: str, board_ids: Iterable[int] | None = None, limit: int = 20) -> list[int]:
+        """Return matching post ids, best match first."""
+        raise NotImplementedError
+
+    def filter_queryset(self, queryset, query: str):
+        """Narrow a ``Post`` queryset to every match, unranked and unbounded, so callers can paginate it."""
+        raise NotImplementedError
+
+    def rebuild(self, batch_size: int = 500) -> int:
+        raise NotImplementedError
+
+    def _documents(self, batch_size: int):
+        rows = Post.objects.order_by().values_list('id', 'title', 'content').iterator(chunk_size=batch_size)
+        batch = []
+        for post_id, title, content in rows:
+            batch.append((post_id, ' '.join(tokenize(title)), ' '.join(tokenize(content))))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+class SQLiteFTSBackend(BaseSearchBackend):
+    """SQLite FTS5 virtual table keyed by ``rowid = post.id``."""
+
+    def index_post(self, post: Post) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {SEARCH_TABLE} WHERE rowid = %s', [post.pk])
+            cursor.execute(
+                f'INSERT INTO {SEARCH_TABLE} (rowid, title, body) VALUES (%s, %s, %s)',
+                [post.pk, ' '.join(tokenize(post.title)), ' '.join(tokenize(post.content))],
+            )
+
+    def remove_post(self, post_id: int) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {SEARCH_TABLE} WHERE rowid = %s', [post_id])
+
+    def build_query(self, query: str) -> str:
+        terms = []
+        for token in tokenize(query):
+            terms.append(f'"{token}"*' if _is_prefix_term(token) else f'"{token}"')
+        return ' '.join(terms)
+
+    def search(self, query: str, board_ids: Iterable[int] | None = None, limit: int = 20) -> list[int]:
+        match = self.build_query(query)
+        if not match:
+            return []
+        sql = (
+            f'SELECT s.rowid FROM {SEARCH_TABLE} s JOIN boards_post p ON p.id = s.rowid '
+            f'WHERE {SEARCH_TABLE} MATCH %s'
+        )
+        params: list = [match]
+        if board_ids is not None:
+            board_ids = list(board_ids)
+            if not board_ids:
+                return []
+            sql += f' AND p.board_id IN ({", ".join(["%s"] * len(board_ids))})'
+            params.extend(board_ids)
+        sql += f' ORDER BY bm25({SEARCH_TABLE}, 10.0, 1.0), p.created_at DESC LIMIT %s'
+        params.append(limit)
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return [row[0] for row in cursor.fetchall()]
+
+    def filter_queryset(self, queryset, query: str):
+        match = self.build_query(query)
+        if not match:
+            return queryset.none()
+        return queryset.filter(
+            id__in=RawSQL(f'SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s', [match])
+        )
+
+    def rebuild(self, batch_size: int = 500) -> int:
+        total = 0
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {SEARCH_TABLE}')
+            for batch in self._documents(batch_size):
+                cursor.executemany(f'INSERT INTO {SEARCH_TABLE} (rowid, title, body) VALUES (%s, %s, %s)', batch)
+                total += len(batch)
+        return total
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """``tsvector`` column with a GIN index, built with the ``simple`` configuration."""
+
+    document_sql = "setweight(to_tsvector('simple', %s), 'A') || setweight(to_tsvector('simple', %s), 'B')"
+
+    def index_post(self, post: Post) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {SEARCH_TABLE} (post_id, document) VALUES (%s, {self.document_sql}) '
+                'ON CONFLICT (post_id) DO UPDATE SET document = EXCLUDED.document',
+                [post.pk, ' '.join(tokenize(post.title)), ' '.join(tokenize(post.content))],
+            )
+
+    def remove_post(self, post_id: int) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {SEARCH_TABLE} WHERE post_id = %s', [post_id])
+
+    def build_query(self, query: str) -> str:
+        terms = []
+        for token in tokenize(query):
+            terms.append(f"'{token}':*" if _is_prefix_term(token) else f"'{token}'")
+        return ' & '.join(terms)
+
+    def search(self, query: str, board_ids: Iterable[int] | None = None, limit: int = 20) -> list[int]:
+        tsquery = self.build_query(query)
+        if not tsquery:
+            return []
+        sql = (
+            f"SELECT s.post_id FROM {SEARCH_TABLE} s JOIN boards_post p ON p.id = s.post_id, "
+            "to_tsquery('simple', %s) q WHERE s.document @@ q"
+        )
+        params: list = [tsquery]
+        if board_ids is not None:
+            board_ids = list(board_ids)
+            if not board_ids:
+                return []
+            sql += ' AND p.board_id = ANY(%s)'
+            params.append(board_ids)
+        sql += ' ORDER BY ts_rank(s.document, q) DESC, p.created_at DESC LIMIT %s'
+        params.append(limit)
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return [row[0] for row in cursor.fetchall()]
+
+    def filter_queryset(self, queryset, query: str):
+        tsquery = self.build_query(query)
+        if not tsquery:
+            return queryset.none()
+        return queryset.filter(
+            id__in=RawSQL(f"SELECT post_id FROM {SEARCH_TABLE} WHERE document @@ to_tsquery('simple', %s)", [tsquery])
+        )
+
+    def rebuild(self, batch_size: int = 500) -> int:
+        total = 0
+        with connection.cursor() as cursor:
+            cursor.execute(f'TRUNCATE {SEARCH_TABLE}')
+            for batch in self._documents(batch_size):
+                cursor.executemany(
+                    f'INSERT INTO {SEARCH_TABLE} (post_id, document) VALUES (%s, {self.document_sql})', batch
+                )
+                total += len(batch)
+        return total
+
+
+class DatabaseScanBackend(BaseSearchBackend):
+    """Unindexed ``icontains`` fallback for databases without a native full-text index."""
+
+    def index_post(self, post: Post) -> None:
+        pass
+
+    def remove_post(self, post_id: int) -> None:
+        pass
+
+    def search(self, query: str, board_ids: Iterable[int] | None = None, limit: int = 20) -> list[int]:
+        if not query.split():
+            return []
+        queryset = self.filter_queryset(Post.objects.all(), query)
+        if board_ids is not None:
+            queryset = queryset.filter(board_id__in=list(board_ids))
+        return list(queryset.order_by('-created_at', '-id').values_list('id', flat=True)[:limit])
+
+    def filter_queryset(self, queryset, query: str):
+        words = query.split()
+        if not words:
+            return queryset.none()
+        for word in words:
+            queryset = queryset.filter(Q(title__icontains=word) | Q(content__icontains=word))
+        return queryset
+
+    def rebuild(self, batch_size: int = 500) -> int:
+        return 0
+
+
+VENDOR_BACKENDS = {
+    'sqlite': SQLiteFTSBackend,
+    'postgresql': PostgresSearchBackend,
+}
+
+
+@lru_cache(maxsize=1)
+def get_search_backend() -> BaseSearchBackend:
+    backend_path = getattr(settings, 'BOARD_SEARCH_BACKEND', None)
+    if backend_path:
+        return import_string(backend_path)()
+    return VENDOR_BACKENDS.get(connection.vendor, DatabaseScanBackend)()
@@ -3,11 +3,21 @@
 import re
 from typing import Iterable
 
+from django.conf import settings
+from django.db import transaction
+from django.urls import reverse
 from rest_framework import serializers
 
-from .models import Attachment, Board, Post, YoutubeEmbed
+from config.metrics import TimedListSerializer, TimedSerializerMixin
+
+from .counters import attachments_changed
+from .derivatives import schedule_derivatives
+from .models import Attachment, AttachmentDerivative, Board, Post, UploadSession, YoutubeEmbed
+from .storage import blob_locks, blob_name, content_sha256
+from .youtube import build_embeds, post_touched_by_caller, schedule_enrichment
 
 YOUTUBE_REGEX = re.compile(r"(?:v=|youtu\.be/|embed/)([A-Za-z0-9_-]{11})")
+SHA256_REGEX = re.compile(r"^[0-9a-f]{64}$")
 
 
 def extract_video_id(url: str) -> str | None:
@@ -17,11 +27,43 @@ def extract_video_id(url: str) -> str | None:
     return None
 
 
+def extract_video_ids(urls: Iterable[str]) -> list[str]:
+    """Distinct video ids found in ``urls``, in first-seen order."""
+    video_ids = (extract_video_id(url) for url in urls)
+    return list(dict.fromkeys(video_id for video_id in video_ids if video_id))
+
+
+def absolute_url(serializer: serializers.Serializer, url: str) -> str:
+    request = serializer.context.get('request')
+    if request is not None:
+        return request.build_absolute_uri(url)
+    return url
+
+
 class AttachmentSerializer(serializers.ModelSerializer):
+    """Files are only reachable through the board-access checked endpoints, never as ``/media/`` URLs."""
+
+    download_url = serializers.SerializerMethodField()
+    thumbnails = serializers.SerializerMethodField()
+
     class Meta:
         model = Attachment
-        fields = ['id', 'file', 'original_name', 'mime_type', 'file_size']
-        read_only_fields = ['id', 'file_size']
+        fields = ['id', 'original_name', 'mime_type', 'file_size', 'download_url', 'thumbnails']
+        read_only_fields = fields
+
+    def get_thumbnails(self, obj: Attachment) -> dict[str, dict]:
+        thumbnails = {}
+        for derivative in obj.derivatives.all():
+            url = reverse('attachment-derivative', kwargs={'pk': obj.pk, 'kind': derivative.kind})
+            thumbnails[derivative.kind] = {
+                'url': absolute_url(self, url),
+                'width': derivative.width,
+                'height': derivative.height,
+            }
+        return thumbnails
+
+    def get_download_url(self, obj: Attachment) -> str:
+        return absolute_url(self, reverse('attachment-download', kwargs={'pk': obj.pk}))
 
 
 class YoutubeEmbedSerializer(serializers.ModelSerializer):
@@ -31,13 +73,14 @@ class YoutubeEmbedSerializer(serializers.ModelSerializer):
         read_only_fields = ['id']
 
 
-class BoardSerializer(serializers.ModelSerializer):
+class BoardSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Board
-        fields = ['id', 'name', 'description', 'visibility']
+        list_serializer_class = TimedListSerializer
+        fields = ['id', 'name', 'description', 'visibility', 'post_count', 'attachment_count', 'last_post_at']
 
 
-class PostSerializer(serializers.ModelSerializer):
+class PostSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     attachments = AttachmentSerializer(many=True, read_only=True)
     youtube_embeds = YoutubeEmbedSerializer(many=True, read_only=True)
     author_name = serializers.SerializerMethodField()
@@ -46,6 +89,7 @@ class PostSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Post
+        list_serializer_class = TimedListSerializer
         fields = [
             'id',
             'board',
@@ -76,6 +120,46 @@ class PostSerializer(serializers.ModelSerializer):
         return 'admin@shashoo.com'
 
 
+class PostSummarySerializer(PostSerializer):
+    """List projection backed by ``Post.objects.summaries()``.
+
+    Skips ``content`` and the nested media serializers; the excerpt, attachment
+    count and first image come from queryset annotations instead.
+    """
+
+    excerpt = serializers.CharField(read_only=True)
+    attachment_count = serializers.IntegerField(read_only=True)
+    thumbnail = serializers.SerializerMethodField()
+
+    class Meta(PostSerializer.Meta):
+        fields = [
+            'id',
+            'board',
+            'board_name',
+            'author',
+            'author_name',
+            'author_email',
+            'title',
+            'excerpt',
+            'view_type',
+            'created_at',
+            'updated_at',
+            'attachment_count',
+            'thumbnail',
+        ]
+        read_only_fields = fields
+
+    def get_thumbnail(self, obj: Post):
+        thumbnail_id = getattr(obj, 'thumbnail_attachment_id', None)
+        if thumbnail_id:
+            kwargs = {'pk': thumbnail_id, 'kind': AttachmentDerivative.Kind.THUMB_SMALL}
+            return absolute_url(self, reverse('attachment-derivative', kwargs=kwargs))
+        image_id = getattr(obj, 'image_attachment_id', None)
+        if image_id:
+            return absolute_url(self, reverse('attachment-download', kwargs={'pk': image_id}) + '?inline=1')
+        return None
+
+
 class PostWriteSerializer(PostSerializer):
     attachments = serializers.ListField(
         child=serializers.FileField(max_length=1024 * 1024 * 50),
@@ -94,53 +178,79 @@ class PostWriteSerializer(PostSerializer):
         attachments_data: Iterable = validated_data.pop('attachments', [])
         youtube_links: Iterable[str] = validated_data.pop('youtube_links', [])
         request = self.context['request']
-        post = Post.objects.create(author=request.user, **validated_data)
 
-        for uploaded in attachments_data:
-            Attachment.objects.create(
-                post=post,
-                file=uploaded,
-                original_name=getattr(uploaded, 'name', ''),
-                mime_type=getattr(uploaded, 'content_type', ''),
-                file_size=uploaded.size,
+        with transaction.atomic():
+            post = Post.objects.create(author=request.user, **validated_data)
+            attachments = self.save_attachments(post, attachments_data)
+            schedule_derivatives(attachment.pk for attachment in attachments)
+            attachments_changed(post.pk, len(attachments))
+            embeds = YoutubeEmbed.objects.bulk_create(
+                build_embeds(post, extract_video_ids(youtube_links)), ignore_conflicts=True
             )
-
-        for link in youtube_links:
-            video_id = extract_video_id(link)
-            if video_id:
-                YoutubeEmbed.objects.get_or_create(post=post, video_id=video_id)
+            schedule_enrichment(embeds)
         return post
 
     def update(self, instance: Post, validated_data: dict):
         attachments_data: Iterable = validated_data.pop('attachments', [])
         youtube_links: Iterable[str] = validated_data.pop('youtube_links', [])
 
-        for attr, value in validated_data.items():
-            setattr(instance, attr, value)
-        instance.save()
+        with transaction.atomic():
+            for attr, value in validated_data.items():
+                setattr(instance, attr, value)
+            instance.save()
+
+            attachments = self.save_attachments(instance, attachments_data)
+            schedule_derivatives(attachment.pk for attachment in attachments)
+            attachments_changed(instance.pk, len(attachments))
+
+            if youtube_links:
+                self.sync_youtube_embeds(instance, extract_video_ids(youtube_links))
+        return instance
+
+    def save_attachments(self, post: Post, uploads: Iterable) -> list[Attachment]:
+        attachments = self.build_attachments(post, uploads)
+        with blob_locks(blob_name(attachment.sha256) for attachment in attachments):
+            return Attachment.objects.bulk_create(attachments)
 
-        for uploaded in attachments_data:
-            Attachment.objects.create(
-                post=instance,
+    @staticmethod
+    def build_attachments(post: Post, uploads: Iterable) -> list[Attachment]:
+        return [
+            Attachment(
+                post=post,
                 file=uploaded,
                 original_name=getattr(uploaded, 'name', ''),
                 mime_type=getattr(uploaded, 'content_type', ''),
                 file_size=uploaded.size,
+                sha256=getattr(uploaded, 'sha256', '') or content_sha256(uploaded),
             )
+            for uploaded in uploads
+        ]
 
-        if youtube_links:
-            instance.youtube_embeds.all().delete()
-            for link in youtube_links:
-                video_id = extract_video_id(link)
-                if video_id:
-                    YoutubeEmbed.objects.get_or_create(post=instance, video_id=video_id)
-        return instance
+    @staticmethod
+    def sync_youtube_embeds(post: Post, video_ids: list[str]) -> None:
+        """Make the post's embeds match ``video_ids``, touching only rows that differ.
+
+        Stale rows are deleted without each one touching the post; the caller
+        saves ``post`` in the same transaction, which bumps its version and
+        publishes a single ``updated`` event.
+        """
+        existing = {embed.video_id for embed in post.youtube_embeds.all()}
+        stale = existing.difference(video_ids)
+        if stale:
+            with post_touched_by_caller(post.pk):
+                post.youtube_embeds.filter(video_id__in=stale).delete()
+        embeds = YoutubeEmbed.objects.bulk_create(
+            build_embeds(post, [video_id for video_id in video_ids if video_id not in existing]),
+            ignore_conflicts=True,
+        )
+        schedule_enrichment(embeds)
 
 
 
-class BoardSummarySerializer(serializers.ModelSerializer):
+class BoardSummarySerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Board
+        list_serializer_class = TimedListSerializer
         fields = ['id', 'name', 'description', 'visibility']
 
 
@@ -149,5 +259,51 @@ class BoardAccessUpdateSerializer(serializers.Serializer):
     boardIds = serializers.ListField(child=serializers.IntegerField(), allow_empty=True)
 
 
+class BoardAccessBoardChangeSerializer(serializers.Serializer):
+    boardId = serializers.IntegerField()
+    grant = serializers.ListField(child=serializers.IntegerField(), required=False, default=list)
+    revoke = serializers.ListField(child=serializers.IntegerField(), required=False, default=list)
+
+
+class BoardAccessBulkSerializer(serializers.Serializer):
+    """User-centric replacements (``users``) and board-centric grant/revoke lists (``boards``)."""
+
+    users = BoardAccessUpdateSerializer(many=True, required=False, default=list)
+    boards = BoardAccessBoardChangeSerializer(many=True, required=False, default=list)
 
+    def validate(self, attrs):
+        if not attrs['users'] and not attrs['boards']:
+            raise serializers.ValidationError('변경할 권한 항목이 없습니다.')
+        return attrs
 
+
+class UploadSessionSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    class Meta:
+        model = UploadSession
+        list_serializer_class = TimedListSerializer
+        fields = [
+            'id',
+            'post',
+            'file_name',
+            'content_type',
+            'total_size',
+            'sha256',
+            'received_bytes',
+            'status',
+            'attachment',
+            'created_at',
+        ]
+        read_only_fields = ['id', 'received_bytes', 'status', 'attachment', 'created_at']
+
+    def validate_total_size(self, value: int) -> int:
+        if value <= 0:
+            raise serializers.ValidationError('파일 크기는 0보다 커야 합니다.')
+        if value > settings.ATTACHMENT_MAX_SIZE:
+            raise serializers.ValidationError('허용된 첨부파일 크기를 초과했습니다.')
+        return value
+
+    def validate_sha256(self, value: str) -> str:
+        value = value.lower()
+        if not SHA256_REGEX.match(value):
+            raise serializers.ValidationError('SHA-256 체크섬 형식이 잘못되었습니다.')
+        return value
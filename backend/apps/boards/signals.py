@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.accounts.models import User
+
+from .conditional import bump_board_posts_version, bump_post_payload_stamp, touch_posts
+from .counters import attachments_changed, post_added, post_removed
+from .derivatives import schedule_derivatives
+from .events import publish_post_event
+from .models import Attachment, AttachmentDerivative, Board, BoardAccess, Post, StoredBlob, YoutubeEmbed
+from .search import get_search_backend
+from .storage import lock_blob
+from .visibility import invalidate_all_visibility, invalidate_user_visibility
+from .youtube import is_post_touched_by_caller
+
+VISIBILITY_USER_FIELDS = {'role', 'premium_until'}
+# Fields copied into post payloads (``board_name``, ``author_name``, ``author_email``).
+POST_PAYLOAD_BOARD_FIELDS = {'name'}
+POST_PAYLOAD_USER_FIELDS = {'first_name', 'email'}
+
+
+def _touches(update_fields, fields: set[str]) -> bool:
+    return update_fields is None or bool(fields.intersection(update_fields))
+
+
+@receiver(post_save, sender=Board)
+@receiver(post_delete, sender=Board)
+def board_changed(sender, instance: Board, **kwargs):
+    transaction.on_commit(invalidate_all_visibility)
+
+
+@receiver(post_save, sender=Board)
+def board_saved(sender, instance: Board, created: bool, update_fields=None, **kwargs):
+    if not created and _touches(update_fields, POST_PAYLOAD_BOARD_FIELDS):
+        transaction.on_commit(bump_post_payload_stamp)
+
+
+@receiver(post_save, sender=BoardAccess)
+@receiver(post_delete, sender=BoardAccess)
+def board_access_changed(sender, instance: BoardAccess, **kwargs):
+    # After commit, or a request in between could cache the old ids under the new generation.
+    user_id = instance.user_id
+    transaction.on_commit(lambda: invalidate_user_visibility(user_id))
+
+
+@receiver(post_save, sender=User)
+def user_changed(sender, instance: User, created: bool, update_fields=None, **kwargs):
+    if created:
+        return
+    if _touches(update_fields, VISIBILITY_USER_FIELDS):
+        user_id = instance.pk
+        transaction.on_commit(lambda: invalidate_user_visibility(user_id))
+    if _touches(update_fields, POST_PAYLOAD_USER_FIELDS):
+        transaction.on_commit(bump_post_payload_stamp)
+
+
+@receiver(post_save, sender=Post)
+def post_saved(sender, instance: Post, created: bool, raw: bool = False, **kwargs):
+    if not raw:
+        get_search_backend().index_post(instance)
+        if created:
+            post_added(instance)
+        publish_post_event('created' if created else 'updated', instance.pk, instance.board_id)
+    board_id = instance.board_id
+    transaction.on_commit(lambda: bump_board_posts_version(board_id))
+
+
+@receiver(post_delete, sender=Post)
+def post_deleted(sender, instance: Post, **kwargs):
+    get_search_backend().remove_post(instance.pk)
+    post_removed(instance)
+    publish_post_event('deleted', instance.pk, instance.board_id)
+    board_id = instance.board_id
+    transaction.on_commit(lambda: bump_board_posts_version(board_id))
+
+
+@receiver(post_save, sender=YoutubeEmbed)
+@receiver(post_delete, sender=YoutubeEmbed)
+def youtube_embed_changed(sender, instance: YoutubeEmbed, raw: bool = False, **kwargs):
+    if not raw and not is_post_touched_by_caller(instance.post_id):
+        touch_posts(Post.objects.filter(pk=instance.post_id))
+
+
+def release_stored_file(field, name: str, references) -> None:
+    """Delete a stored file once ``references`` is empty.
+
+    The check and the delete hold the blob's row lock, which a write of the same
+    content takes before it reuses the file on disk.
+    """
+    with transaction.atomic():
+        lock_blob(name)
+        if not references.exists():
+            field.storage.delete(name)
+            StoredBlob.objects.filter(name=name).delete()
+
+
+def release_attachment_file(name: str, sha256: str) -> None:
+    references = Attachment.objects.filter(sha256=sha256) if sha256 else Attachment.objects.filter(file=name)
+    release_stored_file(Attachment._meta.get_field('file'), name, references)
+
+
+@receiver(post_delete, sender=Attachment)
+def attachment_deleted(sender, instance: Attachment, **kwargs):
+    touch_posts(Post.objects.filter(pk=instance.post_id))
+    attachments_changed(instance.post_id, -1)
+    if instance.file:
+        name, sha256 = instance.file.name, instance.sha256
+        transaction.on_commit(lambda: release_attachment_file(name, sha256))
+
+
+@receiver(post_save, sender=Attachment)
+def attachment_saved(sender, instance: Attachment, created: bool, raw: bool = False, **kwargs):
+    if raw:
+        return
+    touch_posts(Post.objects.filter(pk=instance.post_id))
+    if created:
+        attachments_changed(instance.post_id, 1)
+        schedule_derivatives([instance.pk])
+
+
+def release_derivative_file(name: str) -> None:
+    references = AttachmentDerivative.objects.filter(file=name)
+    release_stored_file(AttachmentDerivative._meta.get_field('file'), name, references)
+
+
+@receiver(post_save, sender=AttachmentDerivative)
+def derivative_saved(sender, instance: AttachmentDerivative, raw: bool = False, **kwargs):
+    if not raw:
+        touch_posts(Post.objects.filter(attachments=instance.attachment_id))
+
+
+@receiver(post_delete, sender=AttachmentDerivative)
+def derivative_deleted(sender, instance: AttachmentDerivative, **kwargs):
+    touch_posts(Post.objects.filter(attachments=instance.attachment_id))
+    if instance.file:
+        name = instance.file.name
+        transaction.on_commit(lambda: release_derivative_file(name))
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import hashlib
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterable
+
+from django.core.files.storage import FileSystemStorage, storages
+from django.db import transaction
+from django.core.files.uploadhandler import MemoryFileUploadHandler, TemporaryFileUploadHandler
+
+BLOB_PREFIX = 'blobs'
+DERIVATIVE_PREFIX = 'derivatives'
+CONTENT_ADDRESSED_PREFIXES = (f'{BLOB_PREFIX}/', f'{DERIVATIVE_PREFIX}/')
+HASH_CHUNK_SIZE = 64 * 1024
+
+_held_blob_locks: ContextVar[frozenset[str]] = ContextVar('held_blob_locks', default=frozenset())
+
+
+def blob_name(sha256: str) -> str:
+    return f'{BLOB_PREFIX}/{sha256[:2]}/{sha256[2:4]}/{sha256}'
+
+
+def derivative_name(sha256: str, kind: str, extension: str) -> str:
+    return f'{DERIVATIVE_PREFIX}/{sha256[:2]}/{sha256[2:4]}/{sha256}/{kind}.{extension}'
+
+
+def content_sha256(content) -> str:
+    """Hash a file-like object in chunks, leaving it rewound for the subsequent save."""
+    digest = hashlib.sha256()
+    if hasattr(content, 'seek'):
+        content.seek(0)
+    if hasattr(content, 'chunks'):
+        chunks = content.chunks(HASH_CHUNK_SIZE)
+    else:
+        chunks = iter(lambda: content.read(HASH_CHUNK_SIZE), b'')
+    for chunk in chunks:
+        digest.update(chunk)
+    if hasattr(content, 'seek'):
+        content.seek(0)
+    return digest.hexdigest()
+
+
+def lock_blobs(names: Iterable[str]) -> None:
+    """Take the ``StoredBlob`` row locks for ``names`` until the surrounding transaction ends.
+
+    Two queries however many names; rows are locked in name order so writers
+    never deadlock, and a row deleted by a concurrent release is recreated.
+    """
+    from .models import StoredBlob
+
+    names = sorted(set(names))
+    while names:
+        StoredBlob.objects.bulk_create([StoredBlob(name=name) for name in names], ignore_conflicts=True)
+        locked = StoredBlob.objects.select_for_update().filter(name__in=names).order_by('name')
+        names = sorted(set(names).difference(locked.values_list('name', flat=True)))
+
+
+def lock_blob(name: str) -> None:
+    lock_blobs([name])
+
+
+@contextmanager
+def blob_locks(names: Iterable[str]):
+    """Lock ``names`` up front so storage writes inside the block skip their own per-file lock.
+
+    Use inside a transaction that also saves the rows referencing the files.
+    """
+    names = frozenset(names)
+    lock_blobs(names)
+    token = _held_blob_locks.set(_held_blob_locks.get() | names)
+    try:
+        yield
+    finally:
+        _held_blob_locks.reset(token)
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """File system storage where a name already on disk is reused, not suffixed.
+
+    Attachment and derivative names are derived from the SHA-256 of the source
+    content, so an existing name means identical bytes and the write can be
+    skipped. The check runs under the blob's lock (``lock_blob`` or an
+    enclosing ``blob_locks``) inside the caller's transaction, which should also
+    save the row that references the file.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        if name.startswith(CONTENT_ADDRESSED_PREFIXES):
+            return name
+        return super().get_available_name(name, max_length=max_length)
+
+    def _save(self, name, content):
+        if not name.startswith(CONTENT_ADDRESSED_PREFIXES):
+            return super()._save(name, content)
+        if name in _held_blob_locks.get():
+            return self._save_once(name, content)
+        with transaction.atomic():
+            lock_blob(name)
+            return self._save_once(name, content)
+
+    def _save_once(self, name, content):
+        if self.exists(name):
+            return name
+        return super()._save(name, content)
+
+
+def attachment_storage():
+    return storages['attachments']
+
+
+class HashingUploadHandlerMixin:
+    """Compute the SHA-256 of an upload while Django receives it, exposed as ``uploaded.sha256``."""
+
+    def new_file(self, *args, **kwargs):
+        self.digest = hashlib.sha256()
+        super().new_file(*args, **kwargs)
+
+    def receive_data_chunk(self, raw_data, start):
+        self.digest.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        uploaded = super().file_complete(file_size)
+        if uploaded is not None:
+            uploaded.sha256 = self.digest.hexdigest()
+        return uploaded
+
+
+class HashingMemoryFileUploadHandler(HashingUploadHandlerMixin, MemoryFileUploadHandler):
+    pass
+
+
+class HashingTemporaryFileUploadHandler(HashingUploadHandlerMixin, TemporaryFileUploadHandler):
+    pass
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+
+logger = logging.getLogger(__name__)
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.BOARD_TASK_WORKERS, thread_name_prefix='board-task'
+                )
+    return _executor
+
+
+def _run(func, args) -> None:
+    close_old_connections()
+    try:
+        func(*args)
+    except Exception:
+        logger.exception('Background task %s failed', getattr(func, '__name__', func))
+    finally:
+        connection.close()
+
+
+def run_task(func, *args) -> None:
+    """Run ``func`` off the request path, or inline when ``BOARD_TASKS_EAGER`` is set."""
+    if settings.BOARD_TASKS_EAGER:
+        func(*args)
+        return
+    get_executor().submit(_run, func, args)
+
+
+def run_task_on_commit(func, *args) -> None:
+    transaction.on_commit(lambda: run_task(func, *args))
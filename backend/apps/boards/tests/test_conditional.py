@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from apps.accounts.models import User
+from apps.boards.models import Board, Post
+from apps.boards.page_cache import page_cache_stats
+from config.testing import clear_caches
+
+
+class PostValidatorTests(APITestCase):
+    """Renaming a board or editing an author changes every validator of the posts that embed them."""
+
+    def setUp(self):
+        clear_caches()
+        self.author = User.objects.create_user('author@example.com', first_name='Before', status=User.Status.APPROVED)
+        self.board = Board.objects.create(name='before')
+        self.post = Post.objects.create(board=self.board, author=self.author, title='post', content='body')
+        self.client.force_authenticate(self.author)
+        self.urls = [
+            reverse('post-list', args=[self.board.pk]),
+            f"{reverse('post-list', args=[self.board.pk])}?fields=summary",
+            reverse('post-detail', args=[self.post.pk]),
+        ]
+
+    def assertRefetched(self, change, expected: str):
+        etags = {url: self.client.get(url)['ETag'] for url in self.urls}
+        with self.captureOnCommitCallbacks(execute=True):
+            change()
+        for url, etag in etags.items():
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 200, url)
+            self.assertIn(expected, response.content.decode(), url)
+
+    def test_board_rename(self):
+        def rename():
+            self.board.name = 'after'
+            self.board.save(update_fields=['name'])
+
+        self.assertRefetched(rename, '"board_name":"after"')
+
+    def test_author_name(self):
+        def rename():
+            self.author.first_name = 'After'
+            self.author.save(update_fields=['first_name'])
+
+        self.assertRefetched(rename, '"author_name":"After"')
+
+    def test_author_email(self):
+        def change_email():
+            self.author.email = 'renamed@example.com'
+            self.author.save()
+
+        self.assertRefetched(change_email, '"author_email":"renamed@example.com"')
+
+    def test_unrelated_user_field_keeps_validators(self):
+        url = reverse('post-detail', args=[self.post.pk])
+        etag = self.client.get(url)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.author.organization = 'elsewhere'
+            self.author.save(update_fields=['organization'])
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_renamed_pages_are_not_served_from_the_page_cache(self):
+        url = reverse('post-list', args=[self.board.pk])
+        self.client.get(url)
+        self.assertEqual(page_cache_stats(), {'hits': 0, 'misses': 1})
+        self.client.get(url)
+        self.assertEqual(page_cache_stats(), {'hits': 1, 'misses': 1})
+        with self.captureOnCommitCallbacks(execute=True):
+            self.board.name = 'after'
+            self.board.save(update_fields=['name'])
+        self.assertIn('"board_name":"after"', self.client.get(url).content.decode())
+        self.assertEqual(page_cache_stats(), {'hits': 1, 'misses': 2})
+
+
+class PostListVersionTests(APITestCase):
+    """The list ETag moves on every committed change, even when count and newest post look the same."""
+
+    def setUp(self):
+        clear_caches()
+        self.author = User.objects.create_user('author@example.com', status=User.Status.APPROVED)
+        self.board = Board.objects.create(name='versions')
+        Post.objects.create(board=self.board, author=self.author, title='kept', content='body')
+        Post.objects.create(board=self.board, author=self.author, title='older', content='body')
+        self.client.force_authenticate(self.author)
+        self.url = reverse('post-list', args=[self.board.pk])
+
+    def test_create_then_delete_changes_the_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            post = Post.objects.create(board=self.board, author=self.author, title='brief', content='body')
+        with self.captureOnCommitCallbacks(execute=True):
+            post.delete()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_create_misses_the_page_cache_for_the_same_cursor(self):
+        first_page = self.client.get(self.url, {'page_size': 1})
+        url = first_page.data['next']
+        self.client.get(url)
+        self.client.get(url)
+        self.assertEqual(page_cache_stats(), {'hits': 1, 'misses': 2})
+        with self.captureOnCommitCallbacks(execute=True):
+            Post.objects.create(board=self.board, author=self.author, title='fresh', content='body')
+        self.client.get(url)
+        self.assertEqual(page_cache_stats(), {'hits': 1, 'misses': 3})
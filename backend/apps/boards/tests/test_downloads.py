@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import shutil
+import tempfile
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from apps.accounts.models import User
+from apps.boards.models import Attachment, Board, Post
+
+CONTENT = b'0123456789'
+
+
+class AttachmentDownloadTests(APITestCase):
+    """Downloads honour Range, If-None-Match and If-Range, or hand the transfer to the proxy."""
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=media_root, ATTACHMENT_SENDFILE_BACKEND='')
+        media.enable()
+        self.addCleanup(media.disable)
+
+        user = User.objects.create_user('reader@example.com', status=User.Status.APPROVED)
+        post = Post.objects.create(board=Board.objects.create(name='files'), author=user, title='post', content='body')
+        self.attachment = Attachment.objects.create(
+            post=post, file=SimpleUploadedFile('digits.txt', CONTENT, 'text/plain'), mime_type='text/plain'
+        )
+        self.url = reverse('attachment-download', args=[self.attachment.pk])
+        self.client.force_authenticate(user)
+
+    def get(self, **headers):
+        response = self.client.get(self.url, **headers)
+        self.addCleanup(response.close)
+        return response
+
+    def test_full_download(self):
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), CONTENT)
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+
+    def test_range(self):
+        response = self.get(HTTP_RANGE='bytes=2-5')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], f'bytes 2-5/{len(CONTENT)}')
+        self.assertEqual(b''.join(response.streaming_content), CONTENT[2:6])
+
+    def test_suffix_range(self):
+        response = self.get(HTTP_RANGE='bytes=-3')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b''.join(response.streaming_content), CONTENT[-3:])
+
+    def test_unsatisfiable_range(self):
+        response = self.get(HTTP_RANGE=f'bytes={len(CONTENT)}-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f'bytes */{len(CONTENT)}')
+
+    def test_if_none_match(self):
+        etag = self.get()['ETag']
+        response = self.get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_if_range(self):
+        etag = self.get()['ETag']
+        self.assertEqual(self.get(HTTP_RANGE='bytes=0-1', HTTP_IF_RANGE=etag).status_code, 206)
+        response = self.get(HTTP_RANGE='bytes=0-1', HTTP_IF_RANGE='"stale"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), CONTENT)
+
+    @override_settings(ATTACHMENT_SENDFILE_BACKEND='nginx', ATTACHMENT_SENDFILE_PREFIX='/protected-media/')
+    def test_x_accel_redirect(self):
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Accel-Redirect'], f'/protected-media/{self.attachment.file.name}')
+        self.assertEqual(response.content, b'')
+        self.assertIn('digits.txt', response['Content-Disposition'])
+
+    @override_settings(ATTACHMENT_SENDFILE_BACKEND='apache')
+    def test_x_sendfile(self):
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Sendfile'], self.attachment.file.path)
+        self.assertEqual(response.content, b'')
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import time
+
+from asgiref.sync import async_to_sync
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from apps.accounts.models import User
+from apps.boards.events import aboard_event_stream, board_event_stream, get_broker
+from apps.boards.models import Board
+
+HEARTBEAT = 0.05
+
+
+class BoardEventStreamTests(APITestCase):
+    """WSGI requests are told to poll instead of holding a worker thread per open tab."""
+
+    def setUp(self):
+        self.user = User.objects.create_user('reader@example.com', status=User.Status.APPROVED)
+        self.board = Board.objects.create(name='events')
+        self.client.force_authenticate(self.user)
+        self.url = reverse('board-events', args=[self.board.pk])
+
+    def test_wsgi_request_gets_no_content(self):
+        response = self.client.get(self.url, HTTP_ACCEPT='text/event-stream')
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(response.streaming)
+
+    @override_settings(BOARD_EVENT_STREAMS_WSGI=True)
+    def test_wsgi_streams_when_enabled(self):
+        response = self.client.get(self.url, HTTP_ACCEPT='text/event-stream')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        self.assertTrue(next(iter(response.streaming_content)).startswith(b'retry: '))
+        response.close()
+
+
+@override_settings(BOARD_EVENT_BROKER='apps.boards.events.InMemoryBroker', BOARD_EVENT_HEARTBEAT=HEARTBEAT)
+class BusyStreamRevocationTests(SimpleTestCase):
+    """Access is re-checked every heartbeat even when events never let the stream go idle."""
+
+    board_id = 1
+
+    def setUp(self):
+        get_broker.cache_clear()
+        self.addCleanup(get_broker.cache_clear)
+        self.allowed = True
+
+    def publish(self):
+        get_broker().publish(self.board_id, 'created', {'id': 1})
+
+    def test_sync_stream(self):
+        stream = board_event_stream(self.board_id, None, lambda: self.allowed)
+        next(stream)
+        self.publish()
+        self.assertIn(b'event: created', next(stream))
+        self.allowed = False
+        time.sleep(HEARTBEAT)
+        self.publish()
+        self.assertEqual(list(stream), [])
+
+    def test_async_stream(self):
+        async def still_allowed():
+            return self.allowed
+
+        async def consume():
+            stream = aboard_event_stream(self.board_id, None, still_allowed)
+            await anext(stream)
+            self.publish()
+            first = await anext(stream)
+            self.allowed = False
+            time.sleep(HEARTBEAT)
+            self.publish()
+            return first, [frame async for frame in stream]
+
+        first, rest = async_to_sync(consume)()
+        self.assertIn(b'event: created', first)
+        self.assertEqual(rest, [])
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import shutil
+import tempfile
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from apps.accounts.models import User
+from apps.boards.models import Attachment, Board, Post
+from config.testing import clear_caches
+
+
+class PremiumBoardAccessTests(APITestCase):
+    """Basic users reach a premium board's posts and files only through a grant."""
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+        clear_caches()
+
+        self.admin = User.objects.create_user('admin@example.com', role=User.Role.ADMIN, status=User.Status.APPROVED)
+        self.basic = User.objects.create_user('basic@example.com', status=User.Status.APPROVED)
+        self.board = Board.objects.create(name='premium', visibility=Board.Visibility.PREMIUM)
+        post = Post.objects.create(board=self.board, author=self.admin, title='post', content='body')
+        attachment = Attachment.objects.create(post=post, file=SimpleUploadedFile('notes.txt', b'notes', 'text/plain'))
+        self.urls = [
+            reverse('post-list', args=[self.board.pk]),
+            reverse('post-detail', args=[post.pk]),
+            reverse('attachment-download', args=[attachment.pk]),
+        ]
+
+    def assertStatuses(self, expected: int):
+        self.client.force_authenticate(self.basic)
+        for url in self.urls:
+            self.assertEqual(self.client.get(url).status_code, expected, url)
+
+    def change_access(self, change: str):
+        self.client.force_authenticate(self.admin)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse('board-access-bulk'),
+                {'boards': [{'boardId': self.board.pk, change: [self.basic.pk]}]},
+                format='json',
+            )
+        self.assertEqual(response.status_code, 200, response.data)
+
+    def test_basic_user_is_forbidden(self):
+        self.assertStatuses(403)
+
+    def test_bulk_grant_and_revoke(self):
+        self.change_access('grant')
+        self.assertStatuses(200)
+        self.change_access('revoke')
+        self.assertStatuses(403)
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import shutil
+import tempfile
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from apps.accounts.models import User
+from apps.boards.models import Board, Post, YoutubeEmbed
+from config.testing import clear_caches
+
+
+def uploads(total: int, tag: str) -> list[SimpleUploadedFile]:
+    return [SimpleUploadedFile(f'{tag}-{index}.txt', f'{tag} {index}'.encode(), 'text/plain') for index in range(total)]
+
+
+def youtube_links(total: int, tag: str) -> list[str]:
+    return [f'https://youtu.be/{tag}{index:0{11 - len(tag)}d}' for index in range(total)]
+
+
+class PostWriteQueryTests(APITestCase):
+    """Creating or updating a post costs the same number of queries for 1 or 10 attachments and links."""
+
+    sizes = (1, 10)
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=media_root, YOUTUBE_METADATA_FETCHER='apps.boards.youtube.StubYoutubeFetcher')
+        media.enable()
+        self.addCleanup(media.disable)
+
+        self.author = User.objects.create_user('writer@example.com', status=User.Status.APPROVED)
+        self.board = Board.objects.create(name='writes')
+        self.client.force_authenticate(self.author)
+
+    def count_queries(self, send) -> int:
+        clear_caches()
+        with CaptureQueriesContext(connection) as captured:
+            response = send()
+        self.assertIn(response.status_code, {200, 201}, response.content[:300])
+        return len(captured)
+
+    def assertConstant(self, counts: dict[int, int]):
+        self.assertEqual(len(set(counts.values())), 1, f'query count grows with attachments and links: {counts}')
+
+    def test_create(self):
+        url = reverse('post-list', args=[self.board.pk])
+        counts = {
+            size: self.count_queries(
+                lambda: self.client.post(
+                    url,
+                    {
+                        'title': f'post {size}',
+                        'content': 'body',
+                        'attachments': uploads(size, f'create{size}'),
+                        'youtube_links': youtube_links(size, f'c{size}'),
+                    },
+                    format='multipart',
+                )
+            )
+            for size in self.sizes
+        }
+        self.assertConstant(counts)
+
+    def test_update(self):
+        counts = {}
+        for size in self.sizes:
+            post = Post.objects.create(board=self.board, author=self.author, title='post', content='body')
+            YoutubeEmbed.objects.bulk_create(
+                YoutubeEmbed(post=post, video_id=link[-11:]) for link in youtube_links(size, f'old{size}')
+            )
+            # Every existing embed is replaced, so the stale ones are deleted too.
+            counts[size] = self.count_queries(
+                lambda: self.client.patch(
+                    reverse('post-detail', args=[post.pk]),
+                    {
+                        'attachments': uploads(size, f'update{size}'),
+                        'youtube_links': youtube_links(size, f'u{size}'),
+                    },
+                    format='multipart',
+                )
+            )
+            self.assertEqual(post.youtube_embeds.count(), size)
+        self.assertConstant(counts)
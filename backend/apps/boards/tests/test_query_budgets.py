@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+import shutil
+import tempfile
+from itertools import count
+
+from django.test import override_settings
+from django.urls import reverse
+
+from apps.accounts.models import User
+from apps.boards.models import Attachment, AttachmentDerivative, Board, BoardAccess, Post, YoutubeEmbed
+from apps.boards.storage import blob_name, derivative_name
+from apps.boards.tests.test_post_writes import uploads, youtube_links
+from config.testing import QueryBudgetTestCase
+
+_sequence = count()
+
+
+def make_user(role: str = User.Role.BASIC) -> User:
+    return User.objects.create_user(f'user{next(_sequence)}@example.com', role=role, status=User.Status.APPROVED)
+
+
+def add_boards(total: int, visibility: str = Board.Visibility.BASIC) -> list[Board]:
+    boards = Board.objects.bulk_create(
+        Board(name=f'board {next(_sequence)}', visibility=visibility) for _ in range(total)
+    )
+    return list(Board.objects.filter(pk__in=[board.pk for board in boards]))
+
+
+def add_posts(board: Board, total: int, media: int = 2) -> list[Post]:
+    """``total`` posts by distinct authors, each with ``media`` attachments, thumbnails and embeds."""
+    authors = User.objects.bulk_create(
+        User.objects.build_user(f'author{next(_sequence)}@example.com', first_name='Author') for _ in range(total)
+    )
+    posts = Post.objects.bulk_create(
+        Post(board=board, author=author, title=f'post {next(_sequence)}', content='content ' * 50)
+        for author in authors
+    )
+    add_media(posts, media)
+    return posts
+
+
+def add_media(posts: list[Post], total: int) -> None:
+    attachments = Attachment.objects.bulk_create(
+        Attachment(
+            post=post,
+            file=blob_name(f'{next(_sequence):064x}'),
+            original_name='image.png',
+            mime_type='image/png',
+            file_size=1024,
+        )
+        for post in posts
+        for _ in range(total)
+    )
+    AttachmentDerivative.objects.bulk_create(
+        AttachmentDerivative(
+            attachment=attachment,
+            kind=kind,
+            file=derivative_name(f'{attachment.pk:064x}', kind, 'webp'),
+            width=320,
+            height=240,
+        )
+        for attachment in attachments
+        for kind in (AttachmentDerivative.Kind.THUMB_SMALL, AttachmentDerivative.Kind.THUMB_MEDIUM)
+    )
+    YoutubeEmbed.objects.bulk_create(
+        YoutubeEmbed(post=post, video_id=f'video{next(_sequence):06d}', title='Video') for post in posts for _ in range(total)
+    )
+
+
+class BoardQueryBudgetTests(QueryBudgetTestCase):
+    query_budgets = {
+        'board-list': 2,
+        'board-detail': 1,
+        # ETag aggregate, page, attachments, derivatives, embeds; ?fields=summary needs only the first two.
+        'post-list': 5,
+        'post-detail': 4,
+        'board-post-search': 2,
+        'post-search': 2,
+        'board-access-management': 3,
+        'board-access-matrix': 2,
+        # Writes include the savepoint pair. Attachments cost a batched blob lock (2), one insert and one
+        # counter update and embeds one insert however many there are; the response reloads author and embeds.
+        'POST post-list': 14,
+        # Loads the post and its media once, then fetches and deletes the replaced embeds in two statements.
+        'PATCH post-detail': 17,
+        # User check, boards, current grants, the delete's signal fetch, then one delete, update and insert.
+        'POST board-access-bulk': 9,
+    }
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=media_root, YOUTUBE_METADATA_FETCHER='apps.boards.youtube.StubYoutubeFetcher')
+        media.enable()
+        self.addCleanup(media.disable)
+
+        self.admin = make_user(User.Role.ADMIN)
+        self.basic = make_user(User.Role.BASIC)
+        self.board = add_boards(1)[0]
+
+    def test_board_list(self):
+        self.authenticate(self.basic)
+
+        def grow(size):
+            add_boards(size)
+            granted = add_boards(size, Board.Visibility.PREMIUM)
+            BoardAccess.objects.bulk_create(BoardAccess(user=self.basic, board=board) for board in granted)
+
+        self.assertQueryBudget('board-list', lambda size: self.client.get(reverse('board-list')), grow)
+
+    def test_board_detail(self):
+        self.authenticate(self.admin)
+        self.assertQueryBudget(
+            'board-detail',
+            lambda size: self.client.get(reverse('board-detail', args=[self.board.pk])),
+            lambda size: add_posts(self.board, size),
+        )
+
+    def test_post_list(self):
+        self.authenticate(self.basic)
+        url = reverse('post-list', args=[self.board.pk])
+        for params in ({}, {'fields': 'summary'}):
+            with self.subTest(**params):
+                self.assertQueryBudget(
+                    'post-list',
+                    lambda size: self.client.get(url, {**params, 'page_size': size}),
+                    lambda size: add_posts(self.board, size),
+                )
+
+    def test_post_detail(self):
+        self.authenticate(self.basic)
+        post = add_posts(self.board, 1, media=0)[0]
+        self.assertQueryBudget(
+            'post-detail',
+            lambda size: self.client.get(reverse('post-detail', args=[post.pk])),
+            lambda size: add_media([post], size),
+        )
+
+    def test_post_search(self):
+        self.authenticate(self.basic)
+
+        def grow(size):
+            # bulk_create skips the search index; save() runs the signal that indexes each post.
+            for post in add_posts(self.board, size):
+                post.save()
+
+        self.assertQueryBudget(
+            'board-post-search',
+            lambda size: self.client.get(reverse('board-post-search', args=[self.board.pk]), {'q': 'content'}),
+            grow,
+        )
+        self.assertQueryBudget(
+            'post-search',
+            lambda size: self.client.get(reverse('post-search'), {'q': 'content'}),
+            grow,
+        )
+
+    def test_board_access_management(self):
+        self.authenticate(self.admin)
+
+        def grow(size):
+            boards = add_boards(size, Board.Visibility.PREMIUM)
+            BoardAccess.objects.bulk_create(BoardAccess(user=make_user(), board=board) for board in boards)
+
+        self.assertQueryBudget(
+            'board-access-management', lambda size: self.client.get(reverse('board-access-management')), grow
+        )
+
+    def test_board_access_matrix(self):
+        self.authenticate(self.admin)
+
+        def grow(size):
+            boards = add_boards(size, Board.Visibility.PREMIUM)
+            BoardAccess.objects.bulk_create(BoardAccess(user=make_user(), board=board) for board in boards)
+
+        self.assertQueryBudget(
+            'board-access-matrix',
+            lambda size: self.client.get(reverse('board-access-matrix'), {'page_size': size}),
+            grow,
+        )
+
+    def test_post_create(self):
+        self.authenticate(self.basic)
+        url = reverse('post-list', args=[self.board.pk])
+        self.assertQueryBudget(
+            'post-list',
+            lambda size: self.client.post(
+                url,
+                {
+                    'title': f'post {size}',
+                    'content': 'body',
+                    'attachments': uploads(size, f'create{size}'),
+                    'youtube_links': youtube_links(size, f'c{size}'),
+                },
+                format='multipart',
+            ),
+            method='POST',
+            status=201,
+        )
+
+    def test_post_update(self):
+        self.authenticate(self.basic)
+        posts = {}
+
+        def grow(size):
+            post = posts[size] = Post.objects.create(board=self.board, author=self.basic, title='post', content='body')
+            add_media([post], size)
+
+        self.assertQueryBudget(
+            'post-detail',
+            lambda size: self.client.patch(
+                reverse('post-detail', args=[posts[size].pk]),
+                {
+                    'title': 'edited',
+                    'attachments': uploads(size, f'update{size}'),
+                    'youtube_links': youtube_links(size, f'u{size}'),
+                },
+                format='multipart',
+            ),
+            grow,
+            method='PATCH',
+        )
+
+    def test_board_access_bulk(self):
+        self.authenticate(self.admin)
+        changes = {}
+
+        def grow(size):
+            users = [make_user() for _ in range(size)]
+            granted, hidden, added = (add_boards(size, Board.Visibility.PREMIUM) for _ in range(3))
+            BoardAccess.objects.bulk_create(
+                [BoardAccess(user=user, board=board) for user in users for board in granted]
+                + [BoardAccess(user=user, board=board, can_view=False) for user in users for board in hidden]
+            )
+            # Every user keeps half the grants, loses the rest, re-enables hidden rows and gains new boards.
+            kept = [board.pk for board in granted[: size // 2]]
+            changes[size] = {
+                'users': [
+                    {'userId': user.pk, 'boardIds': kept + [board.pk for board in hidden]} for user in users
+                ],
+                'boards': [{'boardId': board.pk, 'grant': [user.pk for user in users]} for board in added],
+            }
+
+        self.assertQueryBudget(
+            'board-access-bulk',
+            lambda size: self.client.post(reverse('board-access-bulk'), changes[size], format='json'),
+            grow,
+            # Fixtures grow with the square of the size; past 100 rows Django deletes in batches of 100.
+            sizes=(1, 3, 9),
+            method='POST',
+        )
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import re
+import time
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.test import AsyncClient, RequestFactory, SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from apps.accounts.models import User
+from apps.accounts.serializers import ClaimsTokenObtainPairSerializer
+from apps.boards.models import Board, Post
+from apps.boards.serializers import PostSerializer
+from config.metrics import collect_timings, metrics_view, registry
+from config.testing import clear_caches
+
+SERVER_TIMING_QUERIES = re.compile(r'db;[^,]*desc="(\d+) queries"')
+
+
+@override_settings(MIDDLEWARE=['config.metrics.RequestMetricsMiddleware', *settings.MIDDLEWARE])
+class RequestMetricsTests(APITestCase):
+    """The middleware counts the same queries whether the request comes through WSGI or ASGI."""
+
+    def setUp(self):
+        registry.reset()
+        self.addCleanup(registry.reset)
+        user = User.objects.create_user('reader@example.com', status=User.Status.APPROVED)
+        board = Board.objects.create(name='metrics')
+        Post.objects.create(board=board, author=user, title='post', content='body')
+        token = ClaimsTokenObtainPairSerializer.get_token(user).access_token
+        self.headers = {'Authorization': f'Bearer {token}'}
+        self.url = reverse('post-list', args=[board.pk])
+
+    def queries(self, response) -> int:
+        self.assertEqual(response.status_code, 200)
+        return int(SERVER_TIMING_QUERIES.search(response['Server-Timing']).group(1))
+
+    def test_async_requests_are_counted(self):
+        sync_queries = self.queries(self.client.get(self.url, headers=self.headers))
+        clear_caches()
+        response = async_to_sync(AsyncClient().get)(self.url, headers=self.headers)
+        self.assertGreater(sync_queries, 0)
+        self.assertEqual(self.queries(response), sync_queries)
+        self.assertIn('view="post-list",method="GET",status="200"} 2', registry.render())
+
+
+class SlowPostSerializer(PostSerializer):
+    def to_representation(self, instance):
+        time.sleep(0.05)
+        return super().to_representation(instance)
+
+
+class SerializeTimingTests(APITestCase):
+    """``serialize`` covers building the representation, not only encoding it."""
+
+    def setUp(self):
+        user = User.objects.create_user('reader@example.com', status=User.Status.APPROVED)
+        board = Board.objects.create(name='metrics')
+        self.posts = [Post.objects.create(board=board, author=user, title=f'post {i}', content='body') for i in range(2)]
+
+    def test_slow_representation_is_charged_to_serialize(self):
+        with collect_timings() as timings:
+            SlowPostSerializer(self.posts[0]).data
+        self.assertGreaterEqual(timings.serialize_seconds, 0.05)
+
+    def test_slow_list_representation_is_charged_once(self):
+        with collect_timings() as timings:
+            started = time.perf_counter()
+            SlowPostSerializer(self.posts, many=True).data
+            elapsed = time.perf_counter() - started
+        self.assertGreaterEqual(timings.serialize_seconds, 0.1)
+        self.assertLessEqual(timings.serialize_seconds, elapsed)
+
+
+class MetricsEndpointTests(SimpleTestCase):
+    @override_settings(DEBUG=False, REQUEST_METRICS_TOKEN='')
+    def test_refused_without_token_outside_debug(self):
+        self.assertEqual(metrics_view(RequestFactory().get('/metrics')).status_code, 403)
+
+    @override_settings(DEBUG=False, REQUEST_METRICS_TOKEN='secret')
+    def test_token_required(self):
+        self.assertEqual(metrics_view(RequestFactory().get('/metrics')).status_code, 401)
+        request = RequestFactory().get('/metrics', headers={'Authorization': 'Bearer secret'})
+        self.assertEqual(metrics_view(request).status_code, 200)
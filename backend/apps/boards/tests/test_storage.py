@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import shutil
+import tempfile
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import transaction
+from django.test import TestCase, override_settings
+
+from apps.accounts.models import User
+from apps.boards.models import Attachment, Board, Post
+from apps.boards.storage import attachment_storage
+
+CONTENT = b'shared bytes'
+
+
+class ContentAddressedStorageTests(TestCase):
+    """Attachments with the same bytes share one file, removed only once the last reference is gone."""
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+
+        author = User.objects.create_user('writer@example.com', status=User.Status.APPROVED)
+        board = Board.objects.create(name='files')
+        self.first, self.second = (
+            Attachment.objects.create(
+                post=Post.objects.create(board=board, author=author, title=title, content='body'),
+                file=SimpleUploadedFile(f'{title}.txt', CONTENT, 'text/plain'),
+            )
+            for title in ('first', 'second')
+        )
+        self.name = self.first.file.name
+
+    def delete(self, attachment: Attachment) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            attachment.delete()
+
+    def test_posts_share_one_blob(self):
+        self.assertEqual(self.second.file.name, self.name)
+        self.delete(self.first)
+        self.assertTrue(attachment_storage().exists(self.name))
+
+    def test_last_delete_removes_the_blob(self):
+        self.delete(self.first)
+        self.delete(self.second)
+        self.assertFalse(attachment_storage().exists(self.name))
+
+    def test_rolled_back_delete_keeps_the_blob(self):
+        self.delete(self.first)
+        pk = self.second.pk
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                self.second.delete()
+                raise RuntimeError
+        self.assertEqual(callbacks, [])
+        self.assertTrue(Attachment.objects.filter(pk=pk).exists())
+        self.assertTrue(attachment_storage().exists(self.name))
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import hashlib
+import shutil
+import tempfile
+
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from apps.accounts.models import User
+from apps.boards.models import Attachment, Board, Post, UploadSession
+
+CONTENT = b'0123456789'
+CONTENT_SHA256 = hashlib.sha256(CONTENT).hexdigest()
+
+
+class UploadSessionTests(APITestCase):
+    """Ranges must arrive in order for the session's size, and only the owner can see or finish it."""
+
+    def setUp(self):
+        media_root, session_root = tempfile.mkdtemp(), tempfile.mkdtemp()
+        for path in (media_root, session_root):
+            self.addCleanup(shutil.rmtree, path, ignore_errors=True)
+        roots = override_settings(MEDIA_ROOT=media_root, UPLOAD_SESSION_ROOT=session_root)
+        roots.enable()
+        self.addCleanup(roots.disable)
+
+        self.author = User.objects.create_user('writer@example.com', status=User.Status.APPROVED)
+        self.post = Post.objects.create(
+            board=Board.objects.create(name='uploads'), author=self.author, title='post', content='body'
+        )
+        self.client.force_authenticate(self.author)
+
+    def open_session(self, sha256: str = CONTENT_SHA256) -> str:
+        response = self.client.post(
+            reverse('upload-session-create'),
+            {
+                'post': self.post.pk,
+                'file_name': 'digits.txt',
+                'content_type': 'text/plain',
+                'total_size': len(CONTENT),
+                'sha256': sha256,
+            },
+            format='json',
+        )
+        self.assertEqual(response.status_code, 201, response.data)
+        return response.data['id']
+
+    def send(self, session_id: str, start: int, end: int, total: int = len(CONTENT)):
+        return self.client.put(
+            reverse('upload-session-detail', args=[session_id]),
+            CONTENT[start : end + 1],
+            content_type='application/octet-stream',
+            HTTP_CONTENT_RANGE=f'bytes {start}-{end}/{total}',
+        )
+
+    def complete(self, session_id: str):
+        return self.client.post(reverse('upload-session-complete', args=[session_id]))
+
+    def test_out_of_order_range_is_refused(self):
+        session_id = self.open_session()
+        response = self.send(session_id, 5, 9)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data['received_bytes'], 0)
+
+    def test_overlapping_range_is_refused(self):
+        session_id = self.open_session()
+        self.assertEqual(self.send(session_id, 0, 4).data, {'received_bytes': 5})
+        response = self.send(session_id, 3, 9)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data['received_bytes'], 5)
+
+    def test_wrong_total_is_refused(self):
+        session_id = self.open_session()
+        self.assertEqual(self.send(session_id, 0, 4, total=len(CONTENT) + 1).status_code, 400)
+        self.assertEqual(UploadSession.objects.get(pk=session_id).received_bytes, 0)
+
+    def test_checksum_mismatch_restarts_the_upload(self):
+        session_id = self.open_session(sha256='0' * 64)
+        self.send(session_id, 0, 9)
+        self.assertEqual(self.complete(session_id).status_code, 400)
+        self.assertEqual(UploadSession.objects.get(pk=session_id).received_bytes, 0)
+        self.assertFalse(Attachment.objects.exists())
+
+    def test_completing_twice(self):
+        session_id = self.open_session()
+        self.send(session_id, 0, 4)
+        self.send(session_id, 5, 9)
+        self.assertEqual(self.complete(session_id).status_code, 201)
+        self.assertEqual(self.complete(session_id).status_code, 409)
+        self.assertEqual(Attachment.objects.filter(post=self.post).count(), 1)
+
+    def test_other_users_session_is_not_found(self):
+        session_id = self.open_session()
+        self.client.force_authenticate(User.objects.create_user('other@example.com', status=User.Status.APPROVED))
+        self.assertEqual(self.client.get(reverse('upload-session-detail', args=[session_id])).status_code, 404)
+        self.assertEqual(self.send(session_id, 0, 9).status_code, 404)
+        self.assertEqual(self.complete(session_id).status_code, 404)
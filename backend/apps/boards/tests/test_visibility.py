@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from django.test import TestCase
+
+from apps.accounts.models import User
+from apps.boards.models import Board, BoardAccess
+from apps.boards.visibility import current_generation, visible_board_ids
+from config.testing import clear_caches
+
+
+class VisibilityInvalidationTests(TestCase):
+    """Cached board ids are dropped once the change commits, not while it is still private."""
+
+    def setUp(self):
+        clear_caches()
+        self.user = User.objects.create_user('member@example.com', status=User.Status.APPROVED)
+        self.board = Board.objects.create(name='premium', visibility=Board.Visibility.PREMIUM)
+
+    def test_grant_is_visible_after_commit(self):
+        self.assertEqual(visible_board_ids(self.user), frozenset())
+        with self.captureOnCommitCallbacks() as callbacks:
+            BoardAccess.objects.create(board=self.board, user=self.user)
+            self.assertEqual(visible_board_ids(self.user), frozenset())
+        for callback in callbacks:
+            callback()
+        self.assertEqual(visible_board_ids(self.user), {self.board.pk})
+
+    def test_evicted_generation_restarts_above_the_old_one(self):
+        generation = current_generation()
+        clear_caches()
+        self.assertGreater(current_generation(), generation)
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import hashlib
+import re
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files import File
+
+from .models import UploadSession
+
+STREAM_CHUNK_SIZE = 64 * 1024
+CONTENT_RANGE_REGEX = re.compile(r'^bytes (\d+)-(\d+)/(\d+)$')
+
+
+class StagedFile(File):
+    """A finished staging file; ``FileSystemStorage`` moves it instead of copying it."""
+
+    def temporary_file_path(self) -> str:
+        return self.file.name
+
+
+def parse_content_range(header: str) -> tuple[int, int, int] | None:
+    """Parse ``bytes start-end/total`` into ``(start, length, total)``."""
+    match = CONTENT_RANGE_REGEX.match(header.strip())
+    if not match:
+        return None
+    start, end, total = (int(value) for value in match.groups())
+    if end < start or end >= total:
+        return None
+    return start, end - start + 1, total
+
+
+def staging_path(session: UploadSession) -> Path:
+    return Path(settings.UPLOAD_SESSION_ROOT) / f'{session.pk}.part'
+
+
+def write_range(session: UploadSession, stream, start: int, length: int) -> int:
+    """Copy up to ``length`` bytes from ``stream`` into the staging file at ``start``.
+
+    The body is streamed in fixed-size chunks so worker memory stays bounded,
+    and anything past ``start`` from an earlier interrupted attempt is dropped.
+    Returns the number of bytes actually written.
+    """
+    path = staging_path(session)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    written = 0
+    with open(path, 'r+b' if path.exists() else 'wb') as handle:
+        handle.seek(start)
+        handle.truncate()
+        while written < length:
+            chunk = stream.read(min(STREAM_CHUNK_SIZE, length - written))
+            if not chunk:
+                break
+            handle.write(chunk)
+            written += len(chunk)
+    return written
+
+
+def staged_sha256(session: UploadSession) -> str:
+    digest = hashlib.sha256()
+    with open(staging_path(session), 'rb') as handle:
+        for chunk in iter(lambda: handle.read(STREAM_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def discard_staged(session: UploadSession) -> None:
+    staging_path(session).unlink(missing_ok=True)
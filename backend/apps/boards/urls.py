@@ -1,12 +1,49 @@
-﻿from django.urls import path
+﻿from django.conf import settings
+from django.urls import path
 
-from .views import BoardAccessManagementView, BoardDetailView, BoardListCreateView, PostDetailView, PostListCreateView
+from .views import (
+    AttachmentDerivativeView,
+    AttachmentDownloadView,
+    BoardAccessBulkView,
+    BoardAccessManagementView,
+    BoardAccessMatrixView,
+    BoardDetailView,
+    BoardEventStreamView,
+    BoardListCreateView,
+    PostDetailView,
+    PostListCreateView,
+    PostSearchView,
+    UploadSessionCompleteView,
+    UploadSessionCreateView,
+    UploadSessionDetailView,
+)
+
+if settings.BOARD_ASYNC_READS:
+    from . import async_views
+
+    board_list_view = async_views.board_list
+    post_list_view = async_views.post_list
+    post_detail_view = async_views.post_detail
+else:
+    board_list_view = BoardListCreateView.as_view()
+    post_list_view = PostListCreateView.as_view()
+    post_detail_view = PostDetailView.as_view()
 
 urlpatterns = [
     path('admin/board-access/', BoardAccessManagementView.as_view(), name='board-access-management'),
-    path('', BoardListCreateView.as_view(), name='board-list'),
+    path('admin/board-access/bulk/', BoardAccessBulkView.as_view(), name='board-access-bulk'),
+    path('admin/board-access/matrix/', BoardAccessMatrixView.as_view(), name='board-access-matrix'),
+    path('', board_list_view, name='board-list'),
     path('<int:pk>/', BoardDetailView.as_view(), name='board-detail'),
-    path('<int:board_id>/posts/', PostListCreateView.as_view(), name='post-list'),
-    path('posts/<int:pk>/', PostDetailView.as_view(), name='post-detail'),
+    path('<int:board_id>/posts/', post_list_view, name='post-list'),
+    path('<int:board_id>/events/', BoardEventStreamView.as_view(), name='board-events'),
+    path('<int:board_id>/posts/search/', PostSearchView.as_view(), name='board-post-search'),
+    path('posts/search/', PostSearchView.as_view(), name='post-search'),
+    path('posts/<int:pk>/', post_detail_view, name='post-detail'),
+    path('attachments/<int:pk>/download/', AttachmentDownloadView.as_view(), name='attachment-download'),
+    path('attachments/<int:pk>/derivatives/<str:kind>/', AttachmentDerivativeView.as_view(), name='attachment-derivative'),
+    path('uploads/', UploadSessionCreateView.as_view(), name='upload-session-create'),
+    path('uploads/<uuid:pk>/', UploadSessionDetailView.as_view(), name='upload-session-detail'),
+    path('uploads/<uuid:pk>/complete/', UploadSessionCompleteView.as_view(), name='upload-session-complete'),
 ]
 
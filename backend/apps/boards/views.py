@@ -1,34 +1,67 @@
 ﻿from django.shortcuts import get_object_or_404
 from rest_framework import generics, permissions, status
+from rest_framework.exceptions import PermissionDenied, ValidationError
 
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
 from django.db import transaction
-from django.db.models import Q
+from django.db.models import Q, prefetch_related_objects
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from apps.accounts.authentication import atoken_is_current, token_is_current
 from apps.accounts.models import User
 from apps.accounts.serializers import UserSerializer
 
-from .models import Board, BoardAccess, Post
-from .serializers import BoardAccessUpdateSerializer, BoardSerializer, BoardSummarySerializer, PostSerializer, PostWriteSerializer
-
-
-class IsAdminRole(permissions.BasePermission):
-    def has_permission(self, request, view) -> bool:
-        return bool(request.user and request.user.is_authenticated and request.user.role == User.Role.ADMIN)
-
-
-class IsPostAuthorOrAdmin(permissions.BasePermission):
-    def has_object_permission(self, request, view, obj: Post) -> bool:
-        if request.method in permissions.SAFE_METHODS:
-            return True
-        if not request.user or not request.user.is_authenticated:
-            return False
-        if request.user.role == User.Role.ADMIN:
-            return True
-        return obj.author_id == request.user.id
-
-
-class BoardListCreateView(generics.ListCreateAPIView):
+from .access import IdList, apply_board_access, parse_id_list
+from .conditional import ConditionalGetMixin, board_list_version, board_posts_version, make_etag, post_validators
+from .downloads import (
+    DownloadTarget,
+    FileContentNegotiation,
+    attachment_target,
+    derivative_target,
+    sendfile_response,
+    stream_response,
+)
+from .events import (
+    EventStreamRenderer,
+    aboard_event_stream,
+    board_event_stream,
+    event_stream_response,
+    parse_last_event_id,
+    streams_enabled,
+)
+from .models import Attachment, AttachmentDerivative, Board, BoardAccess, Post, UploadSession
+from .page_cache import get_page, page_cache_key, set_page
+from .pagination import AccessMatrixPagination, PostCursorPagination
+from .permissions import (
+    CanViewBoard,
+    IsAdminRole,
+    IsPostAuthorOrAdmin,
+    acan_view_board,
+    can_view_board,
+    request_visible_board_ids,
+    user_can_view_board,
+)
+from .search import get_search_backend
+from .serializers import (
+    AttachmentSerializer,
+    BoardAccessBulkSerializer,
+    BoardAccessUpdateSerializer,
+    BoardSerializer,
+    BoardSummarySerializer,
+    PostSerializer,
+    PostSummarySerializer,
+    PostWriteSerializer,
+    UploadSessionSerializer,
+)
+from .uploads import StagedFile, discard_staged, parse_content_range, staged_sha256, staging_path, write_range
+from .visibility import current_generation
+
+
+class BoardListCreateView(ConditionalGetMixin, generics.ListCreateAPIView):
     queryset = Board.objects.all()
     serializer_class = BoardSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -38,6 +71,11 @@ class BoardListCreateView(generics.ListCreateAPIView):
             return [IsAdminRole()]
         return super().get_permissions()
 
+    def get_validators(self):
+        # Board edits bump the visibility generation; counter updates bump the list version.
+        board_ids = sorted(request_visible_board_ids(self.request))
+        return make_etag('boards', current_generation(), board_list_version(), *board_ids), None
+
     def get_queryset(self):
         user = self.request.user
         base_queryset = Board.objects.all()
@@ -45,23 +83,13 @@ class BoardListCreateView(generics.ListCreateAPIView):
             return base_queryset.none()
         if user.role == User.Role.ADMIN:
             return base_queryset.order_by('name')
-
-        allowed_board_ids = list(BoardAccess.objects.filter(user=user, can_view=True).values_list('board_id', flat=True))
-        role_visibility = {
-            User.Role.BASIC: ['basic'],
-            User.Role.PREMIUM: ['basic', 'premium'],
-        }
-        visibility_levels = role_visibility.get(user.role, ['basic'])
-        visibility_filter = Q(visibility__in=visibility_levels)
-        if allowed_board_ids:
-            visibility_filter |= Q(id__in=allowed_board_ids)
-        return base_queryset.filter(visibility_filter).distinct().order_by('name')
+        return base_queryset.filter(id__in=request_visible_board_ids(self.request)).order_by('name')
 
 
 class BoardDetailView(generics.RetrieveUpdateDestroyAPIView):
     queryset = Board.objects.all()
     serializer_class = BoardSerializer
-    permission_classes = [permissions.IsAuthenticated]
+    permission_classes = [permissions.IsAuthenticated, CanViewBoard]
 
     def get_permissions(self):
         if self.request.method in {'PUT', 'PATCH', 'DELETE'}:
@@ -69,15 +97,27 @@ class BoardDetailView(generics.RetrieveUpdateDestroyAPIView):
         return super().get_permissions()
 
 
-class PostListCreateView(generics.ListCreateAPIView):
-    permission_classes = [permissions.IsAuthenticated]
+class PostListCreateView(ConditionalGetMixin, generics.ListCreateAPIView):
+    permission_classes = [permissions.IsAuthenticated, CanViewBoard]
+    pagination_class = PostCursorPagination
+
+    def is_summary_request(self) -> bool:
+        return self.request.method == 'GET' and self.request.query_params.get('fields') == 'summary'
+
+    def get_validators(self):
+        # The board version is a counter, not a time, so lists only carry an ETag.
+        version = board_posts_version(self.kwargs['board_id'])
+        return make_etag('posts', version, self.request.get_full_path()), None
 
     def get_queryset(self):
         board_id = self.kwargs['board_id']
-        queryset = Post.objects.filter(board_id=board_id).select_related('author', 'board').prefetch_related(
-            'attachments',
-            'youtube_embeds',
-        )
+        if self.is_summary_request():
+            queryset = Post.objects.filter(board_id=board_id).summaries()
+        else:
+            queryset = Post.objects.filter(board_id=board_id).select_related('author', 'board').prefetch_related(
+                'attachments__derivatives',
+                'youtube_embeds',
+            )
         view_mode = self.request.query_params.get('view')
         if view_mode in {choice.value for choice in Post.ViewType}:
             queryset = queryset.filter(view_type=view_mode)
@@ -86,16 +126,78 @@ class PostListCreateView(generics.ListCreateAPIView):
     def get_serializer_class(self):
         if self.request.method == 'POST':
             return PostWriteSerializer
+        if self.is_summary_request():
+            return PostSummarySerializer
         return PostSerializer
 
+    def list(self, request, *args, **kwargs):
+        board_id = self.kwargs['board_id']
+        key = page_cache_key(request, board_id, board_posts_version(board_id))
+        data = get_page(key)
+        if data is not None:
+            return Response(data)
+        response = super().list(request, *args, **kwargs)
+        set_page(key, response.data)
+        return response
+
     def perform_create(self, serializer):
         board = get_object_or_404(Board, pk=self.kwargs['board_id'])
         serializer.save(board=board)
 
 
-class PostDetailView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Post.objects.select_related('board', 'author').prefetch_related('attachments', 'youtube_embeds')
-    permission_classes = [IsPostAuthorOrAdmin]
+class PostSearchView(generics.ListAPIView):
+    """Ranked full-text search, scoped to one board or to every board the caller can view."""
+
+    serializer_class = PostSummarySerializer
+    permission_classes = [permissions.IsAuthenticated, CanViewBoard]
+    pagination_class = None
+    default_limit = 20
+    max_limit = 100
+
+    def get_limit(self) -> int:
+        try:
+            limit = int(self.request.query_params.get('limit', self.default_limit))
+        except ValueError:
+            limit = self.default_limit
+        return max(1, min(limit, self.max_limit))
+
+    def get_board_ids(self):
+        board_id = self.kwargs.get('board_id')
+        if board_id is not None:
+            return [board_id]
+        if self.request.user.role == User.Role.ADMIN:
+            return None
+        return request_visible_board_ids(self.request)
+
+    def list(self, request, *args, **kwargs):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response([])
+        post_ids = get_search_backend().search(query, board_ids=self.get_board_ids(), limit=self.get_limit())
+        posts = {post.pk: post for post in Post.objects.filter(id__in=post_ids).summaries()}
+        ranked = [posts[post_id] for post_id in post_ids if post_id in posts]
+        return Response(self.get_serializer(ranked, many=True).data)
+
+
+class PostDetailView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
+    queryset = Post.objects.select_related('board', 'author').prefetch_related(
+        'attachments__derivatives', 'youtube_embeds'
+    )
+    permission_classes = [permissions.IsAuthenticated, CanViewBoard, IsPostAuthorOrAdmin]
+
+    def get_validators(self):
+        # The row that answers 304 is also the one serialized on 200, so a full GET adds only the prefetches.
+        post = get_object_or_404(Post.objects.select_related('board', 'author'), pk=self.kwargs['pk'])
+        self.check_object_permissions(self.request, post)
+        self.validated_post = post
+        return post_validators(post)
+
+    def get_object(self):
+        post = getattr(self, 'validated_post', None)
+        if post is None:
+            return super().get_object()
+        prefetch_related_objects([post], 'attachments__derivatives', 'youtube_embeds')
+        return post
 
     def get_serializer_class(self):
         if self.request.method in {'PUT', 'PATCH'}:
@@ -132,15 +234,290 @@ class BoardAccessManagementView(APIView):
         except User.DoesNotExist:
             return Response({"detail": "존재하지 않는 사용자입니다."}, status=status.HTTP_404_NOT_FOUND)
 
-        valid_board_ids = list(Board.objects.filter(id__in=board_ids).values_list("id", flat=True))
+        with transaction.atomic():
+            change = apply_board_access({user.id: board_ids})[user.id]
+
+        return Response({"userId": user.id, "boardIds": change["boardIds"]})
+
+
+class BoardAccessMatrixView(generics.GenericAPIView):
+    """One page of users with their grants among the boards in view.
+
+    ``search`` matches the email, ``role`` and ``status`` filter exactly and
+    ``boards`` (comma-separated ids) narrows the columns. Grants come back as
+    ``boardIds`` arrays built by one grouped query per page.
+    """
+
+    permission_classes = [IsAdminRole]
+    pagination_class = AccessMatrixPagination
+    user_fields = ("id", "email", "first_name", "last_name", "role", "status")
+
+    def get_boards(self):
+        boards = Board.objects.order_by("name")
+        raw = self.request.query_params.get("boards")
+        if raw:
+            try:
+                board_ids = [int(value) for value in raw.split(",") if value]
+            except ValueError:
+                raise ValidationError({"boards": "게시판 id 목록이 올바르지 않습니다."})
+            boards = boards.filter(pk__in=board_ids)
+        return list(boards)
+
+    def get_queryset(self):
+        params = self.request.query_params
+        users = User.objects.all()
+        if params.get("search"):
+            users = users.filter(email__icontains=params["search"].strip())
+        for name, choices in (("role", User.Role.values), ("status", User.Status.values)):
+            value = params.get(name)
+            if not value:
+                continue
+            if value not in choices:
+                raise ValidationError({name: "지원하지 않는 값입니다."})
+            users = users.filter(**{name: value})
+        return users
+
+    def get(self, request):
+        boards = self.get_boards()
+        granted = Q(board_accesses__can_view=True, board_accesses__board_id__in=[board.id for board in boards])
+        users = self.get_queryset().values(*self.user_fields).annotate(
+            access=IdList("board_accesses__board_id", filter=granted)
+        )
+        page = self.paginate_queryset(users)
+        results = [
+            {**{field: row[field] for field in self.user_fields}, "boardIds": parse_id_list(row["access"])}
+            for row in page
+        ]
+        response = self.get_paginated_response(results)
+        response.data["boards"] = BoardSummarySerializer(boards, many=True).data
+        return response
+
+
+class BoardAccessBulkView(APIView):
+    """Apply many access assignments in one transaction, writing only the rows that change."""
+
+    permission_classes = [IsAdminRole]
+
+    def post(self, request):
+        serializer = BoardAccessBulkSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        user_boards = {entry["userId"]: entry["boardIds"] for entry in serializer.validated_data["users"]}
+        grants, revokes = set(), set()
+        for entry in serializer.validated_data["boards"]:
+            grants.update((user_id, entry["boardId"]) for user_id in entry["grant"])
+            revokes.update((user_id, entry["boardId"]) for user_id in entry["revoke"])
+
+        requested_user_ids = set(user_boards) | {user_id for user_id, _ in grants | revokes}
+        known_user_ids = set(User.objects.filter(pk__in=requested_user_ids).values_list("id", flat=True))
+        unknown_user_ids = sorted(requested_user_ids - known_user_ids)
+        if unknown_user_ids:
+            return Response(
+                {"detail": "존재하지 않는 사용자가 포함되어 있습니다.", "userIds": unknown_user_ids},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
         with transaction.atomic():
-            BoardAccess.objects.filter(user=user).delete()
-            BoardAccess.objects.bulk_create(
-                [BoardAccess(user=user, board_id=board_id, can_view=True) for board_id in valid_board_ids]
+            summary = apply_board_access(user_boards, grants, revokes)
+
+        results = list(summary.values())
+        return Response(
+            {
+                "results": results,
+                "added": sum(len(change["added"]) for change in results),
+                "removed": sum(len(change["removed"]) for change in results),
+            }
+        )
+
+
+class UploadSessionCreateView(generics.CreateAPIView):
+    """Open a resumable upload for one attachment of an existing post."""
+
+    serializer_class = UploadSessionSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def perform_create(self, serializer):
+        post = serializer.validated_data['post']
+        user = self.request.user
+        if not can_view_board(self.request, post.board_id):
+            raise PermissionDenied('이 게시판에 접근할 권한이 없습니다.')
+        if user.role != User.Role.ADMIN and post.author_id != user.id:
+            raise PermissionDenied('게시글 작성자만 첨부파일을 추가할 수 있습니다.')
+        serializer.save(owner=user)
+
+
+def check_upload_access(request, session: UploadSession) -> None:
+    """Board access can be revoked while an upload is open, so it is re-checked on every write."""
+    if not can_view_board(request, session.post.board_id):
+        raise PermissionDenied('이 게시판에 접근할 권한이 없습니다.')
+
+
+class UploadSessionDetailView(APIView):
+    """Report the resume offset (GET), append a byte range (PUT) or abort (DELETE)."""
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_session(self, request, pk) -> UploadSession:
+        return get_object_or_404(UploadSession.objects.select_related('post'), pk=pk, owner=request.user)
+
+    def get(self, request, pk):
+        return Response(UploadSessionSerializer(self.get_session(request, pk)).data)
+
+    def put(self, request, pk):
+        session = self.get_session(request, pk)
+        check_upload_access(request, session)
+        if session.status == UploadSession.Status.COMPLETED:
+            return Response({'detail': '이미 완료된 업로드입니다.'}, status=status.HTTP_409_CONFLICT)
+
+        content_range = parse_content_range(request.META.get('HTTP_CONTENT_RANGE', ''))
+        if content_range is None:
+            return Response({'detail': 'Content-Range 헤더가 필요합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+        start, length, total = content_range
+        if total != session.total_size:
+            return Response({'detail': '전체 파일 크기가 세션과 다릅니다.'}, status=status.HTTP_400_BAD_REQUEST)
+        if start != session.received_bytes:
+            return Response(
+                {'detail': '업로드 위치가 맞지 않습니다.', 'received_bytes': session.received_bytes},
+                status=status.HTTP_409_CONFLICT,
+            )
+        if length > settings.UPLOAD_CHUNK_MAX_SIZE:
+            return Response({'detail': '조각 크기가 너무 큽니다.'}, status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+        if request.stream is None:
+            # Django leaves no stream when Content-Length is 0 or missing.
+            return Response({'detail': '요청 본문이 비어 있습니다.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        written = write_range(session, request.stream, start, length)
+        received_bytes = start + written
+        updated = UploadSession.objects.filter(pk=session.pk, received_bytes=start).update(
+            received_bytes=received_bytes, updated_at=timezone.now()
+        )
+        if not updated:
+            return Response({'detail': '동시에 다른 업로드가 진행 중입니다.'}, status=status.HTTP_409_CONFLICT)
+        if written < length:
+            return Response(
+                {'detail': '조각이 모두 수신되지 않았습니다.', 'received_bytes': received_bytes},
+                status=status.HTTP_400_BAD_REQUEST,
             )
+        return Response({'received_bytes': received_bytes})
+
+    def delete(self, request, pk):
+        session = self.get_session(request, pk)
+        discard_staged(session)
+        session.delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class UploadSessionCompleteView(APIView):
+    """Verify the staged file's checksum and attach it to the session's post."""
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, pk):
+        session = get_object_or_404(UploadSession.objects.select_related('post'), pk=pk, owner=request.user)
+        check_upload_access(request, session)
+
+        with transaction.atomic():
+            # Concurrent completes queue on the row lock; only the first one still sees a pending session.
+            session = UploadSession.objects.select_for_update().get(pk=session.pk)
+            if session.status == UploadSession.Status.COMPLETED:
+                return Response({'detail': '이미 완료된 업로드입니다.'}, status=status.HTTP_409_CONFLICT)
+            if not session.is_complete:
+                return Response(
+                    {'detail': '아직 모든 데이터가 수신되지 않았습니다.', 'received_bytes': session.received_bytes},
+                    status=status.HTTP_409_CONFLICT,
+                )
+            if staged_sha256(session) != session.sha256:
+                discard_staged(session)
+                UploadSession.objects.filter(pk=session.pk).update(received_bytes=0, updated_at=timezone.now())
+                return Response(
+                    {'detail': '체크섬이 일치하지 않습니다. 다시 업로드해 주세요.'}, status=status.HTTP_400_BAD_REQUEST
+                )
+
+            with open(staging_path(session), 'rb') as handle:
+                attachment = Attachment.objects.create(
+                    post_id=session.post_id,
+                    file=StagedFile(handle, name=session.file_name),
+                    original_name=session.file_name,
+                    mime_type=session.content_type,
+                    file_size=session.total_size,
+                    sha256=session.sha256,
+                )
+            session.status = UploadSession.Status.COMPLETED
+            session.attachment = attachment
+            session.save(update_fields=['status', 'attachment', 'updated_at'])
+        discard_staged(session)
+        return Response(AttachmentSerializer(attachment, context={'request': request}).data, status=status.HTTP_201_CREATED)
+
+
+class AttachmentDownloadView(APIView):
+    """Board-access checked download, offloaded to the proxy or streamed with Range support."""
+
+    permission_classes = [permissions.IsAuthenticated]
+    content_negotiation_class = FileContentNegotiation
+
+    def get_target(self, pk) -> tuple[int, DownloadTarget]:
+        attachment = get_object_or_404(Attachment.objects.select_related('post'), pk=pk)
+        return attachment.post.board_id, attachment_target(attachment)
+
+    def is_inline(self, request) -> bool:
+        return request.query_params.get('inline') in {'1', 'true'}
+
+    def get(self, request, **kwargs):
+        board_id, target = self.get_target(**kwargs)
+        if not can_view_board(request, board_id):
+            raise PermissionDenied('이 게시판에 접근할 권한이 없습니다.')
+
+        response = get_conditional_response(request, etag=target.etag)
+        if response is None:
+            as_attachment = not self.is_inline(request)
+            response = sendfile_response(target, as_attachment) or stream_response(request, target, as_attachment)
+        response['ETag'] = target.etag
+        response['Cache-Control'] = 'private, max-age=0, must-revalidate'
+        return response
+
+
+class AttachmentDerivativeView(AttachmentDownloadView):
+    """Thumbnail or preview of an attachment, shown inline under the same board-access check."""
+
+    def get_target(self, pk, kind) -> tuple[int, DownloadTarget]:
+        derivative = get_object_or_404(
+            AttachmentDerivative.objects.select_related('attachment__post'), attachment_id=pk, kind=kind
+        )
+        return derivative.attachment.post.board_id, derivative_target(derivative)
+
+    def is_inline(self, request) -> bool:
+        return True
+
+
+class BoardEventStreamView(APIView):
+    """Server-Sent Events for post changes on one board; ``Last-Event-ID`` resumes a dropped stream.
+
+    Under ASGI the stream is an async generator, so an idle connection holds no
+    worker thread. Under WSGI each open stream would occupy one, so the view
+    answers ``204 No Content`` and the client polls instead, unless
+    ``BOARD_EVENT_STREAMS_WSGI`` opts in.
+    """
+
+    permission_classes = [permissions.IsAuthenticated, CanViewBoard]
+    renderer_classes = [JSONRenderer, EventStreamRenderer]
 
-        return Response({"userId": user.id, "boardIds": valid_board_ids})
+    def get(self, request, board_id):
+        if not streams_enabled(request._request):
+            return Response(status=status.HTTP_204_NO_CONTENT, headers={'Cache-Control': 'no-store'})
+        user, token = request.user, request.auth
+        last_event_id = parse_last_event_id(request)
 
+        if isinstance(request._request, ASGIRequest):
+            async def still_allowed():
+                if token is not None and not await atoken_is_current(token):
+                    return False
+                return await acan_view_board(user, board_id)
 
+            stream = aboard_event_stream(board_id, last_event_id, still_allowed)
+        else:
+            def still_allowed():
+                if token is not None and not token_is_current(token):
+                    return False
+                return user_can_view_board(user, board_id)
 
+            stream = board_event_stream(board_id, last_event_id, still_allowed)
+        return event_stream_response(stream)
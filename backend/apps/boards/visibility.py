@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import time
+
+from django.core.cache import cache
+
+from apps.accounts.models import User
+
+from .models import Board, BoardAccess
+
+ROLE_VISIBILITY = {
+    User.Role.BASIC: [Board.Visibility.BASIC],
+    User.Role.PREMIUM: [Board.Visibility.BASIC, Board.Visibility.PREMIUM],
+}
+VISIBILITY_CACHE_TIMEOUT = 60 * 60
+GENERATION_KEY = 'boards:visibility:generation'
+
+
+def _generation_seed() -> int:
+    # Microseconds, so a generation evicted from the cache restarts above every value it handed out.
+    return time.time_ns() // 1000
+
+
+def current_generation() -> int:
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, _generation_seed(), timeout=None)
+        generation = cache.get(GENERATION_KEY) or _generation_seed()
+    return generation
+
+
+def _cache_key(generation: int, user_id: int, role: str) -> str:
+    return f'boards:visibility:{generation}:{user_id}:{role}'
+
+
+def _compute_visible_board_ids(user: User) -> list[int]:
+    if user.role == User.Role.ADMIN:
+        return list(Board.objects.values_list('id', flat=True))
+    visibility_levels = ROLE_VISIBILITY.get(user.role, [Board.Visibility.BASIC])
+    role_board_ids = set(Board.objects.filter(visibility__in=visibility_levels).values_list('id', flat=True))
+    granted_board_ids = set(BoardAccess.objects.filter(user=user, can_view=True).values_list('board_id', flat=True))
+    return sorted(role_board_ids | granted_board_ids)
+
+
+async def _acompute_visible_board_ids(user: User) -> list[int]:
+    if user.role == User.Role.ADMIN:
+        return [board_id async for board_id in Board.objects.values_list('id', flat=True)]
+    visibility_levels = ROLE_VISIBILITY.get(user.role, [Board.Visibility.BASIC])
+    role_boards = Board.objects.filter(visibility__in=visibility_levels).values_list('id', flat=True)
+    granted_boards = BoardAccess.objects.filter(user=user, can_view=True).values_list('board_id', flat=True)
+    board_ids = {board_id async for board_id in role_boards}
+    board_ids.update([board_id async for board_id in granted_boards])
+    return sorted(board_ids)
+
+
+def visible_board_ids(user: User) -> frozenset[int]:
+    """Return the ids of every board ``user`` may view.
+
+    Results are cached per user id and role under a generation counter that is
+    bumped whenever any board changes, so the common path is a cache hit.
+    """
+    key = _cache_key(current_generation(), user.pk, user.role)
+    board_ids = cache.get(key)
+    if board_ids is None:
+        board_ids = _compute_visible_board_ids(user)
+        cache.set(key, board_ids, VISIBILITY_CACHE_TIMEOUT)
+    return frozenset(board_ids)
+
+
+async def avisible_board_ids(user: User) -> frozenset[int]:
+    key = _cache_key(current_generation(), user.pk, user.role)
+    board_ids = cache.get(key)
+    if board_ids is None:
+        board_ids = await _acompute_visible_board_ids(user)
+        cache.set(key, board_ids, VISIBILITY_CACHE_TIMEOUT)
+    return frozenset(board_ids)
+
+
+def invalidate_all_visibility() -> None:
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.add(GENERATION_KEY, _generation_seed(), timeout=None)
+
+
+def invalidate_user_visibility(*user_ids: int) -> None:
+    generation = current_generation()
+    cache.delete_many(
+        [_cache_key(generation, user_id, role) for user_id in user_ids for role in User.Role.values]
+    )
@@ -0,0 +1,172 @@
+"""Title and thumbnail enrichment for YouTube embeds.
+
+Embeds are saved with only their ``video_id``; after the post commits a
+background task resolves the metadata and fills every embed of that video in
+one ``UPDATE``. Lookups go through the ``youtube_metadata`` cache keyed by
+``video_id`` and shared by all posts, so a video embedded on many boards is
+fetched once, and new embeds of an already known video are filled at save
+time. ``YOUTUBE_METADATA_FETCHER`` picks the fetcher; ``StubYoutubeFetcher``
+never touches the network for tests and offline runs.
+"""
+from __future__ import annotations
+
+import json
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Iterable
+from urllib import request as urllib_request
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+
+from .conditional import touch_posts
+from .models import Post, YoutubeEmbed
+from .tasks import run_task_on_commit
+
+logger = logging.getLogger(__name__)
+
+METADATA_CACHE_ALIAS = 'youtube_metadata'
+# Unavailable or private videos are remembered briefly so they are not refetched on every save.
+MISSING_TIMEOUT = 60 * 60
+MISSING = {}
+
+_posts_touched_by_caller: ContextVar[frozenset[int]] = ContextVar('posts_touched_by_caller', default=frozenset())
+
+
+@contextmanager
+def post_touched_by_caller(post_id: int):
+    """Inside the block, embed deletes on ``post_id`` leave bumping the post to the caller.
+
+    Use when the caller saves the post in the same transaction anyway, so it
+    publishes one ``updated`` event rather than one per embed.
+    """
+    token = _posts_touched_by_caller.set(_posts_touched_by_caller.get() | {post_id})
+    try:
+        yield
+    finally:
+        _posts_touched_by_caller.reset(token)
+
+
+def is_post_touched_by_caller(post_id: int) -> bool:
+    return post_id in _posts_touched_by_caller.get()
+
+
+class BaseYoutubeFetcher:
+    def fetch(self, video_id: str) -> dict | None:
+        """Return ``{'title', 'thumbnail_url'}``.
+
+        ``MISSING`` means the video does not resolve (removed or private);
+        ``None`` is a transient failure that the next save retries.
+        """
+        raise NotImplementedError
+
+
+class OEmbedFetcher(BaseYoutubeFetcher):
+    endpoint = 'https://www.youtube.com/oembed'
+    timeout = 5
+
+    def fetch(self, video_id: str) -> dict | None:
+        query = urlencode({'url': f'https://www.youtube.com/watch?v={video_id}', 'format': 'json'})
+        try:
+            with urllib_request.urlopen(f'{self.endpoint}?{query}', timeout=self.timeout) as response:
+                payload = json.load(response)
+        except HTTPError as exc:
+            if exc.code in {400, 401, 403, 404}:
+                return MISSING
+            logger.warning('oEmbed lookup for %s failed: HTTP %s', video_id, exc.code)
+            return None
+        except (URLError, OSError, ValueError) as exc:
+            logger.warning('oEmbed lookup for %s failed: %s', video_id, exc)
+            return None
+        return {
+            'title': str(payload.get('title', ''))[:255],
+            'thumbnail_url': str(payload.get('thumbnail_url', ''))[:200],
+        }
+
+
+class StubYoutubeFetcher(BaseYoutubeFetcher):
+    """Deterministic metadata without network access."""
+
+    def fetch(self, video_id: str) -> dict | None:
+        return {
+            'title': f'YouTube video {video_id}',
+            'thumbnail_url': f'https://i.ytimg.com/vi/{video_id}/hqdefault.jpg',
+        }
+
+
+@lru_cache(maxsize=1)
+def get_fetcher() -> BaseYoutubeFetcher:
+    return import_string(settings.YOUTUBE_METADATA_FETCHER)()
+
+
+def metadata_cache():
+    return caches[METADATA_CACHE_ALIAS]
+
+
+def _cache_key(video_id: str) -> str:
+    return f'youtube:metadata:{video_id}'
+
+
+def cached_metadata(video_ids: Iterable[str]) -> dict[str, dict]:
+    """Metadata already known for ``video_ids``, from one ``get_many``."""
+    keys = {_cache_key(video_id): video_id for video_id in video_ids}
+    return {keys[key]: value for key, value in metadata_cache().get_many(list(keys)).items()}
+
+
+def resolve_metadata(video_id: str) -> dict | None:
+    """Cache, then any embed of the same video already filled in, then the fetcher."""
+    cache = metadata_cache()
+    metadata = cache.get(_cache_key(video_id))
+    if metadata is not None:
+        return metadata
+
+    known = (
+        YoutubeEmbed.objects.filter(video_id=video_id)
+        .exclude(title='')
+        .values('title', 'thumbnail_url')
+        .first()
+    )
+    if known is not None:
+        metadata = known
+    else:
+        metadata = get_fetcher().fetch(video_id)
+        if metadata is None:
+            return None
+    if metadata == MISSING:
+        cache.set(_cache_key(video_id), metadata, MISSING_TIMEOUT)
+    else:
+        cache.set(_cache_key(video_id), metadata)
+    return metadata
+
+
+def enrich_video(video_id: str) -> int:
+    """Fill every embed of ``video_id`` that still lacks metadata; returns the rows updated."""
+    embeds = YoutubeEmbed.objects.filter(video_id=video_id, title='')
+    post_ids = list(embeds.values_list('post_id', flat=True))
+    if not post_ids:
+        return 0
+    metadata = resolve_metadata(video_id)
+    if not metadata:
+        return 0
+    updated = embeds.update(title=metadata['title'], thumbnail_url=metadata['thumbnail_url'])
+    # update() sends no signals, so the posts' validators, page caches and live events are refreshed here.
+    touch_posts(Post.objects.filter(pk__in=post_ids))
+    return updated
+
+
+def build_embeds(post: Post, video_ids: Iterable[str]) -> list[YoutubeEmbed]:
+    """Unsaved embeds for ``post``, with metadata copied from the cache when the video is known."""
+    video_ids = list(video_ids)
+    known = cached_metadata(video_ids)
+    return [YoutubeEmbed(post=post, video_id=video_id, **known.get(video_id, {})) for video_id in video_ids]
+
+
+def schedule_enrichment(embeds: Iterable[YoutubeEmbed]) -> None:
+    """Resolve the embeds still missing metadata once the transaction commits."""
+    for video_id in dict.fromkeys(embed.video_id for embed in embeds if not embed.title):
+        run_task_on_commit(enrich_video, video_id)
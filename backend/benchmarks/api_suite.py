@@ -0,0 +1,362 @@
+"""Reproducible REST API benchmark: login, board list, post list, post detail and post create.
+
+By default everything runs in one process. A throwaway test database is made
+from ``DATABASE_URL`` (in-memory SQLite, or ``test_<name>`` on PostgreSQL),
+filled by ``manage.py seed_benchmark_data`` and driven through Django's test
+client, so no server or network is needed and the same seed always produces
+the same dataset::
+
+    python benchmarks/api_suite.py --boards 20 --users 200 --posts 20000 --output results.json
+    python benchmarks/api_suite.py --baseline results-main.json --max-regression 0.2
+
+``--base-url`` drives a running server over HTTP from ``--concurrency``
+threads instead; seed its database first with the same dataset options.
+Queries per request are then read from the ``Server-Timing`` header, so
+start the server with ``REQUEST_METRICS_ENABLED=1``::
+
+    python manage.py seed_benchmark_data --reset --posts 20000
+    python benchmarks/api_suite.py --base-url http://127.0.0.1:8000 --concurrency 16
+
+Results are written as JSON: run metadata (commit, database, dataset) and,
+per scenario, throughput, p50/p95/p99 latency and queries per request.
+"""
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib import request as urllib_request
+from urllib.error import HTTPError
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+SCENARIOS = ('login', 'board_list', 'post_list', 'post_detail', 'post_create')
+SESSION_POOL_SIZE = 20
+SERVER_TIMING_QUERIES = re.compile(r'db;[^,]*desc="(\d+) queries"')
+
+
+@dataclass
+class Sample:
+    status: int
+    seconds: float
+    queries: int | None
+    body: bytes
+
+    def json(self):
+        return json.loads(self.body)
+
+
+class InProcessTransport:
+    """Django test client on the current thread; queries counted with the request metrics wrapper."""
+
+    concurrent = False
+
+    def __init__(self, cold: bool):
+        from django.test import Client
+
+        self.client = Client()
+        self.cold = cold
+
+    def send(self, method: str, path: str, token: str | None = None, body: dict | None = None) -> Sample:
+        from django.core.cache import caches
+        from django.db import connection
+
+        from config.metrics import collect_timings, install_query_timer
+
+        if self.cold:
+            for cache in caches.all():
+                cache.clear()
+        headers = {'Authorization': f'Bearer {token}'} if token else {}
+        data = json.dumps(body) if body is not None else ''
+        install_query_timer(connection=connection)
+        started = time.perf_counter()
+        with collect_timings() as timings:
+            response = self.client.generic(method, path, data, content_type='application/json', headers=headers)
+        elapsed = time.perf_counter() - started
+        # With the middleware installed it collects the queries itself and reports them in Server-Timing.
+        match = SERVER_TIMING_QUERIES.search(response.get('Server-Timing', ''))
+        queries = int(match.group(1)) if match else timings.queries
+        return Sample(response.status_code, elapsed, queries, response.content)
+
+
+class HTTPTransport:
+    concurrent = True
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url.rstrip('/')
+
+    def send(self, method: str, path: str, token: str | None = None, body: dict | None = None) -> Sample:
+        headers = {'Content-Type': 'application/json'}
+        if token:
+            headers['Authorization'] = f'Bearer {token}'
+        data = json.dumps(body).encode() if body is not None else None
+        req = urllib_request.Request(f'{self.base_url}{path}', data=data, headers=headers, method=method)
+        started = time.perf_counter()
+        try:
+            with urllib_request.urlopen(req) as response:
+                status, content, timing = response.status, response.read(), response.headers.get('Server-Timing', '')
+        except HTTPError as exc:
+            status, content, timing = exc.code, exc.read(), exc.headers.get('Server-Timing', '')
+        elapsed = time.perf_counter() - started
+        match = SERVER_TIMING_QUERIES.search(timing or '')
+        return Sample(status, elapsed, int(match.group(1)) if match else None, content)
+
+
+def user_emails(count: int) -> list[str]:
+    """The admin first, then the users ``seed_benchmark_data`` creates."""
+    return ['bench-admin@bench.local', *(f'bench-user-{index:05d}@bench.local' for index in range(count))]
+
+
+def login(transport, email: str, password: str) -> str:
+    sample = transport.send('POST', '/api/auth/login/', body={'email': email, 'password': password})
+    if sample.status != 200:
+        raise SystemExit(f'login failed for {email}: HTTP {sample.status} {sample.body[:200]!r}')
+    return sample.json()['access']
+
+
+def discover(transport, args) -> dict:
+    """Log in a pool of seeded users and collect the boards and posts each of them may read."""
+    emails = user_emails(args.users)
+    admin_token = login(transport, emails[0], args.password)
+    board_posts = {}
+    for board in transport.send('GET', '/api/boards/', admin_token).json():
+        page = transport.send('GET', f'/api/boards/{board["id"]}/posts/?fields=summary', admin_token).json()
+        board_posts[board['id']] = [post['id'] for post in page['results']]
+    if not any(board_posts.values()):
+        raise SystemExit('no posts found; seed the database with manage.py seed_benchmark_data first')
+
+    sessions = [(admin_token, [board_id for board_id, post_ids in board_posts.items() if post_ids])]
+    for email in emails[1:SESSION_POOL_SIZE]:
+        token = login(transport, email, args.password)
+        visible = [board['id'] for board in transport.send('GET', '/api/boards/', token).json()]
+        readable = [board_id for board_id in visible if board_posts.get(board_id)]
+        if readable:
+            sessions.append((token, readable))
+    return {'emails': emails, 'admin_token': admin_token, 'sessions': sessions, 'board_posts': board_posts}
+
+
+def build_requests(name: str, count: int, targets: dict, args) -> list[tuple]:
+    """The deterministic ``(method, path, token, body)`` sequence for one scenario."""
+    sessions = itertools.cycle(targets['sessions'])
+    board_posts = targets['board_posts']
+    requests = []
+    for index in range(count):
+        token, boards = next(sessions)
+        board_id = boards[index % len(boards)]
+        if name == 'login':
+            email = targets['emails'][index % len(targets['emails'])]
+            requests.append(('POST', '/api/auth/login/', None, {'email': email, 'password': args.password}))
+        elif name == 'board_list':
+            requests.append(('GET', '/api/boards/', token, None))
+        elif name == 'post_list':
+            requests.append(('GET', f'/api/boards/{board_id}/posts/?fields=summary', token, None))
+        elif name == 'post_detail':
+            post_ids = board_posts[board_id]
+            requests.append(('GET', f'/api/boards/posts/{post_ids[index % len(post_ids)]}/', token, None))
+        elif name == 'post_create':
+            body = {
+                'title': f'Benchmark create {index}',
+                'content': 'Created by the API benchmark. ' * 20,
+                'view_type': 'card',
+                'youtube_links': [f'https://youtu.be/bench{index % 50:06d}'],
+            }
+            requests.append(('POST', f'/api/boards/{board_id}/posts/', targets['admin_token'], body))
+    return requests
+
+
+def percentile(values: list[float], quantiles: list[float], rank: int) -> float | None:
+    if not values:
+        return None
+    return round((quantiles[rank - 1] if quantiles else values[0]) * 1000, 2)
+
+
+def run_scenario(transport, name: str, targets: dict, args) -> dict:
+    count = args.login_requests if name == 'login' else args.requests
+    for method, path, token, body in build_requests(name, args.warmup, targets, args):
+        transport.send(method, path, token, body)
+
+    requests = build_requests(name, count, targets, args)
+    expected = 201 if name == 'post_create' else 200
+    started = time.perf_counter()
+    if transport.concurrent and args.concurrency > 1:
+        with ThreadPoolExecutor(args.concurrency) as pool:
+            samples = list(pool.map(lambda item: transport.send(*item), requests))
+    else:
+        samples = [transport.send(*item) for item in requests]
+    elapsed = time.perf_counter() - started
+
+    ok = [sample for sample in samples if sample.status == expected]
+    latencies = sorted(sample.seconds for sample in ok)
+    quantiles = statistics.quantiles(latencies, n=100, method='inclusive') if len(latencies) > 1 else []
+    queries = [sample.queries for sample in ok if sample.queries is not None]
+    return {
+        'requests': len(samples),
+        'errors': len(samples) - len(ok),
+        'throughput_rps': round(len(ok) / elapsed, 1) if elapsed else None,
+        'mean_ms': round(statistics.fmean(latencies) * 1000, 2) if latencies else None,
+        'p50_ms': percentile(latencies, quantiles, 50),
+        'p95_ms': percentile(latencies, quantiles, 95),
+        'p99_ms': percentile(latencies, quantiles, 99),
+        'queries': {
+            'min': min(queries),
+            'mean': round(statistics.fmean(queries), 2),
+            'max': max(queries),
+        }
+        if queries
+        else None,
+    }
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict, baseline: dict, max_regression: float | None) -> list[str]:
+    """Print each scenario against ``baseline``; returns the regressions beyond ``max_regression``."""
+    regressions = []
+    for key in ('dataset', 'mode', 'database', 'concurrency', 'cold'):
+        if baseline.get('meta', {}).get(key) != results['meta'][key]:
+            print(f'warning: baseline {key} differs; the numbers are not comparable', file=sys.stderr)
+    for name, current in results['scenarios'].items():
+        previous = baseline.get('scenarios', {}).get(name)
+        if not previous or current['p95_ms'] is None or not previous.get('p95_ms'):
+            continue
+        change = current['p95_ms'] / previous['p95_ms'] - 1
+        queries_before = (previous.get('queries') or {}).get('max')
+        queries_now = (current.get('queries') or {}).get('max')
+        print(
+            f'{name:12} p95 {previous["p95_ms"]:>9.2f} -> {current["p95_ms"]:>9.2f} ms ({change:+.0%})'
+            f'  queries max {queries_before} -> {queries_now}',
+            file=sys.stderr,
+        )
+        if max_regression is not None and change > max_regression:
+            regressions.append(f'{name}: p95 {change:+.0%}')
+        if queries_before is not None and queries_now is not None and queries_now > queries_before:
+            regressions.append(f'{name}: queries {queries_before} -> {queries_now}')
+    return regressions
+
+
+def setup_in_process(args):
+    sys.path.insert(0, str(BACKEND_DIR))
+    os.chdir(BACKEND_DIR)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+    # Post-save work runs inline (the test database is not shared with worker threads) and never hits the network.
+    os.environ.setdefault('BOARD_TASKS_EAGER', '1')
+    os.environ.setdefault('YOUTUBE_METADATA_FETCHER', 'apps.boards.youtube.StubYoutubeFetcher')
+
+    import django
+
+    django.setup()
+    from django.core.management import call_command
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+
+    setup_test_environment()
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    call_command(
+        'seed_benchmark_data',
+        boards=args.boards,
+        users=args.users,
+        posts=args.posts,
+        max_attachments=args.max_attachments,
+        max_embeds=args.max_embeds,
+        password=args.password,
+        seed=args.seed,
+        stdout=sys.stderr,
+    )
+    return connection
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--base-url', help='Benchmark a running server instead of an in-process test database.')
+    parser.add_argument('--boards', type=int, default=20)
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--posts', type=int, default=5000)
+    parser.add_argument('--max-attachments', type=int, default=3)
+    parser.add_argument('--max-embeds', type=int, default=2)
+    parser.add_argument('--password', default='bench-pass-1234')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--requests', type=int, default=200, help='Measured requests per scenario.')
+    parser.add_argument('--login-requests', type=int, default=20, help='Measured logins (password hashing is slow).')
+    parser.add_argument('--warmup', type=int, default=5, help='Unmeasured requests before each scenario.')
+    parser.add_argument('--concurrency', type=int, default=1, help='Client threads; only with --base-url.')
+    parser.add_argument('--cold', action='store_true', help='Clear every cache before each request (in-process).')
+    parser.add_argument('--scenario', action='append', choices=SCENARIOS, help='Run only these scenarios.')
+    parser.add_argument('--output', type=Path, help='Write the JSON results here as well as to stdout.')
+    parser.add_argument('--baseline', type=Path, help='Earlier results to compare against.')
+    parser.add_argument(
+        '--max-regression', type=float, help='Exit 1 when a p95 grows by more than this fraction or queries grow.'
+    )
+    args = parser.parse_args()
+    if args.concurrency > 1 and not args.base_url:
+        parser.error('--concurrency needs --base-url; the in-process test database is bound to one thread')
+
+    connection = None
+    if args.base_url:
+        transport = HTTPTransport(args.base_url)
+        database = None
+    else:
+        connection = setup_in_process(args)
+        transport = InProcessTransport(args.cold)
+        database = connection.vendor
+
+    try:
+        targets = discover(transport, args)
+        scenarios = {name: run_scenario(transport, name, targets, args) for name in args.scenario or SCENARIOS}
+    finally:
+        if connection is not None:
+            connection.creation.destroy_test_db(connection.settings_dict['NAME'], verbosity=0)
+
+    results = {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'commit': git_commit(),
+            'mode': 'http' if args.base_url else 'in-process',
+            'base_url': args.base_url,
+            'database': database,
+            'python': platform.python_version(),
+            'dataset': {
+                'boards': args.boards,
+                'users': args.users,
+                'posts': args.posts,
+                'max_attachments': args.max_attachments,
+                'max_embeds': args.max_embeds,
+                'seed': args.seed,
+            },
+            'requests': args.requests,
+            'login_requests': args.login_requests,
+            'warmup': args.warmup,
+            'concurrency': args.concurrency,
+            'cold': args.cold,
+        },
+        'scenarios': scenarios,
+    }
+    rendered = json.dumps(results, ensure_ascii=False, indent=2)
+    print(rendered)
+    if args.output:
+        args.output.write_text(rendered + '\n', encoding='utf-8')
+
+    if args.baseline:
+        regressions = compare(results, json.loads(args.baseline.read_text(encoding='utf-8')), args.max_regression)
+        if regressions and args.max_regression is not None:
+            raise SystemExit('regressions: ' + '; '.join(regressions))
+
+
+if __name__ == '__main__':
+    main()
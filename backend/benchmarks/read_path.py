@@ -0,0 +1,108 @@
+"""Concurrent-client load generator for comparing the WSGI and ASGI read paths.
+
+Start the backend under each server, then point this script at it, e.g.::
+
+    gunicorn config.wsgi -w 2 --threads 4 -b 127.0.0.1:8000
+    BOARD_ASYNC_READS=1 gunicorn config.asgi -w 2 -k uvicorn.workers.UvicornWorker -b 127.0.0.1:8000
+
+    python benchmarks/read_path.py --email admin@example.com --password secret \\
+        --path /api/boards/1/posts/?fields=summary --concurrency 200 --trickle 0.5
+
+``--trickle`` holds every connection open for that many seconds before the
+request headers are finished, the way slow mobile clients do. Only the
+standard library is used so the script runs anywhere the backend does.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from urllib import request as urllib_request
+from urllib.parse import urlsplit
+
+
+def login(base_url: str, email: str, password: str) -> str:
+    body = json.dumps({'email': email, 'password': password}).encode()
+    req = urllib_request.Request(
+        f'{base_url}/api/auth/login/', data=body, headers={'Content-Type': 'application/json'}
+    )
+    with urllib_request.urlopen(req) as response:
+        return json.load(response)['access']
+
+
+async def fetch(host: str, port: int, path: str, token: str, trickle: float) -> tuple[int, float]:
+    started = time.perf_counter()
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write(f'GET {path} HTTP/1.1\r\nHost: {host}:{port}\r\n'.encode())
+        await writer.drain()
+        if trickle:
+            await asyncio.sleep(trickle)
+        writer.write(f'Authorization: Bearer {token}\r\nConnection: close\r\n\r\n'.encode())
+        await writer.drain()
+        status_line = await reader.readline()
+        await reader.read()
+    finally:
+        writer.close()
+    status = int(status_line.split()[1]) if status_line else 0
+    return status, time.perf_counter() - started
+
+
+async def run(args, token: str) -> dict:
+    url = urlsplit(args.base_url)
+    host, port = url.hostname, url.port or 80
+    latencies: list[float] = []
+    errors = 0
+    deadline = time.perf_counter() + args.duration
+
+    async def client() -> None:
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            try:
+                status, elapsed = await fetch(host, port, args.path, token, args.trickle)
+            except OSError:
+                errors += 1
+                continue
+            if status == 200:
+                latencies.append(elapsed)
+            else:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    return {
+        'path': args.path,
+        'concurrency': args.concurrency,
+        'trickle': args.trickle,
+        'requests': len(latencies),
+        'errors': errors,
+        'throughput_rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(quantiles[49] * 1000, 1) if quantiles else None,
+        'p95_ms': round(quantiles[94] * 1000, 1) if quantiles else None,
+        'p99_ms': round(quantiles[98] * 1000, 1) if quantiles else None,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+    parser.add_argument('--email', required=True)
+    parser.add_argument('--password', required=True)
+    parser.add_argument('--path', default='/api/boards/')
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--duration', type=float, default=15.0, help='Seconds to keep every client busy.')
+    parser.add_argument('--trickle', type=float, default=0.0, help='Seconds each client stalls mid-request.')
+    args = parser.parse_args()
+
+    token = login(args.base_url, args.email, args.password)
+    print(json.dumps(asyncio.run(run(args, token)), ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""Connection profile applied on top of ``DATABASE_URL``.
+
+PostgreSQL keeps connections open between requests (``CONN_MAX_AGE``) or,
+with ``pool``, hands them out from a psycopg pool per process; Django's
+persistent connections must stay off while the pool is in use. SQLite runs the
+pragmas below on every new connection: WAL lets readers proceed while one
+writer commits, and ``IMMEDIATE`` transactions take the write lock up front so
+concurrent writers wait on ``busy_timeout`` instead of failing to upgrade.
+"""
+from __future__ import annotations
+
+POSTGRES_ENGINES = ('django.db.backends.postgresql', 'django.contrib.gis.db.backends.postgis')
+SQLITE_ENGINES = ('django.db.backends.sqlite3', 'django.contrib.gis.db.backends.spatialite')
+
+
+def sqlite_init_command(
+    journal_mode: str = 'WAL',
+    synchronous: str = 'NORMAL',
+    busy_timeout_ms: int = 5000,
+    mmap_size: int = 128 * 1024 * 1024,
+) -> str:
+    return ';'.join(
+        (
+            f'PRAGMA journal_mode={journal_mode}',
+            f'PRAGMA synchronous={synchronous}',
+            f'PRAGMA busy_timeout={busy_timeout_ms}',
+            f'PRAGMA mmap_size={mmap_size}',
+        )
+    )
+
+
+def tune_database(
+    database: dict,
+    *,
+    conn_max_age: int | None = 60,
+    health_checks: bool = True,
+    pool: dict | None = None,
+    sqlite_pragmas: str | None = None,
+    sqlite_transaction_mode: str | None = 'IMMEDIATE',
+) -> dict:
+    """Return a copy of ``database`` with the connection settings for its engine.
+
+    ``pool`` holds psycopg ``ConnectionPool`` options (``min_size``,
+    ``max_size``, ``timeout``) and only applies to PostgreSQL. Options already
+    present in ``DATABASE_URL`` win over the profile.
+    """
+    tuned = {**database, 'OPTIONS': dict(database.get('OPTIONS') or {})}
+    tuned['CONN_HEALTH_CHECKS'] = health_checks
+    tuned['CONN_MAX_AGE'] = conn_max_age
+
+    engine = tuned.get('ENGINE', '')
+    if engine in POSTGRES_ENGINES and pool is not None:
+        tuned['OPTIONS'].setdefault('pool', pool)
+        tuned['CONN_MAX_AGE'] = 0
+    elif engine in SQLITE_ENGINES:
+        if sqlite_pragmas:
+            tuned['OPTIONS'].setdefault('init_command', sqlite_pragmas)
+        if sqlite_transaction_mode:
+            tuned['OPTIONS'].setdefault('transaction_mode', sqlite_transaction_mode)
+    return tuned
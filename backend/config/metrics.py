@@ -0,0 +1,292 @@
+"""Opt-in per-request instrumentation: ``Server-Timing`` headers and a Prometheus ``/metrics`` endpoint.
+
+``RequestMetricsMiddleware`` counts the queries a request runs on the default
+database and their time through an execute wrapper (no debug cursor, no SQL
+kept), ``TimedSerializerMixin`` and ``TimedJSONRenderer`` time building and
+encoding the DRF response body, and the totals are recorded per resolved view
+name. The wrapper sits on every default
+connection and finds the request through a context variable, so queries that
+an async view runs in ``sync_to_async`` threads are counted too. The registry
+lives in process memory, so with several workers each scrape reports the
+worker that answered it. ``REQUEST_METRICS_ENABLED`` installs both; outside
+``DEBUG`` the ``/metrics`` endpoint also needs ``REQUEST_METRICS_TOKEN``.
+"""
+from __future__ import annotations
+
+import hmac
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Iterator
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.serializers import ListSerializer
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 4, 8, 16, 32, 64, 128)
+UNMATCHED_VIEW = '<unmatched>'
+
+_current_timings: ContextVar[RequestTimings | None] = ContextVar('request_timings', default=None)
+
+
+class RequestTimings:
+    """Per-request accumulator."""
+
+    __slots__ = ('queries', 'db_seconds', 'serialize_seconds', 'serializing')
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.serialize_seconds = 0.0
+        self.serializing = False
+
+    def server_timing(self, total_seconds: float) -> str:
+        return (
+            f'db;dur={self.db_seconds * 1000:.1f};desc="{self.queries} queries", '
+            f'serialize;dur={self.serialize_seconds * 1000:.1f}, '
+            f'total;dur={total_seconds * 1000:.1f}'
+        )
+
+
+class Histogram:
+    __slots__ = ('buckets', 'counts', 'count', 'sum')
+
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        index = bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+
+
+class ViewMetrics:
+    __slots__ = ('statuses', 'duration', 'queries', 'db_seconds', 'serialize_seconds', 'response_bytes')
+
+    def __init__(self):
+        self.statuses: dict[int, int] = {}
+        self.duration = Histogram(DURATION_BUCKETS)
+        self.queries = Histogram(QUERY_BUCKETS)
+        self.db_seconds = 0.0
+        self.serialize_seconds = 0.0
+        self.response_bytes = 0
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels) -> str:
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + '}'
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views: dict[tuple[str, str], ViewMetrics] = {}
+
+    def record(self, view: str, method: str, status: int, seconds: float, timings: RequestTimings, size: int) -> None:
+        with self._lock:
+            metrics = self._views.get((view, method))
+            if metrics is None:
+                metrics = self._views[view, method] = ViewMetrics()
+            metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+            metrics.duration.observe(seconds)
+            metrics.queries.observe(timings.queries)
+            metrics.db_seconds += timings.db_seconds
+            metrics.serialize_seconds += timings.serialize_seconds
+            metrics.response_bytes += size
+
+    def reset(self) -> None:
+        with self._lock:
+            self._views.clear()
+
+    def render(self) -> str:
+        """Prometheus text exposition format 0.0.4."""
+        with self._lock:
+            snapshot = {
+                key: (
+                    dict(metrics.statuses),
+                    (list(metrics.duration.counts), metrics.duration.count, metrics.duration.sum),
+                    (list(metrics.queries.counts), metrics.queries.count, metrics.queries.sum),
+                    metrics.db_seconds,
+                    metrics.serialize_seconds,
+                    metrics.response_bytes,
+                )
+                for key, metrics in self._views.items()
+            }
+
+        lines = [
+            '# HELP http_requests_total Requests handled, by view, method and status.',
+            '# TYPE http_requests_total counter',
+        ]
+        for (view, method), (statuses, *_rest) in sorted(snapshot.items()):
+            for status, count in sorted(statuses.items()):
+                lines.append(f'http_requests_total{_labels(view=view, method=method, status=status)} {count}')
+
+        for name, index, buckets, help_text in (
+            ('http_request_duration_seconds', 1, DURATION_BUCKETS, 'Time from the first middleware to the response.'),
+            ('http_request_db_queries', 2, QUERY_BUCKETS, 'Database queries run per request.'),
+        ):
+            lines += [f'# HELP {name} {help_text}', f'# TYPE {name} histogram']
+            for (view, method), values in sorted(snapshot.items()):
+                counts, count, total = values[index]
+                cumulative = 0
+                for bound, bucket_count in zip(buckets, counts):
+                    cumulative += bucket_count
+                    lines.append(f'{name}_bucket{_labels(view=view, method=method, le=bound)} {cumulative}')
+                lines.append(f'{name}_bucket{_labels(view=view, method=method, le="+Inf")} {count}')
+                lines.append(f'{name}_sum{_labels(view=view, method=method)} {total}')
+                lines.append(f'{name}_count{_labels(view=view, method=method)} {count}')
+
+        for name, index, help_text in (
+            ('http_request_db_seconds_total', 3, 'Time spent in database queries.'),
+            ('http_request_serialize_seconds_total', 4, 'Time spent building and encoding response bodies.'),
+            ('http_response_bytes_total', 5, 'Response body bytes, when the length is known.'),
+        ):
+            lines += [f'# HELP {name} {help_text}', f'# TYPE {name} counter']
+            for (view, method), values in sorted(snapshot.items()):
+                lines.append(f'{name}{_labels(view=view, method=method)} {values[index]}')
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+
+def _view_name(request) -> str:
+    match = getattr(request, 'resolver_match', None)
+    return match.view_name if match is not None else UNMATCHED_VIEW
+
+
+def _response_size(response) -> int:
+    if response.streaming:
+        return int(response.get('Content-Length') or 0)
+    return len(response.content)
+
+
+@contextmanager
+def collect_timings() -> Iterator[RequestTimings]:
+    """Charge the queries and serialization run inside the block, in this context, to a fresh ``RequestTimings``."""
+    timings = RequestTimings()
+    context_token = _current_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _current_timings.reset(context_token)
+
+
+def time_query(execute, sql, params, many, context):
+    timings = _current_timings.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    started = perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.queries += 1
+        timings.db_seconds += perf_counter() - started
+
+
+def install_query_timer(sender=None, connection=None, **kwargs) -> None:
+    """Add ``time_query`` to a default-database connection once; also the ``connection_created`` receiver."""
+    if connection.alias == DEFAULT_DB_ALIAS and time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(time_query)
+
+
+class RequestMetricsMiddleware:
+    """Record query count, DB time, render time and size per view, and answer with ``Server-Timing``.
+
+    Runs natively under WSGI and ASGI, so async views are not pushed through a
+    sync adapter.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        # Connections are per thread: cover the ones opened later and this thread's, if already open.
+        connection_created.connect(install_query_timer, dispatch_uid='request-metrics-query-timer')
+        for connection in connections.all(initialized_only=True):
+            install_query_timer(connection=connection)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        started = perf_counter()
+        with collect_timings() as timings:
+            response = self.get_response(request)
+        return self.finish(request, response, timings, perf_counter() - started)
+
+    async def __acall__(self, request):
+        started = perf_counter()
+        with collect_timings() as timings:
+            response = await self.get_response(request)
+        return self.finish(request, response, timings, perf_counter() - started)
+
+    def finish(self, request, response, timings: RequestTimings, elapsed: float):
+        registry.record(_view_name(request), request.method, response.status_code, elapsed, timings, _response_size(response))
+        response['Server-Timing'] = timings.server_timing(elapsed)
+        return response
+
+
+@contextmanager
+def time_serialization() -> Iterator[None]:
+    """Charge the block to ``serialize_seconds``; nested blocks are already covered by the outer one."""
+    timings = _current_timings.get()
+    if timings is None or timings.serializing:
+        yield
+        return
+    timings.serializing = True
+    started = perf_counter()
+    try:
+        yield
+    finally:
+        timings.serializing = False
+        timings.serialize_seconds += perf_counter() - started
+
+
+class TimedListSerializer(ListSerializer):
+    @property
+    def data(self):
+        with time_serialization():
+            return super().data
+
+
+class TimedSerializerMixin:
+    """Time ``.data``, where ``to_representation`` runs; set ``Meta.list_serializer_class = TimedListSerializer`` for lists."""
+
+    @property
+    def data(self):
+        with time_serialization():
+            return super().data
+
+
+class TimedJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with time_serialization():
+            return super().render(data, accepted_media_type, renderer_context)
+
+
+def metrics_view(request):
+    """Prometheus scrape target; without a token it is only served under ``DEBUG``."""
+    token = settings.REQUEST_METRICS_TOKEN
+    if not token and not settings.DEBUG:
+        return HttpResponse(status=403)
+    if token and not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return HttpResponse(status=401)
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
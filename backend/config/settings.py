@@ -5,6 +5,8 @@ from pathlib import Path
 
 import environ
 
+from config.database import sqlite_init_command, tune_database
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 env = environ.Env(
@@ -90,8 +92,39 @@ TEMPLATES = [
 WSGI_APPLICATION = 'config.wsgi.application'
 ASGI_APPLICATION = 'config.asgi.application'
 
+# Persistent connections (seconds, 0 closes after every request) or, with DB_POOL, a psycopg pool per process.
+# Under ASGI use the pool: Django's persistent connections are meant for sync workers only.
+DB_POOL_OPTIONS = {
+    'min_size': env.int('DB_POOL_MIN_SIZE', default=2),
+    'max_size': env.int('DB_POOL_MAX_SIZE', default=10),
+    'timeout': env.float('DB_POOL_TIMEOUT', default=10.0),
+}
 DATABASES = {
-    'default': env.db('DATABASE_URL', default=f"sqlite:///{BASE_DIR / 'db.sqlite3'}"),
+    'default': tune_database(
+        env.db('DATABASE_URL', default=f"sqlite:///{BASE_DIR / 'db.sqlite3'}"),
+        conn_max_age=env.int('DB_CONN_MAX_AGE', default=60),
+        health_checks=env.bool('DB_CONN_HEALTH_CHECKS', default=True),
+        pool=DB_POOL_OPTIONS if env.bool('DB_POOL', default=False) else None,
+        sqlite_pragmas=sqlite_init_command(
+            journal_mode=env('SQLITE_JOURNAL_MODE', default='WAL'),
+            synchronous=env('SQLITE_SYNCHRONOUS', default='NORMAL'),
+            busy_timeout_ms=env.int('SQLITE_BUSY_TIMEOUT_MS', default=5000),
+            mmap_size=env.int('SQLITE_MMAP_SIZE', default=128 * 1024 * 1024),
+        ),
+        sqlite_transaction_mode=env('SQLITE_TRANSACTION_MODE', default='IMMEDIATE') or None,
+    ),
+}
+
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://'),
+    # Rendered post list pages; locmem evicts LRU past max_entries. Use filecache:// or rediscache:// to share it.
+    'post_pages': env.cache(
+        'POST_PAGE_CACHE_URL', default='locmemcache://post-pages?timeout=300&max_entries=2000'
+    ),
+    # YouTube title/thumbnail by video_id, shared by every post; bounded by max_entries (LRU) and timeout.
+    'youtube_metadata': env.cache(
+        'YOUTUBE_METADATA_CACHE_URL', default='locmemcache://youtube-metadata?timeout=86400&max_entries=10000'
+    ),
 }
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -122,12 +155,18 @@ STATICFILES_DIRS: list[Path] = []
 MEDIA_URL = 'media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+    'attachments': {'BACKEND': 'apps.boards.storage.ContentAddressedStorage'},
+}
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 AUTH_USER_MODEL = 'accounts.User'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.accounts.authentication.ClaimsJWTAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
@@ -140,6 +179,9 @@ SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(hours=3),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
     'AUTH_HEADER_TYPES': ('Bearer',),
+    # Access tokens carry role/status/premium_until so requests can skip the user lookup.
+    'TOKEN_OBTAIN_SERIALIZER': 'apps.accounts.serializers.ClaimsTokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'apps.accounts.serializers.ClaimsTokenRefreshSerializer',
 }
 
 SPECTACULAR_SETTINGS = {
@@ -162,9 +204,54 @@ ACCOUNT_EMAIL_VERIFICATION = 'optional'
 CORS_ALLOW_CREDENTIALS = True
 CSRF_TRUSTED_ORIGINS = [origin.rstrip('/') for origin in CORS_ALLOWED_ORIGINS]
 
+FILE_UPLOAD_HANDLERS = [
+    'apps.boards.storage.HashingMemoryFileUploadHandler',
+    'apps.boards.storage.HashingTemporaryFileUploadHandler',
+]
 FILE_UPLOAD_PERMISSIONS = 0o644
 FILE_UPLOAD_DIRECTORY_PERMISSIONS = 0o755
 
+ATTACHMENT_MAX_SIZE = env.int('ATTACHMENT_MAX_SIZE', default=50 * 1024 * 1024)
+UPLOAD_CHUNK_MAX_SIZE = env.int('UPLOAD_CHUNK_MAX_SIZE', default=8 * 1024 * 1024)
+UPLOAD_SESSION_ROOT = env.path('UPLOAD_SESSION_ROOT', default=BASE_DIR / 'upload_sessions')
+
+# Serve board list, post list and post detail GETs from async views (use with an ASGI server).
+BOARD_ASYNC_READS = env.bool('BOARD_ASYNC_READS', default=False)
+
+# Live post events: broker class, events kept per board for Last-Event-ID resume, heartbeat seconds.
+# The in-memory broker only reaches clients on the same process, so it is limited to a single worker;
+# with several workers use apps.boards.events.RedisBroker and BOARD_EVENT_REDIS_URL.
+BOARD_EVENT_BROKER = env('BOARD_EVENT_BROKER', default='apps.boards.events.InMemoryBroker')
+BOARD_EVENT_REDIS_URL = env('BOARD_EVENT_REDIS_URL', default='redis://127.0.0.1:6379/0')
+BOARD_EVENT_BUFFER_SIZE = env.int('BOARD_EVENT_BUFFER_SIZE', default=200)
+BOARD_EVENT_HEARTBEAT = env.int('BOARD_EVENT_HEARTBEAT', default=15)
+# Streams are served to ASGI requests only; under WSGI every open tab would pin a worker thread and
+# the dashboard polls instead. Enable for a single-user runserver in development.
+BOARD_EVENT_STREAMS_WSGI = env.bool('BOARD_EVENT_STREAMS_WSGI', default=False)
+
+# Per-view query count, DB time, render time and response size as Server-Timing headers and at /metrics.
+# Counters live in each worker process; a non-empty token requires `Authorization: Bearer <token>` to scrape,
+# and outside DEBUG /metrics answers 403 until a token is set.
+REQUEST_METRICS_ENABLED = env.bool('REQUEST_METRICS_ENABLED', default=False)
+REQUEST_METRICS_TOKEN = env('REQUEST_METRICS_TOKEN', default='')
+if REQUEST_METRICS_ENABLED:
+    MIDDLEWARE.insert(0, 'config.metrics.RequestMetricsMiddleware')
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = (
+        'config.metrics.TimedJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    )
+
+# 'apps.boards.youtube.StubYoutubeFetcher' fills embeds without network access (tests, offline runs).
+YOUTUBE_METADATA_FETCHER = env('YOUTUBE_METADATA_FETCHER', default='apps.boards.youtube.OEmbedFetcher')
+
+# Thumbnail/preview generation and other post-save work run on a local thread pool; eager mode runs them inline.
+BOARD_TASKS_EAGER = env.bool('BOARD_TASKS_EAGER', default=False)
+BOARD_TASK_WORKERS = env.int('BOARD_TASK_WORKERS', default=2)
+
+# '' streams attachments from Django; 'nginx' (X-Accel-Redirect) or 'apache' (X-Sendfile) hands them to the proxy.
+ATTACHMENT_SENDFILE_BACKEND = env('ATTACHMENT_SENDFILE_BACKEND', default='')
+ATTACHMENT_SENDFILE_PREFIX = env('ATTACHMENT_SENDFILE_PREFIX', default='/protected-media/')
+
 if ENVIRONMENT == 'prod':
     SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
     SECURE_SSL_REDIRECT = env.bool('SECURE_SSL_REDIRECT', default=True)
@@ -0,0 +1,84 @@
+"""Query budgets for API tests: each URL name, keyed ``'<METHOD> <url name>'`` for
+writes, may run at most a fixed number of queries, the same at every fixture size.
+"""
+from __future__ import annotations
+
+from typing import Callable, Iterable
+
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import NoReverseMatch, get_resolver
+from rest_framework.test import APITestCase
+
+from apps.accounts.authentication import current_token_version
+from apps.accounts.models import User
+from apps.accounts.serializers import ClaimsTokenObtainPairSerializer
+from apps.boards.visibility import visible_board_ids
+
+DEFAULT_FIXTURE_SIZES = (1, 5, 25)
+
+
+def clear_caches() -> None:
+    for cache in caches.all():
+        cache.clear()
+
+
+class QueryBudgetTestCase(APITestCase):
+    query_budgets: dict[str, int] = {}
+    fixture_sizes: tuple[int, ...] = DEFAULT_FIXTURE_SIZES
+    session_user: User | None = None
+
+    def authenticate(self, user: User | None) -> None:
+        """Send a real claims JWT so authentication is part of the measured request."""
+        self.session_user = user
+        if user is None:
+            self.client.credentials()
+            return
+        token = ClaimsTokenObtainPairSerializer.get_token(user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def reset_caches(self) -> None:
+        """Measure on a cold cache, except for what any returning user already has cached."""
+        clear_caches()
+        if self.session_user is not None:
+            current_token_version(self.session_user.pk)
+            visible_board_ids(self.session_user)
+
+    def assertQueryBudget(
+        self,
+        url_name: str,
+        request: Callable[[int], object],
+        grow: Callable[[int], None] | None = None,
+        *,
+        sizes: Iterable[int] | None = None,
+        status: int = 200,
+        method: str = 'GET',
+    ) -> dict[int, int]:
+        """Run ``request(size)`` after ``grow(size)`` for each fixture size; returns the counts."""
+        if method != 'GET':
+            url_name = f'{method} {url_name}'
+        budget = self.query_budgets[url_name]
+        counts: dict[int, int] = {}
+        for size in sizes or self.fixture_sizes:
+            if grow is not None:
+                grow(size)
+            self.reset_caches()
+            with CaptureQueriesContext(connection) as captured:
+                response = request(size)
+            self.assertEqual(response.status_code, status, f'{url_name} with {size} rows: {response.content[:300]!r}')
+            counts[size] = len(captured)
+            if len(captured) > budget:
+                statements = '\n'.join(f'  {query["sql"]}' for query in captured.captured_queries)
+                self.fail(f'{url_name} ran {len(captured)} queries with {size} rows (budget {budget}):\n{statements}')
+        if len(set(counts.values())) > 1:
+            self.fail(f'{url_name} query count grows with data size: {counts}')
+        return counts
+
+    def test_budgeted_url_names_exist(self):
+        names = get_resolver().reverse_dict
+        for key in self.query_budgets:
+            url_name = key.split()[-1]
+            with self.subTest(url_name=url_name):
+                if url_name not in names:
+                    raise NoReverseMatch(f'query budget for unknown URL name {url_name!r}')
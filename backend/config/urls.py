@@ -12,5 +12,10 @@ urlpatterns = [
     path('api/boards/', include('apps.boards.urls')),
 ]
 
+if settings.REQUEST_METRICS_ENABLED:
+    from config.metrics import metrics_view
+
+    urlpatterns.append(path('metrics', metrics_view, name='metrics'))
+
 if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
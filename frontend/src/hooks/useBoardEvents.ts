@@ -0,0 +1,104 @@
+import { useEffect, useRef } from 'react';
+
+import { API_BASE_URL } from '../config';
+import { authFetch, SessionExpiredError } from '../lib/authFetch';
+
+import type { BoardEvent, BoardEventType } from '../types/board';
+
+const DEFAULT_RETRY_MS = 3000;
+// Used when the server answers 204 because it cannot hold streams open (WSGI).
+const POLL_INTERVAL_MS = 30000;
+
+function parseFrame(frame: string) {
+  const fields: Record<string, string> = {};
+  frame.split('\n').forEach((line) => {
+    if (!line || line.startsWith(':')) return;
+    const separator = line.indexOf(':');
+    const name = separator === -1 ? line : line.slice(0, separator);
+    const value = separator === -1 ? '' : line.slice(separator + 1).replace(/^ /, '');
+    fields[name] = name === 'data' && fields.data !== undefined ? `${fields.data}\n${value}` : value;
+  });
+  return fields;
+}
+
+// EventSource cannot send the Authorization header, so the stream is read with fetch
+// and Last-Event-ID is replayed by hand on reconnect. A 204 means streams are off for
+// this server; the hook then emits a `reset` every POLL_INTERVAL_MS while the tab is
+// visible, and the refetch is a conditional GET that usually ends in 304.
+export function useBoardEvents(boardId: string, onEvent: (event: BoardEvent) => void) {
+  const handlerRef = useRef(onEvent);
+
+  useEffect(() => {
+    handlerRef.current = onEvent;
+  }, [onEvent]);
+
+  useEffect(() => {
+    if (!boardId) return;
+
+    const controller = new AbortController();
+    let lastEventId = '';
+    let retryMs = DEFAULT_RETRY_MS;
+    let timer: ReturnType<typeof setTimeout> | undefined;
+    let poller: ReturnType<typeof setInterval> | undefined;
+
+    const startPolling = () => {
+      poller = setInterval(() => {
+        if (document.visibilityState === 'visible') {
+          handlerRef.current({ type: 'reset', data: {} });
+        }
+      }, POLL_INTERVAL_MS);
+    };
+
+    const connect = async () => {
+      try {
+        const headers: Record<string, string> = { Accept: 'text/event-stream' };
+        if (lastEventId) headers['Last-Event-ID'] = lastEventId;
+        const response = await authFetch(`${API_BASE_URL}/boards/${boardId}/events/`, {
+          headers,
+          signal: controller.signal,
+        });
+        if (response.status === 403 || response.status === 404) return;
+        if (response.status === 204) {
+          startPolling();
+          return;
+        }
+        if (!response.ok || !response.body) {
+          throw new Error(`게시판 이벤트 연결에 실패했습니다. (${response.status})`);
+        }
+
+        const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+        let buffer = '';
+        for (;;) {
+          const { value, done } = await reader.read();
+          if (done) break;
+          buffer += value;
+          let boundary = buffer.indexOf('\n\n');
+          while (boundary !== -1) {
+            const fields = parseFrame(buffer.slice(0, boundary));
+            buffer = buffer.slice(boundary + 2);
+            boundary = buffer.indexOf('\n\n');
+            if (fields.retry) retryMs = Number(fields.retry) || retryMs;
+            if (fields.id) lastEventId = fields.id;
+            if (fields.event && fields.data !== undefined) {
+              handlerRef.current({ type: fields.event as BoardEventType, data: JSON.parse(fields.data) });
+            }
+          }
+        }
+      } catch (err) {
+        if (controller.signal.aborted || err instanceof SessionExpiredError) return;
+        console.error(err);
+      }
+      if (!controller.signal.aborted) {
+        timer = setTimeout(connect, retryMs);
+      }
+    };
+
+    connect();
+
+    return () => {
+      controller.abort();
+      if (timer) clearTimeout(timer);
+      if (poller) clearInterval(poller);
+    };
+  }, [boardId]);
+}
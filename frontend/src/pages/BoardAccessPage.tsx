@@ -1,21 +1,27 @@
-﻿import { useEffect, useMemo, useState } from 'react';
+﻿import { FormEvent, useCallback, useEffect, useMemo, useState } from 'react';
 
 import { API_BASE_URL } from '../config';
 import { authFetch, SessionExpiredError } from '../lib/authFetch';
 import { AuthStorage } from '../lib/auth';
 
 import type { BoardSummary } from '../types/board';
-import type { UserSummary } from '../types/user';
+import type { AccessMatrixUser } from '../types/user';
 
-interface AccessResponse {
+interface AccessMatrixPage {
   boards: BoardSummary[];
-  users: UserSummary[];
-  access: Record<string, number[]>;
+  next: string | null;
+  results: AccessMatrixUser[];
 }
 
+const MATRIX_URL = `${API_BASE_URL}/boards/admin/board-access/matrix/`;
+
 export default function BoardAccessPage() {
   const [boards, setBoards] = useState<BoardSummary[]>([]);
-  const [users, setUsers] = useState<UserSummary[]>([]);
+  const [users, setUsers] = useState<AccessMatrixUser[]>([]);
+  const [nextUrl, setNextUrl] = useState<string | null>(null);
+  const [searchInput, setSearchInput] = useState('');
+  const [search, setSearch] = useState('');
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
   const [accessMap, setAccessMap] = useState<Record<string, number[]>>({});
   const [selectedUserId, setSelectedUserId] = useState<string>('');
   const [selectedBoardIds, setSelectedBoardIds] = useState<Set<number>>(new Set());
@@ -26,38 +32,65 @@ export default function BoardAccessPage() {
 
   const canManage = useMemo(() => Boolean(selectedUserId) && !isSaving, [selectedUserId, isSaving]);
 
+  // The matrix endpoint pages users by email, so each page only carries its own grants.
+  const fetchMatrixPage = useCallback(async (url: string): Promise<AccessMatrixPage | null> => {
+    try {
+      const response = await authFetch(url);
+      if (!response.ok) {
+        const problem = await response.json().catch(() => ({ detail: '권한 정보를 불러오지 못했습니다.' }));
+        throw new Error(problem.detail || '권한 정보를 불러오지 못했습니다.');
+      }
+      return (await response.json()) as AccessMatrixPage;
+    } catch (err) {
+      if (err instanceof SessionExpiredError) {
+        AuthStorage.setLogoutMessage('로그아웃 되었습니다.');
+        window.location.href = '/login';
+        return null;
+      }
+      console.error(err);
+      setError(err instanceof Error ? err.message : '권한 정보를 불러오지 못했습니다.');
+      return null;
+    }
+  }, []);
+
   useEffect(() => {
-    const fetchAccess = async () => {
-      try {
-        const response = await authFetch(`${API_BASE_URL}/admin/board-access/`);
-        if (!response.ok) {
-          const problem = await response.json().catch(() => ({ detail: '권한 정보를 불러오지 못했습니다.' }));
-          throw new Error(problem.detail || '권한 정보를 불러오지 못했습니다.');
-        }
-        const data: AccessResponse = await response.json();
+    const loadFirstPage = async () => {
+      const query = search ? `?search=${encodeURIComponent(search)}` : '';
+      const data = await fetchMatrixPage(`${MATRIX_URL}${query}`);
+      if (data) {
         setBoards(data.boards);
-        setUsers(data.users);
-        setAccessMap(data.access ?? {});
-        const firstUserId = data.users[0]?.id ? String(data.users[0].id) : '';
-        if (firstUserId) {
-          setSelectedUserId(firstUserId);
-          setSelectedBoardIds(new Set(data.access?.[firstUserId] ?? []));
-        }
-      } catch (err) {
-        if (err instanceof SessionExpiredError) {
-          AuthStorage.setLogoutMessage('로그아웃 되었습니다.');
-          window.location.href = '/login';
-          return;
-        }
-        console.error(err);
-        setError(err instanceof Error ? err.message : '권한 정보를 불러오지 못했습니다.');
-      } finally {
-        setIsLoading(false);
+        setUsers(data.results);
+        setNextUrl(data.next);
+        setAccessMap(Object.fromEntries(data.results.map((user) => [String(user.id), user.boardIds])));
+        const firstUserId = data.results[0]?.id ? String(data.results[0].id) : '';
+        setSelectedUserId(firstUserId);
+        setError(null);
       }
+      setIsLoading(false);
     };
 
-    fetchAccess();
-  }, []);
+    loadFirstPage();
+  }, [fetchMatrixPage, search]);
+
+  const handleLoadMore = async () => {
+    if (!nextUrl) return;
+    setIsLoadingMore(true);
+    const data = await fetchMatrixPage(nextUrl);
+    if (data) {
+      setUsers((prev) => [...prev, ...data.results]);
+      setNextUrl(data.next);
+      setAccessMap((prev) => ({
+        ...prev,
+        ...Object.fromEntries(data.results.map((user) => [String(user.id), user.boardIds])),
+      }));
+    }
+    setIsLoadingMore(false);
+  };
+
+  const handleSearch = (event: FormEvent<HTMLFormElement>) => {
+    event.preventDefault();
+    setSearch(searchInput.trim());
+  };
 
   useEffect(() => {
     if (!selectedUserId) {
@@ -89,7 +122,7 @@ export default function BoardAccessPage() {
     setFeedback(null);
 
     try {
-      const response = await authFetch(`${API_BASE_URL}/admin/board-access/`, {
+      const response = await authFetch(`${API_BASE_URL}/boards/admin/board-access/`, {
         method: 'PUT',
         headers: {
           'Content-Type': 'application/json',
@@ -151,6 +184,14 @@ export default function BoardAccessPage() {
       <section className="access-grid">
         <article className="access-card">
           <h2>사용자 선택</h2>
+          <form onSubmit={handleSearch}>
+            <input
+              type="search"
+              value={searchInput}
+              onChange={(event) => setSearchInput(event.target.value)}
+              placeholder="이메일로 검색"
+            />
+          </form>
           <select
             value={selectedUserId}
             onChange={(event) => setSelectedUserId(event.target.value)}
@@ -163,6 +204,11 @@ export default function BoardAccessPage() {
               </option>
             ))}
           </select>
+          {nextUrl ? (
+            <button type="button" onClick={handleLoadMore} disabled={isLoadingMore}>
+              {isLoadingMore ? '불러오는 중...' : '사용자 더 보기'}
+            </button>
+          ) : null}
         </article>
 
         <article className="access-card">
@@ -1,11 +1,28 @@
-﻿import { FormEvent, useEffect, useMemo, useState } from 'react';
+﻿import { FormEvent, useCallback, useEffect, useMemo, useRef, useState } from 'react';
 import { useNavigate } from 'react-router-dom';
 
 import { API_BASE_URL, APP_ENV } from '../config';
+import { useBoardEvents } from '../hooks/useBoardEvents';
 import { authFetch, SessionExpiredError } from '../lib/authFetch';
 import { AuthStorage } from '../lib/auth';
 
-import type { BoardSummary, PostSummary, ViewMode } from '../types/board';
+import type { BoardEvent, BoardSummary, PostPage, PostSummary, ViewMode } from '../types/board';
+
+const REFRESH_DEBOUNCE_MS = 500;
+
+const isOlderThan = (post: PostSummary, other: PostSummary) => {
+  const created = Date.parse(post.created_at);
+  const otherCreated = Date.parse(other.created_at);
+  return created < otherCreated || (created === otherCreated && post.id < other.id);
+};
+
+// A live refresh re-reads only the first page; older pages already loaded stay below it.
+const mergeFirstPage = (firstPage: PostSummary[], current: PostSummary[]) => {
+  const oldest = firstPage[firstPage.length - 1];
+  if (!oldest) return firstPage;
+  const seen = new Set(firstPage.map((post) => post.id));
+  return [...firstPage, ...current.filter((post) => !seen.has(post.id) && isOlderThan(post, oldest))];
+};
 
 export default function DashboardPage() {
   const navigate = useNavigate();
@@ -19,10 +36,16 @@ export default function DashboardPage() {
     return (localStorage.getItem('boardViewMode') as ViewMode) || 'card';
   });
   const [posts, setPosts] = useState<PostSummary[]>([]);
+  const [nextPostsUrl, setNextPostsUrl] = useState<string | null>(null);
   const [isLoadingBoards, setIsLoadingBoards] = useState(true);
   const [isLoadingPosts, setIsLoadingPosts] = useState(false);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
   const [error, setError] = useState<string | null>(null);
   const [userRole, setUserRole] = useState<string | null>(null);
+  const [postsRevision, setPostsRevision] = useState(0);
+  const loadedBoardIdRef = useRef<string | null>(null);
+  const hasLoadedMoreRef = useRef(false);
+  const refreshTimerRef = useRef<ReturnType<typeof setTimeout>>();
 
   useEffect(() => {
     if (typeof window === 'undefined') return;
@@ -70,20 +93,32 @@ export default function DashboardPage() {
   useEffect(() => {
     if (!selectedBoardId) {
       setPosts([]);
+      setNextPostsUrl(null);
       return;
     }
 
+    // Live refreshes of the board already on screen keep the current list visible.
+    const isRefresh = loadedBoardIdRef.current === selectedBoardId;
+
     const fetchPosts = async () => {
-      setIsLoadingPosts(true);
+      if (!isRefresh) setIsLoadingPosts(true);
       setError(null);
       try {
-        const response = await authFetch(`${API_BASE_URL}/boards/${selectedBoardId}/posts/`);
+        const response = await authFetch(`${API_BASE_URL}/boards/${selectedBoardId}/posts/?fields=summary`);
         if (!response.ok) {
           const problem = await response.json().catch(() => ({ detail: '게시글을 불러오지 못했습니다.' }));
           throw new Error(problem.detail || '게시글을 불러오지 못했습니다.');
         }
-        const data: PostSummary[] = await response.json();
-        setPosts(data);
+        const data: PostPage = await response.json();
+        if (isRefresh) {
+          setPosts((current) => mergeFirstPage(data.results, current));
+          if (!hasLoadedMoreRef.current) setNextPostsUrl(data.next);
+        } else {
+          setPosts(data.results);
+          setNextPostsUrl(data.next);
+          hasLoadedMoreRef.current = false;
+        }
+        loadedBoardIdRef.current = selectedBoardId;
       } catch (err) {
         if (err instanceof SessionExpiredError) {
           AuthStorage.setLogoutMessage('로그아웃 되었습니다.');
@@ -98,7 +133,51 @@ export default function DashboardPage() {
     };
 
     fetchPosts();
-  }, [selectedBoardId, navigate]);
+  }, [selectedBoardId, navigate, postsRevision]);
+
+  const handleLoadMore = async () => {
+    if (!nextPostsUrl) return;
+    const boardId = selectedBoardId;
+    setIsLoadingMore(true);
+    try {
+      const response = await authFetch(nextPostsUrl);
+      if (!response.ok) {
+        const problem = await response.json().catch(() => ({ detail: '게시글을 불러오지 못했습니다.' }));
+        throw new Error(problem.detail || '게시글을 불러오지 못했습니다.');
+      }
+      const data: PostPage = await response.json();
+      if (loadedBoardIdRef.current !== boardId) return;
+      setPosts((current) => {
+        const seen = new Set(current.map((post) => post.id));
+        return [...current, ...data.results.filter((post) => !seen.has(post.id))];
+      });
+      setNextPostsUrl(data.next);
+      hasLoadedMoreRef.current = true;
+    } catch (err) {
+      if (err instanceof SessionExpiredError) {
+        AuthStorage.setLogoutMessage('로그아웃 되었습니다.');
+        navigate('/login', { replace: true });
+        return;
+      }
+      console.error(err);
+      setError(err instanceof Error ? err.message : '게시글을 불러오지 못했습니다.');
+    } finally {
+      setIsLoadingMore(false);
+    }
+  };
+
+  const handleBoardEvent = useCallback((event: BoardEvent) => {
+    if (event.type === 'deleted') {
+      setPosts((current) => current.filter((post) => post.id !== event.data.id));
+      return;
+    }
+    clearTimeout(refreshTimerRef.current);
+    refreshTimerRef.current = setTimeout(() => setPostsRevision((revision) => revision + 1), REFRESH_DEBOUNCE_MS);
+  }, []);
+
+  useEffect(() => () => clearTimeout(refreshTimerRef.current), []);
+
+  useBoardEvents(selectedBoardId, handleBoardEvent);
 
   const handleViewChange = (mode: ViewMode) => {
     setViewMode(mode);
@@ -118,7 +197,11 @@ export default function DashboardPage() {
   const displayedPosts = useMemo(() => posts, [posts]);
 
   const summarise = (raw: string, limit = 140) => {
-    const normalized = raw.replace(/!\[[^\]]*\]\([^\)]*\)/g, ' [이미지] ').replace(/\s+/g, ' ').trim();
+    const normalized = raw
+      .replace(/!\[[^\]]*\]\([^\)]*\)/g, ' [이미지] ')
+      .replace(/!\[[^\]]*\]\([^\)]*$/, ' [이미지] ')
+      .replace(/\s+/g, ' ')
+      .trim();
     if (!normalized) return '';
     return normalized.length > limit ? `${normalized.slice(0, limit)}...` : normalized;
   };
@@ -148,7 +231,7 @@ export default function DashboardPage() {
             {!isLoadingBoards && boards.length === 0 ? <option value="">게시판이 없습니다</option> : null}
             {boards.map((board) => (
               <option key={board.id} value={board.id}>
-                {board.name}
+                {board.post_count === undefined ? board.name : `${board.name} (${board.post_count})`}
               </option>
             ))}
           </select>
@@ -186,7 +269,7 @@ export default function DashboardPage() {
           {displayedPosts.map((post) => (
             <article key={post.id} className="card card-clickable" onClick={() => handleOpenPost(post.id)}>
               <h2>{post.title}</h2>
-              <p className="card-summary">{summarise(post.content) || '내용이 아직 등록되지 않았습니다.'}</p>
+              <p className="card-summary">{summarise(post.excerpt ?? post.content ?? '') || '내용이 아직 등록되지 않았습니다.'}</p>
               <div className="card-meta">
                 <span className="card-author">{post.author_name ?? post.author_email ?? 'admin@shashoo.com'}</span>
                 <span className="card-date">{formatDateTime(post.created_at)}</span>
@@ -214,6 +297,14 @@ export default function DashboardPage() {
           </tbody>
         </table>
       )}
+
+      {!isLoadingPosts && nextPostsUrl ? (
+        <div className="load-more">
+          <button type="button" onClick={handleLoadMore} disabled={isLoadingMore}>
+            {isLoadingMore ? '불러오는 중...' : '게시글 더 보기'}
+          </button>
+        </div>
+      ) : null}
     </div>
   );
 }
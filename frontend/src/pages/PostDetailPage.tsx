@@ -14,6 +14,7 @@ import type { PostSummary } from '../types/board';
 
 interface PostDetail extends PostSummary {
   board: number;
+  content: string;
 }
 
 const MARKDOWN_PLACEHOLDER = '본문을 수정해 주세요. 마크다운과 이미지 붙여넣기를 지원합니다.';
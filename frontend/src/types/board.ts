@@ -5,6 +5,9 @@ export interface BoardSummary {
   name: string;
   description?: string;
   visibility: 'basic' | 'premium' | 'admin';
+  post_count?: number;
+  attachment_count?: number;
+  last_post_at?: string | null;
 }
 
 export interface PostSummary {
@@ -12,11 +15,26 @@ export interface PostSummary {
   board: number;
   board_name?: string | null;
   title: string;
-  content: string;
+  content?: string;
+  excerpt?: string;
   view_type: ViewMode;
   author_name?: string | null;
   author_email?: string | null;
   created_at: string;
   updated_at?: string;
+  attachment_count?: number;
+  thumbnail?: string | null;
 }
 
+export type BoardEventType = 'created' | 'updated' | 'deleted' | 'reset';
+
+export interface BoardEvent {
+  type: BoardEventType;
+  data: { id?: number; board?: number };
+}
+
+export interface PostPage {
+  next: string | null;
+  previous: string | null;
+  results: PostSummary[];
+}
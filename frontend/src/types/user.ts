@@ -9,3 +9,7 @@
   organization?: string;
   purpose?: string;
 }
+
+export type AccessMatrixUser = Pick<UserSummary, 'id' | 'email' | 'first_name' | 'last_name' | 'role' | 'status'> & {
+  boardIds: number[];
+};